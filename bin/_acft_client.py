@@ -0,0 +1,93 @@
+"""
+Thin client for `acft daemon`.
+
+Only the standard library is imported here: the `acft` executable calls
+`client_main` before loading any command module, so a forwarded command
+costs little more than interpreter start-up.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Socket under ::WORK/.acft that the `acft` client forwards commands to.
+DAEMON_SOCKET = "acftd.sock"
+# Commands the client never forwards: interactive, long-running, or the
+# daemon itself. `verify` runs harness commands that can take minutes and
+# would hold up every other forwarded command; it also has to stop on the
+# caller's Ctrl-C. `events` is forwarded only for one-shot subcommands.
+LOCAL_COMMANDS = frozenset({"claude", "daemon", "init", "verify"})
+LOCAL_EVENTS_SUBCOMMANDS = frozenset({"serve", "subscribe"})
+
+
+def socket_path_for(work_root: Path) -> Path:
+    return work_root / ".acft" / DAEMON_SOCKET
+
+
+def forward(socket_path: Path, request: Dict[str, Any]) -> Optional[int]:
+    """
+    Send `request` to the daemon and relay its output; return the exit code.
+
+    Returns None when no daemon accepts the connection, so the caller can
+    run the command locally. Once connected the daemon may already have
+    acted, so losing it before the exit code arrives is an error, not a
+    reason to run the command again.
+    """
+    import json
+    import socket
+
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(str(socket_path))
+    except OSError:
+        conn.close()
+        return None
+    with conn, conn.makefile("rb") as stream:
+        try:
+            conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            for line in stream:
+                message = json.loads(line)
+                if "exit" in message:
+                    return int(message["exit"])
+                target = sys.stderr if message.get("stream") == "stderr" else sys.stdout
+                target.write(message.get("data", ""))
+                target.flush()
+        except (OSError, ValueError):
+            pass
+    sys.stderr.write(
+        f"acft: lost the connection to the acft daemon on {socket_path} before the command finished; "
+        "it may have partly run, so it was not retried locally\n"
+    )
+    return 1
+
+
+def client_main(argv: List[str]) -> Optional[int]:
+    """
+    Forward `argv` to a daemon serving the current work root, if one runs.
+
+    Uses nothing beyond the standard library so the `acft` client can try it
+    before importing any command module. Returns None to run locally.
+    """
+    if os.environ.get("ACFT_NO_DAEMON"):
+        return None
+    words = [arg for arg in argv if not arg.startswith("-")]
+    # The daemon cannot read this process's stdin.
+    if not words or words[0] in LOCAL_COMMANDS or "--help" in argv or "--stdin" in argv:
+        return None
+    if words[0] == "events" and (
+        "--follow" in argv or (len(words) > 1 and words[1] in LOCAL_EVENTS_SUBCOMMANDS)
+    ):
+        return None
+    cwd = os.getcwd()
+    current = Path(cwd)
+    while not (current / "checkpoints_work.toml").exists():
+        if current == current.parent:
+            return None
+        current = current.parent
+    socket_path = socket_path_for(current)
+    if not socket_path.exists():
+        return None
+    return forward(socket_path, {"argv": argv, "cwd": cwd, "env": dict(os.environ)})
@@ -3,7 +3,8 @@ from __future__ import annotations
 import argparse
 from typing import Dict, List
 
-from _lib import AcftContext, AcftError, EventEmitter
+from _eventlog import EventEmitter
+from _lib import AcftContext, AcftError, CheckpointPatch
 
 
 def register(subparsers: argparse._SubParsersAction) -> None:
@@ -68,12 +69,13 @@ def run(args: argparse.Namespace, ctx: AcftContext) -> int:
                 "All MANIFEST LEDGER entries must use ::THIS/ARTIFACTS paths before closure."
             )
 
-    checkpoint.write_frontmatter()
     message = args.message
     if not message:
         status_text = "VALID: true" if status_bool else "VALID: false"
         message = f"Status updated to {status_text} (SIGNAL={checkpoint.frontmatter.get('SIGNAL')})"
-    checkpoint.append_log_entry(message)
+    patch = CheckpointPatch(checkpoint, frontmatter=True)
+    patch.append_log(message)
+    patch.apply()
 
     emitter = EventEmitter(ctx)
     payload: Dict[str, object] = {
@@ -82,9 +84,10 @@ def run(args: argparse.Namespace, ctx: AcftContext) -> int:
         "MESSAGE": message,
         "LIFECYCLE": lifecycle,
     }
-    emitter.emit("CHECKPOINT_VERIFIED", checkpoint, payload)
-    if status_bool:
-        emitter.emit("CHECKPOINT_CLOSED", checkpoint, payload)
+    with emitter.batch():
+        emitter.emit("CHECKPOINT_VERIFIED", checkpoint, payload)
+        if status_bool:
+            emitter.emit("CHECKPOINT_CLOSED", checkpoint, payload)
     print(
         f"Updated {ctx.to_rooted(checkpoint.path)} -> VALID={status_bool}, "
         f"SIGNAL={checkpoint.frontmatter.get('SIGNAL')}, LIFECYCLE={lifecycle}"
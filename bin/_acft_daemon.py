@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from _acft_client import forward, socket_path_for
+from _eventlog import Inotify
+from _lib import AcftContext, AcftError, OwnerOnlyServerMixin, WarmState
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    parser = subparsers.add_parser(
+        "daemon",
+        help="Keep acft warm in a background process that later commands are forwarded to.",
+    )
+    parser.add_argument(
+        "--stop",
+        action="store_true",
+        help="Stop the daemon serving this work root.",
+    )
+    parser.set_defaults(handler=run)
+
+
+class TreeWatcher:
+    """
+    Invalidate `WarmState` when the checkpoint tree changes shape.
+
+    Every directory the discovery walk lists is watched with inotify, and
+    `sync` drains the queued events before each command: a directory or
+    `CHECKPOINT.md` being created, removed, or renamed drops the cached
+    listing. The kernel queues an event before the change returns, so no
+    command sees a listing older than its own request. Content edits are
+    caught by the index's stat check. Without inotify, or once a directory
+    cannot be watched, the listing is never cached.
+    """
+
+    STRUCTURAL = Inotify.IN_CREATE | Inotify.IN_DELETE | Inotify.IN_MOVED_FROM | Inotify.IN_MOVED_TO
+
+    def __init__(self, warm: WarmState, inotify: Inotify):
+        self.warm = warm
+        self.inotify = inotify
+
+    def watch(self, directory: str) -> None:
+        if self.inotify.add_watch(Path(directory)):
+            return
+        # Typically `max_user_watches` running out on a large tree: changes
+        # below this directory would go unseen, so stop caching listings.
+        self.warm.on_visit = None
+        self.warm.cache_listing = False
+        self.warm.invalidate()
+        print(
+            f"acft daemon: cannot watch {directory}; checkpoint listings will be rescanned for every command",
+            file=sys.__stderr__,  # The daemon's own stderr, not the command's.
+            flush=True,
+        )
+
+    def sync(self) -> None:
+        for _, mask, name in self.inotify.read():
+            if mask & Inotify.IN_Q_OVERFLOW or (
+                mask & self.STRUCTURAL and (mask & Inotify.IN_ISDIR or name == b"CHECKPOINT.md")
+            ):
+                self.warm.invalidate()
+                return
+
+
+class _FrameWriter(io.TextIOBase):
+    """Text stream that forwards writes to the client as JSON frames."""
+
+    def __init__(self, connection: "CommandConnection", stream: str):
+        self.connection = connection
+        self.stream = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            self.connection.send({"stream": self.stream, "data": text})
+        return len(text)
+
+
+class CommandServer(OwnerOnlyServerMixin, socketserver.ThreadingUnixStreamServer):
+    """
+    Runs forwarded `acft` commands inside this process, one at a time.
+
+    Commands change the process-wide cwd, environment and stdio, so they
+    are serialised; `ACFT_NO_DAEMON=1` is set while one runs so any `acft`
+    it spawns (e.g. a harness command) executes locally instead of waiting
+    on this daemon. Forwarded commands run with the client's argv and
+    environment, so only the daemon's own user may connect.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: Path,
+        dispatch: Callable[[List[str]], int],
+        before_command: Optional[Callable[[], None]] = None,
+    ):
+        self.dispatch = dispatch
+        self.before_command = before_command
+        self.command_lock = threading.Lock()
+        super().__init__(str(socket_path), CommandConnection)
+
+    def execute(self, request: Dict[str, Any], connection: "CommandConnection") -> int:
+        with self.command_lock:
+            if self.before_command is not None:
+                self.before_command()
+            saved_cwd = os.getcwd()
+            saved_env = dict(os.environ)
+            try:
+                os.chdir(request["cwd"])
+                os.environ.clear()
+                os.environ.update(request.get("env") or {})
+                os.environ["ACFT_NO_DAEMON"] = "1"
+                stdout = _FrameWriter(connection, "stdout")
+                stderr = _FrameWriter(connection, "stderr")
+                with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                    try:
+                        return int(self.dispatch(list(request["argv"])) or 0)
+                    except SystemExit as exc:
+                        if isinstance(exc.code, int) or exc.code is None:
+                            return exc.code or 0
+                        print(exc.code, file=sys.stderr)
+                        return 1
+            finally:
+                os.environ.clear()
+                os.environ.update(saved_env)
+                os.chdir(saved_cwd)
+
+
+class CommandConnection(socketserver.StreamRequestHandler):
+    server: CommandServer
+
+    def handle(self) -> None:
+        self._send_lock = threading.Lock()
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+        except ValueError:
+            return
+        if request.get("op") == "stop":
+            self.send({"exit": 0})
+            threading.Thread(target=self.server.shutdown).start()
+            return
+        if "argv" not in request or "cwd" not in request:
+            self.send({"exit": 2, "error": "malformed request"})
+            return
+        try:
+            code = self.server.execute(request, self)
+        except Exception as exc:  # Keep the daemon alive whatever a command does.
+            self.send({"stream": "stderr", "data": f"acft daemon error: {exc}\n"})
+            code = 1
+        self.send({"exit": code})
+
+    def send(self, message: Dict[str, Any]) -> None:
+        with self._send_lock:
+            try:
+                self.wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+                self.wfile.flush()
+            except OSError:
+                pass  # The client went away; let the command finish anyway.
+
+
+def load_dispatcher() -> Callable[[List[str]], int]:
+    """Import `main` from the `acft` executable next to this module."""
+    import importlib.util
+    from importlib.machinery import SourceFileLoader
+
+    loader = SourceFileLoader("_acft_cli", str(Path(__file__).with_name("acft")))
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module.main
+
+
+def run(args: argparse.Namespace, ctx: AcftContext) -> int:
+    if not ctx.work_root:
+        raise AcftError("Cannot start acft daemon: no checkpoints_work.toml found in ancestor directories")
+    socket_path = socket_path_for(ctx.work_root)
+    if args.stop:
+        code = forward(socket_path, {"op": "stop"})
+        if code is None:
+            raise AcftError(f"No acft daemon is listening on {ctx.to_rooted(socket_path)}")
+        if code:
+            return code
+        print(f"Stopped acft daemon on {ctx.to_rooted(socket_path)}")
+        return 0
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(socket_path))
+        except OSError:
+            socket_path.unlink()  # Left behind by a daemon that died.
+        else:
+            raise AcftError(f"An acft daemon is already listening on {ctx.to_rooted(socket_path)}")
+        finally:
+            probe.close()
+
+    dispatch = load_dispatcher()
+
+    # Without inotify nothing would invalidate the cached listing, so only
+    # the index stays warm and every scan walks the tree again.
+    inotify = Inotify.create()
+    warm = WarmState(cache_listing=inotify is not None)
+    watcher: Optional[TreeWatcher] = None
+    if inotify is not None:
+        watcher = TreeWatcher(warm, inotify)
+        warm.on_visit = watcher.watch
+    AcftContext.warm = warm
+
+    server = CommandServer(socket_path, dispatch, watcher.sync if watcher is not None else None)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    print(f"acft daemon listening on {ctx.to_rooted(socket_path)}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+        AcftContext.warm = None
+        warm.close()
+        if inotify is not None:
+            inotify.close()
+    return 0
@@ -1,11 +1,41 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import fnmatch
+import io
 import json
+import os
+import queue
+import shlex
+import signal
+import socket
+import socketserver
+import threading
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from _lib import AcftContext, AcftError, parse_iso_timestamp, relative_duration_to_seconds
+from _eventlog import (
+    EVENT_BUS_SOCKET,
+    EVENT_LOG_FILENAME,
+    EventEmitter,
+    EventIndex,
+    EventLog,
+    LogWatcher,
+)
+from _lib import (
+    AcftContext,
+    AcftError,
+    OwnerOnlyServerMixin,
+    parse_iso_timestamp,
+    relative_duration_to_seconds,
+)
+
+# Commands a subscriber may run inside the event bus daemon; each receives the
+# event's CHECKPOINT_PATH as its positional path argument.
+BUS_HANDLERS = ("validate", "manifest", "orient")
+# Events buffered per subscriber before the daemon drops it as too slow.
+SUBSCRIBER_QUEUE_SIZE = 10_000
 
 
 def register(subparsers: argparse._SubParsersAction) -> None:
@@ -33,11 +63,49 @@ def register(subparsers: argparse._SubParsersAction) -> None:
     )
     tail.set_defaults(handler=run_tail)
 
+    compact = events_sub.add_parser(
+        "compact",
+        help="Keep only the latest event per checkpoint and TYPE in sealed segments.",
+    )
+    compact.add_argument(
+        "--seal",
+        action="store_true",
+        help="Seal the active segment first so it is compacted too.",
+    )
+    compact.set_defaults(handler=run_compact)
+
+    serve = events_sub.add_parser(
+        "serve",
+        help="Run the local event bus daemon on ::WORK/.acft/events.sock.",
+    )
+    serve.set_defaults(handler=run_serve)
+
+    subscribe = events_sub.add_parser(
+        "subscribe",
+        help="Receive events from the event bus daemon as they are emitted.",
+    )
+    subscribe.add_argument("--types", help="Comma-separated TYPE filters.")
+    subscribe.add_argument(
+        "--paths",
+        help="Comma-separated CHECKPOINT_PATH globs (e.g., '::WORK/auth_*').",
+    )
+    subscribe.add_argument(
+        "--run",
+        action="append",
+        default=[],
+        metavar="COMMAND",
+        help=(
+            "Run a registered handler in the daemon for each matching event, "
+            f"e.g. 'validate --strict' ({', '.join(sorted(BUS_HANDLERS))}). Repeatable."
+        ),
+    )
+    subscribe.set_defaults(handler=run_subscribe)
+
 
 def run_tail(args: argparse.Namespace, ctx: AcftContext) -> int:
     if not ctx.work_root:
         raise AcftError("Cannot access event log: no checkpoints_work.toml found in ancestor directories")
-    log_path = ctx.work_root / "checkpoints_events.log"
+    log_path = ctx.work_root / EVENT_LOG_FILENAME
     log_path.parent.mkdir(parents=True, exist_ok=True)
     log_path.touch(exist_ok=True)
 
@@ -65,24 +133,304 @@ def run_tail(args: argparse.Namespace, ctx: AcftContext) -> int:
                 return False
         return True
 
-    with log_path.open("r", encoding="utf-8") as stream:
+    def emit_line(raw: bytes) -> None:
+        line = raw.decode("utf-8", errors="replace").strip()
+        if not line:
+            return
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            return
+        if should_emit(event):
+            print(json.dumps(event), flush=args.follow)
+
+    events = EventLog.for_context(ctx)
+    for raw in events.iter_sealed_lines(since_ts, types_filter):
+        emit_line(raw)
+
+    # The sidecar index lets --types seek straight to candidate lines and
+    # --since alone skip to where it starts; the rest (or everything, without
+    # an index or a filter) is read sequentially.
+    index = EventIndex.open(ctx) if since_ts is not None or types_filter else None
+    start = 0
+    stream = log_path.open("rb")
+    watcher = LogWatcher(log_path) if args.follow else None
+    try:
+        indexed_end = 0
+        if index is not None:
+            try:
+                indexed_end = index.sync()
+            except OSError:
+                index = None
+        if index is not None and types_filter:
+            type_hashes = {EventIndex.type_hash(name) for name in types_filter}
+            for offset in index.scan(since_ts, type_hashes):
+                stream.seek(offset)
+                emit_line(stream.readline())
+            start = indexed_end
+        elif index is not None and since_ts is not None:
+            start = index.start_offset(since_ts, indexed_end)
+        stream.seek(start)
+        if watcher is None:
+            for line in stream:
+                emit_line(line)
+            return 0
         while True:
             position = stream.tell()
             line = stream.readline()
-            if not line:
-                if args.follow:
-                    time.sleep(0.5)
-                    stream.seek(position)
-                    continue
-                break
-            line = line.strip()
-            if not line:
+            if line.endswith(b"\n"):
+                emit_line(line)
                 continue
-            try:
-                event = json.loads(line)
-            except json.JSONDecodeError:
+            if _rotated(stream, log_path):
+                # The active segment was sealed; drain it and reopen.
+                stream.seek(position)
+                for rest in stream:
+                    emit_line(rest)
+                stream.close()
+                stream = log_path.open("rb")
                 continue
-            if should_emit(event):
-                print(json.dumps(event))
+            if os.fstat(stream.fileno()).st_size < position:
+                stream.seek(0)  # Truncated in place; start over.
+                continue
+            watcher.wait()
+            stream.seek(position)
+    finally:
+        stream.close()
+        if watcher is not None:
+            watcher.close()
+
+
+def _rotated(stream: Any, log_path: Any) -> bool:
+    try:
+        return os.stat(log_path).st_ino != os.fstat(stream.fileno()).st_ino
+    except FileNotFoundError:
+        return False
+
+
+def run_compact(args: argparse.Namespace, ctx: AcftContext) -> int:
+    events = EventLog.for_context(ctx)
+    if args.seal:
+        events.seal()
+    kept, total = events.compact()
+    print(f"Compacted sealed event segments: kept {kept} of {total} events.")
+    return 0
 
+
+def _register_handlers() -> Dict[str, Callable[[argparse._SubParsersAction], None]]:
+    from _acft_manifest import register as register_manifest
+    from _acft_orient import register as register_orient
+    from _acft_validate import register as register_validate
+
+    return {
+        "validate": register_validate,
+        "manifest": register_manifest,
+        "orient": register_orient,
+    }
+
+
+class Subscription:
+    def __init__(self, types: Optional[set[str]], paths: List[str], handlers: List[List[str]]):
+        self.types = types
+        self.paths = paths
+        self.handlers = handlers
+        self.dropped = False
+        self.queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(SUBSCRIBER_QUEUE_SIZE)
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        if self.types and event.get("TYPE") not in self.types:
+            return False
+        if self.paths:
+            path = event.get("CHECKPOINT_PATH")
+            if not path or not any(fnmatch.fnmatchcase(path, pattern) for pattern in self.paths):
+                return False
+        return True
+
+
+class EventBus(OwnerOnlyServerMixin, socketserver.ThreadingUnixStreamServer):
+    """
+    Local event bus behind `acft events serve`.
+
+    Publishers' batches are appended to the event log (the file stays the
+    source of truth) and then offered to every matching subscriber.
+    Subscribers may name registered handlers, which run in this process
+    against each event's checkpoint, so reacting to an event costs no
+    interpreter start-up. Handlers run one at a time because they write
+    to the process-wide stdout. Only the daemon's own user may connect.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, ctx: AcftContext, socket_path: Any):
+        self.ctx = ctx
+        self.writer = EventEmitter(ctx)
+        self.subscriptions: List[Subscription] = []
+        self.lock = threading.Lock()
+        self.handler_lock = threading.Lock()
+        self.registrars = _register_handlers()
+        super().__init__(str(socket_path), BusConnection)
+
+    def publish(self, records: List[bytes]) -> None:
+        with self.lock:
+            self.writer.write_records(records)
+            events = [json.loads(record) for record in records]
+            for subscription in list(self.subscriptions):
+                for event in events:
+                    if not subscription.matches(event):
+                        continue
+                    try:
+                        subscription.queue.put_nowait(event)
+                    except queue.Full:
+                        # A subscriber this far behind is dropped rather than
+                        # letting the daemon's memory grow without bound.
+                        subscription.dropped = True
+                        self.subscriptions.remove(subscription)
+                        break
+
+    def run_handler(self, command: List[str], checkpoint_path: str) -> Tuple[int, str]:
+        parser = argparse.ArgumentParser(prog="acft", add_help=False)
+        subparsers = parser.add_subparsers(dest="command")
+        self.registrars[command[0]](subparsers)
+        output = io.StringIO()
+        with self.handler_lock, contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            try:
+                args = parser.parse_args(command + [checkpoint_path])
+                code = args.handler(args, self.ctx)
+            except SystemExit as exc:
+                code = exc.code if isinstance(exc.code, int) else 2
+            except AcftError as exc:
+                print(f"acft error: {exc}")
+                code = 1
+        return code, output.getvalue()
+
+
+class BusConnection(socketserver.StreamRequestHandler):
+    server: EventBus
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+        except ValueError:
+            return self._reply({"ok": False, "error": "malformed request"})
+        op = request.get("op")
+        if op == "publish":
+            try:
+                self.server.publish([line.encode("utf-8") for line in request.get("records", [])])
+            except (AcftError, OSError, ValueError) as exc:
+                return self._reply({"ok": False, "error": str(exc)})
+            return self._reply({"ok": True})
+        if op == "subscribe":
+            return self._subscribe(request)
+        self._reply({"ok": False, "error": f"unknown op {op!r}"})
+
+    def _subscribe(self, request: Dict[str, Any]) -> None:
+        try:
+            handlers = [shlex.split(command) for command in request.get("run", [])]
+        except ValueError as exc:
+            return self._reply({"ok": False, "error": f"malformed handler: {exc}"})
+        if any(not words for words in handlers):
+            return self._reply({"ok": False, "error": "empty handler command"})
+        unknown = [words[0] for words in handlers if words[0] not in BUS_HANDLERS]
+        if unknown:
+            return self._reply({"ok": False, "error": f"unknown handler(s): {', '.join(unknown)}"})
+        subscription = Subscription(
+            set(request["types"]) if request.get("types") else None,
+            list(request.get("paths") or []),
+            handlers,
+        )
+        with self.server.lock:
+            self.server.subscriptions.append(subscription)
+        try:
+            self._reply({"ok": True})
+            while True:
+                try:
+                    event = subscription.queue.get(timeout=1.0)
+                except queue.Empty:
+                    if subscription.dropped:
+                        return self._reply({"ok": False, "error": "subscriber fell too far behind"})
+                    continue
+                self._reply({"EVENT": event})
+                checkpoint_path = event.get("CHECKPOINT_PATH")
+                for command in subscription.handlers if checkpoint_path else []:
+                    code, output = self.server.run_handler(command, checkpoint_path)
+                    self._reply(
+                        {
+                            "HANDLER": " ".join(command),
+                            "CHECKPOINT_PATH": checkpoint_path,
+                            "EXIT_CODE": code,
+                            "OUTPUT": output,
+                        }
+                    )
+        except OSError:
+            pass  # Subscriber went away.
+        finally:
+            with self.server.lock:
+                if subscription in self.server.subscriptions:
+                    self.server.subscriptions.remove(subscription)
+
+    def _reply(self, message: Dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+def _bus_socket(ctx: AcftContext) -> Any:
+    if ctx.cache_dir is None:
+        raise AcftError("Cannot locate the event bus: no checkpoints_work.toml found in ancestor directories")
+    return ctx.cache_dir / EVENT_BUS_SOCKET
+
+
+def run_serve(args: argparse.Namespace, ctx: AcftContext) -> int:
+    socket_path = _bus_socket(ctx)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(socket_path))
+        except OSError:
+            socket_path.unlink()  # Left behind by a daemon that died.
+        else:
+            raise AcftError(f"An event bus is already listening on {ctx.to_rooted(socket_path)}")
+        finally:
+            probe.close()
+
+    bus = EventBus(ctx, socket_path)
+    EventEmitter.local_bus = bus.publish
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=bus.shutdown).start())
+    print(f"Event bus listening on {ctx.to_rooted(socket_path)}", flush=True)
+    try:
+        bus.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        EventEmitter.local_bus = None
+        bus.server_close()
+        socket_path.unlink(missing_ok=True)
+    return 0
+
+
+def run_subscribe(args: argparse.Namespace, ctx: AcftContext) -> int:
+    socket_path = _bus_socket(ctx)
+    request = {
+        "op": "subscribe",
+        "types": [item.strip() for item in (args.types or "").split(",") if item.strip()],
+        "paths": [item.strip() for item in (args.paths or "").split(",") if item.strip()],
+        "run": args.run,
+    }
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(str(socket_path))
+    except OSError as exc:
+        raise AcftError(f"No event bus on {ctx.to_rooted(socket_path)} (start one with `acft events serve`): {exc}") from exc
+    with conn, conn.makefile("rb") as stream:
+        conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        greeting = json.loads(stream.readline() or b"{}")
+        if not greeting.get("ok"):
+            raise AcftError(f"Event bus refused subscription: {greeting.get('error', 'connection closed')}")
+        try:
+            for line in stream:
+                message = json.loads(line)
+                if message.get("ok") is False:
+                    raise AcftError(f"Event bus closed the subscription: {message.get('error')}")
+                print(json.dumps(message.get("EVENT", message)), flush=True)
+        except KeyboardInterrupt:
+            pass
     return 0
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import argparse
+import os
 import sys
-from pathlib import Path
+from typing import BinaryIO, Callable, Iterator
 
-from _lib import AcftContext, PathResolutionError
+from _lib import AcftContext
+
+# Bytes read from stdin at a time in `--stdin` mode; results for everything
+# read are written before the next (possibly blocking) read.
+INPUT_CHUNK_BYTES = 64 * 1024
 
 
 def register(subparsers: argparse._SubParsersAction) -> None:
@@ -12,7 +17,7 @@ def register(subparsers: argparse._SubParsersAction) -> None:
         "expand",
         help="Expand rooted prefixes to absolute paths.",
     )
-    parser.add_argument("paths", nargs="+", help="Rooted or relative paths to expand.")
+    parser.add_argument("paths", nargs="*", help="Rooted or relative paths to expand.")
     parser.add_argument(
         "--resolve-symlinks",
         action="store_true",
@@ -24,34 +29,107 @@ def register(subparsers: argparse._SubParsersAction) -> None:
         action="store_true",
         help="Allow expanding paths that don't exist yet (skip existence check).",
     )
+    parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Read paths from stdin, one per line, and stream one result per path.",
+    )
+    parser.add_argument(
+        "-0",
+        "--null",
+        action="store_true",
+        help="With --stdin, read and write NUL-terminated records instead of lines.",
+    )
     parser.set_defaults(handler=run)
 
 
 def run(args: argparse.Namespace, ctx: AcftContext) -> int:
-    try:
-        outputs = []
-        for item in args.paths:
-            expanded = ctx.expand(item, resolve_symlinks=args.resolve_symlinks)
-            expanded_path = Path(expanded)
-
-            # By default, check that the path exists
-            if not args.allow_future and not expanded_path.exists():
-                print(f"acft path error: Expanded path does not exist: {expanded}", file=sys.stderr)
-                print(f"\nIf you want to expand a future path that doesn't exist yet, use:", file=sys.stderr)
-                print(f"  acft expand --allow-future {item}", file=sys.stderr)
-                print(f"  acft expand -f {item}", file=sys.stderr)
-                return 1
-
-            outputs.append(str(expanded))
-
-        print("\n".join(outputs))
-        return 0
-    except PathResolutionError as e:
-        print(f"acft path error: {e}", file=sys.stderr)
-        print("\nTip: Run 'acft init' to create the required configuration files.", file=sys.stderr)
+    if args.stdin == bool(args.paths):
+        print("acft expand: error: expects PATH arguments or --stdin, not both", file=sys.stderr)
         return 2
+    if args.stdin:
+        return run_stream(args, ctx)
+
+    outputs = []
+    expansions = ctx.expand_many(
+        args.paths, resolve_symlinks=args.resolve_symlinks, check_exists=not args.allow_future
+    )
+    for item in expansions:
+        if item.error is not None:
+            print(f"acft path error: {item.error}", file=sys.stderr)
+            print("\nTip: Run 'acft init' to create the required configuration files.", file=sys.stderr)
+            return 2
+
+        # By default, check that the path exists
+        if item.exists is False:
+            print(f"acft path error: Expanded path does not exist: {item.path}", file=sys.stderr)
+            print(f"\nIf you want to expand a future path that doesn't exist yet, use:", file=sys.stderr)
+            print(f"  acft expand --allow-future {item.raw}", file=sys.stderr)
+            print(f"  acft expand -f {item.raw}", file=sys.stderr)
+            return 1
+
+        outputs.append(str(item.path))
+
+    print("\n".join(outputs))
+    return 0
+
+
+def run_stream(args: argparse.Namespace, ctx: AcftContext) -> int:
+    """
+    Expand records from stdin, writing one output record per input record.
+
+    A record that fails to expand is reported on stderr and written as an
+    empty record, so output stays aligned with input. The exit status is
+    the worst seen: 2 for resolution errors, 1 for missing paths.
+    """
+    separator = b"\0" if args.null else b"\n"
+    stdout = sys.stdout.buffer
+    status = 0
+    expansions = ctx.expand_many(
+        _read_records(sys.stdin.buffer, separator, before_read=stdout.flush),
+        resolve_symlinks=args.resolve_symlinks,
+        check_exists=not args.allow_future,
+    )
+    for item in expansions:
+        output = b""
+        if item.error is not None:
+            print(f"acft path error: {item.error}", file=sys.stderr)
+            status = 2
+        elif item.exists is False:
+            print(f"acft path error: Expanded path does not exist: {item.path}", file=sys.stderr)
+            status = max(status, 1)
+        elif item.raw:
+            output = os.fsencode(str(item.path))
+        stdout.write(output + separator)
+    stdout.flush()
+    return status
+
+
+def _read_records(stream: BinaryIO, separator: bytes, before_read: Callable[[], None]) -> Iterator[str]:
+    pending = b""
+    while True:
+        before_read()
+        chunk = stream.read1(INPUT_CHUNK_BYTES)  # type: ignore[attr-defined]
+        if not chunk:
+            break
+        *records, pending = (pending + chunk).split(separator)
+        for record in records:
+            yield _decode_record(record, separator)
+    if pending:
+        yield _decode_record(pending, separator)
+
+
+def _decode_record(record: bytes, separator: bytes) -> str:
+    if separator == b"\n" and record.endswith(b"\r"):
+        record = record[:-1]
+    return os.fsdecode(record)
 
 
 def expand_paths(paths: list[str], *, resolve_symlinks: bool = False) -> list[str]:
     ctx = AcftContext.discover()
-    return [str(ctx.expand(item, resolve_symlinks=resolve_symlinks)) for item in paths]
+    outputs = []
+    for item in ctx.expand_many(paths, resolve_symlinks=resolve_symlinks):
+        if item.error is not None:
+            raise item.error
+        outputs.append(str(item.path))
+    return outputs
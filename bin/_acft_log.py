@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import argparse
+
+from _lib import AcftContext, CheckpointPatch, LogSidecar, log_sidecar_from_env
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    log = subparsers.add_parser(
+        "log",
+        help="Append LOG entries and flush the LOG sidecar.",
+    )
+    log_sub = log.add_subparsers(dest="log_subcommand", metavar="SUBCOMMAND")
+
+    def _show_help(_: argparse.Namespace, __: AcftContext) -> int:
+        log.print_help()
+        return 1
+
+    log.set_defaults(handler=_show_help)
+
+    append = log_sub.add_parser(
+        "append",
+        help="Append a LOG entry (to the sidecar when ACFT_LOG_SIDECAR=1).",
+    )
+    append.add_argument("message", help="LOG message.")
+    append.add_argument(
+        "--path",
+        metavar="PATH",
+        help="Target checkpoint (default ::THIS).",
+    )
+    append.set_defaults(handler=run_append)
+
+    flush = log_sub.add_parser(
+        "flush",
+        help="Write pending sidecar entries into the LOG section of CHECKPOINT.md.",
+    )
+    flush.add_argument(
+        "--path",
+        metavar="PATH",
+        help="Target checkpoint (default ::THIS).",
+    )
+    flush.set_defaults(handler=run_flush)
+
+
+def run_append(args: argparse.Namespace, ctx: AcftContext) -> int:
+    # Only the frontmatter is read: a sidecar append must not cost a read of the LOG.
+    checkpoint = ctx.checkpoint_from_arg(args.path, lazy=True)
+    patch = CheckpointPatch(checkpoint)
+    patch.append_log(args.message)
+    patch.apply()
+    target = LogSidecar(checkpoint.path).path if log_sidecar_from_env() else checkpoint.checkpoint_md
+    print(f"Logged to {ctx.to_rooted(target)}")
+    return 0
+
+
+def run_flush(args: argparse.Namespace, ctx: AcftContext) -> int:
+    checkpoint = ctx.checkpoint_from_arg(args.path, lazy=True)
+    patch = CheckpointPatch(checkpoint)
+    patch.apply()
+    print(f"Flushed {len(patch.flushed)} LOG entries into {ctx.to_rooted(checkpoint.checkpoint_md)}")
+    return 0
@@ -3,16 +3,28 @@ from __future__ import annotations
 import argparse
 import json
 from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence
 
+from _eventlog import EventEmitter
 from _lib import (
     AcftContext,
+    AcftError,
     Checkpoint,
-    EventEmitter,
+    CheckpointGraph,
+    TOKEN_BULLET,
+    TOKEN_HEADING,
+    LogEntry,
+    LogSidecar,
+    ManifestLedgerEntry,
+    MarkdownToken,
+    atomic_write_text,
     checkpoint_name_parts,
     detect_unrooted_paths,
-    read_manifest_commands,
+    harness_commands,
     render_table,
+    stat_fingerprint,
 )
 
 
@@ -34,6 +46,17 @@ def register(subparsers: argparse._SubParsersAction) -> None:
         action="store_true",
         help="Emit MANIFEST_UPDATED event with aggregated severity.",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse results from the previous sweep for unchanged checkpoints.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        metavar="N",
+        help="Parse checkpoints with N worker processes (default: $ACFT_JOBS or 1).",
+    )
     parser.set_defaults(handler=run)
 
 
@@ -42,7 +65,70 @@ class FailureCheck:
     key: str
     description: str
     severity: str
-    detector: Any  # Callable[[Checkpoint, AcftContext, Sequence[Checkpoint]], Optional[str]]
+    detector: Any  # Callable[[CheckpointFacts, ManifestSweep], Optional[str]]
+    # "checkpoint" checks read only the checkpoint itself; "group" checks also
+    # read the other checkpoints sharing its branch+version.
+    scope: str = "checkpoint"
+
+
+class CheckpointFacts:
+    """Derived data for one checkpoint, computed once and shared by every detector."""
+
+    def __init__(self, checkpoint: Checkpoint):
+        self.checkpoint = checkpoint
+
+    @cached_property
+    def parts(self) -> Optional[Dict[str, Any]]:
+        return checkpoint_name_parts(self.checkpoint.name)
+
+    @cached_property
+    def text(self) -> str:
+        return self.checkpoint.read_text()
+
+    @cached_property
+    def manifest(self) -> str:
+        return self.checkpoint.sections.get("MANIFEST", "")
+
+    @cached_property
+    def manifest_tokens(self) -> List[MarkdownToken]:
+        return self.checkpoint.section_tokens("MANIFEST")
+
+    @cached_property
+    def status(self) -> str:
+        return self.checkpoint.sections.get("STATUS", "")
+
+    @cached_property
+    def log_entries(self) -> List[LogEntry]:
+        return self.checkpoint.log_entries()
+
+    @cached_property
+    def ledger(self) -> List[ManifestLedgerEntry]:
+        return self.checkpoint.manifest_ledger()
+
+    @cached_property
+    def logs_mention_harness(self) -> bool:
+        return any("harness" in entry.message.lower() for entry in self.log_entries)
+
+
+class ManifestSweep:
+    """
+    Shared state for one manifest run.
+
+    Cross-checkpoint detectors consult the precomputed branch/version groups
+    of `graph` instead of rescanning the whole checkpoint list.
+    """
+
+    def __init__(self, ctx: AcftContext, checkpoints: Sequence[Checkpoint]):
+        self.ctx = ctx
+        self.checkpoints = list(checkpoints)
+        self.graph = CheckpointGraph(self.checkpoints, ctx)
+
+    def group(self, parts: Dict[str, Any]) -> List[Checkpoint]:
+        """Checkpoints sharing `parts`' branch and version, in scan order."""
+        return [
+            self.graph.checkpoints[position]
+            for position in self.graph.group(parts["branch"], parts["version"])
+        ]
 
 
 def failure_checks() -> List[FailureCheck]:
@@ -88,12 +174,14 @@ def failure_checks() -> List[FailureCheck]:
             description="DELEGATE_OF references missing or successors not cross-linked.",
             severity="error",
             detector=check_orphaned_successors,
+            scope="group",
         ),
         FailureCheck(
             key="version_drift",
             description="Multiple active checkpoints share the same branch+version.",
             severity="error",
             detector=check_version_drift,
+            scope="group",
         ),
         FailureCheck(
             key="scope_shock",
@@ -130,7 +218,7 @@ def failure_checks() -> List[FailureCheck]:
 
 def run(args: argparse.Namespace, ctx: AcftContext) -> int:
     target = ctx.checkpoint_from_arg(args.path)
-    all_checkpoints = ctx.scan_checkpoints()
+    all_checkpoints = ctx.scan_checkpoints(jobs=args.jobs)
     checkpoints: List[Checkpoint]
 
     if args.mode == "full":
@@ -140,9 +228,16 @@ def run(args: argparse.Namespace, ctx: AcftContext) -> int:
 
     issues: List[Dict[str, Any]] = []
     checks = failure_checks()
+    sweep = ManifestSweep(ctx, all_checkpoints)
+    state = SweepState.load(ctx, checks) if args.incremental else None
     for checkpoint in checkpoints:
+        facts = CheckpointFacts(checkpoint)
+        if state is None:
+            messages = {check.key: check.detector(facts, sweep) for check in checks}
+        else:
+            messages = state.evaluate(facts, sweep, checks)
         for check in checks:
-            message = check.detector(checkpoint, ctx, all_checkpoints)
+            message = messages.get(check.key)
             if message:
                 issues.append(
                     {
@@ -152,6 +247,8 @@ def run(args: argparse.Namespace, ctx: AcftContext) -> int:
                         "detail": message,
                     }
                 )
+    if state is not None:
+        state.save(sweep)
 
     result = {"issues": issues, "mode": args.mode, "count": len(issues)}
 
@@ -200,30 +297,175 @@ def run(args: argparse.Namespace, ctx: AcftContext) -> int:
     return 0 if not issues else 1
 
 
+class SweepState:
+    """
+    Results of the previous `--incremental` sweep, keyed by input fingerprints.
+
+    Checkpoint-scoped results are reused while the stat data of the
+    checkpoint's `CHECKPOINT.md` and LOG sidecar is unchanged. Group-scoped results are reused
+    while no member of the branch+version group changed and the
+    checkpoint's DELEGATE_OF target still resolves the same way.
+    """
+
+    FILENAME = "manifest_state.json"
+    VERSION = 1
+
+    def __init__(self, path: Path, checks: Sequence[FailureCheck], data: Dict[str, Any]):
+        self.path = path
+        self.checks = list(checks)
+        self.checkpoints: Dict[str, Any] = data.get("checkpoints", {})
+        self.groups: Dict[str, Any] = data.get("groups", {})
+        self._group_fingerprints: Dict[str, Optional[List[Any]]] = {}
+
+    @classmethod
+    def load(cls, ctx: AcftContext, checks: Sequence[FailureCheck]) -> "SweepState":
+        if ctx.cache_dir is None:
+            raise AcftError("Cannot run --incremental: no checkpoints_work.toml found in ancestor directories")
+        path = ctx.cache_dir / cls.FILENAME
+        data: Dict[str, Any] = {}
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        if data.get("version") != cls.VERSION or data.get("checks") != [c.key for c in checks]:
+            data = {}
+        return cls(path, checks, data)
+
+    def evaluate(
+        self, facts: CheckpointFacts, sweep: ManifestSweep, checks: Sequence[FailureCheck]
+    ) -> Dict[str, Optional[str]]:
+        checkpoint = facts.checkpoint
+        key = sweep.ctx.to_rooted(checkpoint.path)
+        messages: Dict[str, Optional[str]] = {}
+
+        fingerprint = _fingerprint(checkpoint)
+        entry = self.checkpoints.get(key)
+        if fingerprint is not None and entry and entry["fingerprint"] == fingerprint:
+            messages.update(entry["issues"])
+        else:
+            results = {
+                check.key: check.detector(facts, sweep)
+                for check in checks
+                if check.scope == "checkpoint"
+            }
+            messages.update(results)
+            self.checkpoints[key] = {
+                "fingerprint": fingerprint,
+                "issues": {name: msg for name, msg in results.items() if msg},
+            }
+
+        group_key = _group_key(facts, key)
+        group_fingerprint = self._group_fingerprint(group_key, facts, sweep)
+        delegate_state = _delegate_state(checkpoint, sweep.ctx)
+        group = self.groups.get(group_key)
+        if group is None or group["fingerprint"] != group_fingerprint or group_fingerprint is None:
+            group = {"fingerprint": group_fingerprint, "members": {}}
+            self.groups[group_key] = group
+        member = group["members"].get(key)
+        if member is not None and member["delegate"] == delegate_state:
+            messages.update(member["issues"])
+        else:
+            results = {
+                check.key: check.detector(facts, sweep)
+                for check in checks
+                if check.scope == "group"
+            }
+            messages.update(results)
+            group["members"][key] = {
+                "delegate": delegate_state,
+                "issues": {name: msg for name, msg in results.items() if msg},
+            }
+        return messages
+
+    def _group_fingerprint(
+        self, group_key: str, facts: CheckpointFacts, sweep: ManifestSweep
+    ) -> Optional[List[Any]]:
+        if group_key not in self._group_fingerprints:
+            members = sweep.group(facts.parts) if facts.parts else [facts.checkpoint]
+            fingerprints: List[Any] = []
+            for cp in members:
+                fingerprint = _fingerprint(cp)
+                if fingerprint is None:
+                    fingerprints = None  # type: ignore[assignment]
+                    break
+                fingerprints.append([sweep.ctx.to_rooted(cp.path), *fingerprint])
+            self._group_fingerprints[group_key] = fingerprints
+        return self._group_fingerprints[group_key]
+
+    def save(self, sweep: ManifestSweep) -> None:
+        live = {sweep.ctx.to_rooted(cp.path) for cp in sweep.checkpoints}
+        checkpoints = {key: value for key, value in self.checkpoints.items() if key in live}
+        groups: Dict[str, Any] = {}
+        for group_key, group in self.groups.items():
+            members = {key: value for key, value in group["members"].items() if key in live}
+            if members:
+                groups[group_key] = {"fingerprint": group["fingerprint"], "members": members}
+        payload = {
+            "version": self.VERSION,
+            "checks": [check.key for check in self.checks],
+            "checkpoints": checkpoints,
+            "groups": groups,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self.path, json.dumps(payload))
+        except OSError:
+            pass  # The state is a cache; the next sweep simply starts cold.
+
+
+def _fingerprint(checkpoint: Checkpoint) -> Optional[List[int]]:
+    try:
+        fingerprint = stat_fingerprint(checkpoint.checkpoint_md.stat())
+    except OSError:
+        return None
+    if fingerprint is None:
+        return None
+    # Pending LOG entries live in the sidecar; its absence adds nothing.
+    try:
+        sidecar = stat_fingerprint(LogSidecar(checkpoint.path).path.stat())
+    except FileNotFoundError:
+        return list(fingerprint)
+    except OSError:
+        return None
+    return [*fingerprint, *sidecar] if sidecar else None
+
+
+def _group_key(facts: CheckpointFacts, rooted: str) -> str:
+    if facts.parts:
+        return f"{facts.parts['branch']}_v{facts.parts['version']}"
+    return rooted
+
+
+def _delegate_state(checkpoint: Checkpoint, ctx: AcftContext) -> str:
+    delegate_of = checkpoint.frontmatter.get("DELEGATE_OF")
+    if not isinstance(delegate_of, str):
+        return "none"
+    try:
+        delegate_path = ctx.expand(delegate_of)
+    except Exception:
+        return "unresolved"
+    return "present" if (delegate_path / "CHECKPOINT.md").exists() else "missing"
+
+
 # Failure catalogue heuristics -------------------------------------------------
 
 
-def check_missing_harness(
-    checkpoint: Checkpoint, ctx: AcftContext, _: Sequence[Checkpoint]
-) -> Optional[str]:
-    manifest = checkpoint.sections.get("MANIFEST", "")
-    commands = read_manifest_commands(manifest)
+def check_missing_harness(facts: CheckpointFacts, _: ManifestSweep) -> Optional[str]:
+    commands = harness_commands(facts.manifest_tokens)
     if commands:
         return None
-    log_entries = checkpoint.log_entries()
-    if any("harness" in entry.message.lower() for entry in log_entries):
+    if facts.logs_mention_harness:
         return None
     return "MANIFEST does not record executable harness commands and LOG lacks harness evidence."
 
 
-def check_stale_contract(
-    checkpoint: Checkpoint, ctx: AcftContext, _: Sequence[Checkpoint]
-) -> Optional[str]:
+def check_stale_contract(facts: CheckpointFacts, _: ManifestSweep) -> Optional[str]:
+    checkpoint = facts.checkpoint
     if not checkpoint.frontmatter.get("VALID"):
         return None
-    status = checkpoint.sections.get("STATUS", "").lower()
+    status = facts.status.lower()
     harness = checkpoint.sections.get("HARNESS", "").lower()
-    manifest = checkpoint.sections.get("MANIFEST", "").lower()
+    manifest = facts.manifest.lower()
     stale_tokens = {"todo", "tbd", "pending", "stub"}
     if any(token in status for token in stale_tokens) or any(
         token in harness for token in stale_tokens
@@ -234,12 +476,10 @@ def check_stale_contract(
     return None
 
 
-def check_missing_manifest_ledger(
-    checkpoint: Checkpoint, ctx: AcftContext, _: Sequence[Checkpoint]
-) -> Optional[str]:
-    if not checkpoint.frontmatter.get("VALID"):
+def check_missing_manifest_ledger(facts: CheckpointFacts, _: ManifestSweep) -> Optional[str]:
+    if not facts.checkpoint.frontmatter.get("VALID"):
         return None
-    ledger = checkpoint.manifest_ledger()
+    ledger = facts.ledger
     if not ledger:
         return "No MANIFEST LEDGER entries found."
     missing_rooted = [
@@ -254,29 +494,21 @@ def check_missing_manifest_ledger(
     return None
 
 
-def check_unrooted_references(
-    checkpoint: Checkpoint, ctx: AcftContext, _: Sequence[Checkpoint]
-) -> Optional[str]:
-    text = checkpoint.checkpoint_md.read_text(encoding="utf-8")
-    matches = detect_unrooted_paths(text)
+def check_unrooted_references(facts: CheckpointFacts, _: ManifestSweep) -> Optional[str]:
+    matches = detect_unrooted_paths(facts.text)
     if matches:
         return "Found unrooted references like " + ", ".join(sorted(set(matches)))
     return None
 
 
-def check_relative_path_bleed(
-    checkpoint: Checkpoint, ctx: AcftContext, _: Sequence[Checkpoint]
-) -> Optional[str]:
-    text = checkpoint.checkpoint_md.read_text(encoding="utf-8")
-    if "../" in text:
+def check_relative_path_bleed(facts: CheckpointFacts, _: ManifestSweep) -> Optional[str]:
+    if "../" in facts.text:
         return "Found '../' references that risk leaking relative paths."
     return None
 
 
-def check_timeline_gaps(
-    checkpoint: Checkpoint, ctx: AcftContext, _: Sequence[Checkpoint]
-) -> Optional[str]:
-    entries = checkpoint.log_entries()
+def check_timeline_gaps(facts: CheckpointFacts, _: ManifestSweep) -> Optional[str]:
+    entries = facts.log_entries
     if not entries:
         return "# LOG is empty."
     first = entries[0]
@@ -285,28 +517,23 @@ def check_timeline_gaps(
     return None
 
 
-def check_orphaned_successors(
-    checkpoint: Checkpoint, ctx: AcftContext, checkpoints: Sequence[Checkpoint]
-) -> Optional[str]:
+def check_orphaned_successors(facts: CheckpointFacts, sweep: ManifestSweep) -> Optional[str]:
+    checkpoint = facts.checkpoint
     delegate_of = checkpoint.frontmatter.get("DELEGATE_OF")
     if isinstance(delegate_of, str):
         try:
-            delegate_path = ctx.expand(delegate_of)
+            delegate_path = sweep.ctx.expand(delegate_of)
         except Exception:
             return f"DELEGATE_OF references unknown path: {delegate_of}"
         if not (delegate_path / "CHECKPOINT.md").exists():
             return f"DELEGATE_OF target missing CHECKPOINT.md: {delegate_of}"
-    parts = checkpoint_name_parts(checkpoint.name)
+    parts = facts.parts
     if not parts or checkpoint.frontmatter.get("LIFECYCLE") != "active":
         return None
     conflicts = [
         cp
-        for cp in checkpoints
-        if cp.path != checkpoint.path
-        and checkpoint_name_parts(cp.name)
-        and checkpoint_name_parts(cp.name)["branch"] == parts["branch"]
-        and checkpoint_name_parts(cp.name)["version"] == parts["version"]
-        and cp.frontmatter.get("LIFECYCLE") == "active"
+        for cp in sweep.group(parts)
+        if cp.path != checkpoint.path and cp.frontmatter.get("LIFECYCLE") == "active"
     ]
     if conflicts:
         names = ", ".join(cp.name for cp in conflicts)
@@ -314,61 +541,43 @@ def check_orphaned_successors(
     return None
 
 
-def check_version_drift(
-    checkpoint: Checkpoint, ctx: AcftContext, checkpoints: Sequence[Checkpoint]
-) -> Optional[str]:
-    parts = checkpoint_name_parts(checkpoint.name)
+def check_version_drift(facts: CheckpointFacts, sweep: ManifestSweep) -> Optional[str]:
+    parts = facts.parts
     if not parts:
         return None
-    related = [
-        cp
-        for cp in checkpoints
-        if checkpoint_name_parts(cp.name)
-        and checkpoint_name_parts(cp.name)["branch"] == parts["branch"]
-        and checkpoint_name_parts(cp.name)["version"] == parts["version"]
-    ]
-    active = [cp for cp in related if cp.frontmatter.get("LIFECYCLE") == "active"]
+    active = [cp for cp in sweep.group(parts) if cp.frontmatter.get("LIFECYCLE") == "active"]
     if len(active) > 1:
-        names = ", ".join(cp.name for cp in active if cp.path != checkpoint.path)
+        names = ", ".join(cp.name for cp in active if cp.path != facts.checkpoint.path)
         return f"Multiple active checkpoints share {parts['branch']} v{parts['version']}: {names}"
     return None
 
 
-def check_scope_shock(
-    checkpoint: Checkpoint, ctx: AcftContext, _: Sequence[Checkpoint]
-) -> Optional[str]:
-    for entry in checkpoint.log_entries():
+def check_scope_shock(facts: CheckpointFacts, _: ManifestSweep) -> Optional[str]:
+    for entry in facts.log_entries:
         if "scope" in entry.message.lower() and "::" not in entry.message:
             return "Scope change mentioned in LOG without rooted directive reference."
     return None
 
 
-def check_history_drift(
-    checkpoint: Checkpoint, ctx: AcftContext, _: Sequence[Checkpoint]
-) -> Optional[str]:
-    if "Context recap" not in checkpoint.sections.get("STATUS", ""):
+def check_history_drift(facts: CheckpointFacts, _: ManifestSweep) -> Optional[str]:
+    if "Context recap" not in facts.status:
         return "STATUS missing 'Context recap' bullet."
     return None
 
 
-def check_dependency_fog(
-    checkpoint: Checkpoint, ctx: AcftContext, _: Sequence[Checkpoint]
-) -> Optional[str]:
-    manifest = checkpoint.sections.get("MANIFEST", "")
-    if "## Dependencies" not in manifest:
+def check_dependency_fog(facts: CheckpointFacts, _: ManifestSweep) -> Optional[str]:
+    if "## Dependencies" not in facts.manifest:
         return None
     dependencies = []
     capture = False
-    for line in manifest.splitlines():
-        if line.strip().startswith("## MANIFEST LEDGER"):
-            capture = False
-        if line.strip().startswith("## Dependencies"):
-            capture = True
-            continue
-        if line.startswith("## ") and capture:
-            continue
-        if capture and line.strip().startswith("- "):
-            dependencies.append(line.strip()[2:])
+    for token in facts.manifest_tokens:
+        if token.kind == TOKEN_HEADING and token.level == 2:
+            if token.text.startswith("MANIFEST LEDGER"):
+                capture = False
+            elif token.text.startswith("Dependencies"):
+                capture = True
+        elif capture and token.kind == TOKEN_BULLET:
+            dependencies.append(token.text)
     if not dependencies:
         return "Dependencies heading present but no items documented."
     missing_status = [
@@ -381,24 +590,19 @@ def check_dependency_fog(
     return None
 
 
-def check_goal_fog(
-    checkpoint: Checkpoint, ctx: AcftContext, _: Sequence[Checkpoint]
-) -> Optional[str]:
-    status = checkpoint.sections.get("STATUS", "")
+def check_goal_fog(facts: CheckpointFacts, _: ManifestSweep) -> Optional[str]:
+    status = facts.status
     if "Success criteria" not in status or "Exit criteria" not in status:
         return "STATUS must capture success and exit criteria."
     return None
 
 
-def check_validation_theater(
-    checkpoint: Checkpoint, ctx: AcftContext, _: Sequence[Checkpoint]
-) -> Optional[str]:
-    if not checkpoint.frontmatter.get("VALID"):
+def check_validation_theater(facts: CheckpointFacts, _: ManifestSweep) -> Optional[str]:
+    if not facts.checkpoint.frontmatter.get("VALID"):
         return None
-    manifest = checkpoint.sections.get("MANIFEST", "").lower()
+    manifest = facts.manifest.lower()
     if "placeholder" in manifest or "# add verification commands here" in manifest:
         return "MANIFEST still contains placeholder harness after VALID: true."
-    log_entries = checkpoint.log_entries()
-    if not any("harness" in entry.message.lower() for entry in log_entries):
+    if not facts.logs_mention_harness:
         return "No LOG entry referencing harness execution despite VALID: true."
     return None
@@ -4,10 +4,10 @@ import argparse
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from _eventlog import EventEmitter
 from _lib import (
     AcftContext,
     AcftError,
-    EventEmitter,
     build_checkpoint_template,
     checkpoint_name_parts,
 )
@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Optional, Sequence
 from _lib import (
     AcftContext,
     Checkpoint,
+    CheckpointGraph,
     PathResolutionError,
     checkpoint_name_parts,
     render_table,
@@ -33,12 +34,18 @@ def register(subparsers: argparse._SubParsersAction) -> None:
         default=1,
         help="Depth for descendant walk (children, grandchildren, ...).",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        metavar="N",
+        help="Parse checkpoints with N worker processes (default: $ACFT_JOBS or 1).",
+    )
     parser.set_defaults(handler=run)
 
 
 def run(args: argparse.Namespace, ctx: AcftContext) -> int:
     checkpoint = ctx.checkpoint_from_arg(args.path)
-    all_checkpoints = ctx.scan_checkpoints()
+    all_checkpoints = ctx.scan_checkpoints(jobs=args.jobs)
     relationships = gather_relationships(
         checkpoint, all_checkpoints, ctx, depth=args.depth
     )
@@ -134,8 +141,12 @@ def gather_relationships(
     checkpoints: Sequence[Checkpoint],
     ctx: AcftContext,
     depth: int = 1,
+    graph: Optional[CheckpointGraph] = None,
 ) -> Dict[str, List[Dict[str, Any]]]:
-    rel = {"ancestry": [], "peers": [], "children": []}
+    if graph is None:
+        graph = CheckpointGraph(checkpoints, ctx)
+    nodes = graph.checkpoints
+    rel: Dict[str, List[Dict[str, Any]]] = {"ancestry": [], "peers": [], "children": []}
     parts_target = checkpoint_name_parts(target.name)
     target_delegate = target.frontmatter.get("DELEGATE_OF")
     delegate_path: Optional[Path] = None
@@ -154,90 +165,61 @@ def gather_relationships(
             "distance": distance,
         }
 
-    for cp in checkpoints:
+    # Each node contributes at most one delegate relation (parent, delegate or
+    # peer, in that priority) plus at most one name-based lineage relation.
+    delegate_kind: Dict[int, str] = {}
+    if delegate_path is not None and delegate_path in graph.by_path:
+        delegate_kind[graph.by_path[delegate_path]] = "ancestry"
+    for position in graph.delegates_of(target.path):
+        delegate_kind.setdefault(position, "children")
+    if target_delegate:
+        for position in graph.sharing_delegate(target_delegate):
+            delegate_kind.setdefault(position, "peers")
+
+    lineage_kind: Dict[int, str] = {}
+    if parts_target:
+        for position in graph.predecessors(parts_target):
+            lineage_kind[position] = "ancestry"
+        for position in graph.successors(parts_target):
+            lineage_kind[position] = "children"
+
+    child_positions: List[int] = []
+    for position in sorted(delegate_kind.keys() | lineage_kind.keys()):
+        cp = nodes[position]
         if cp.path == target.path:
             continue
-        parts = checkpoint_name_parts(cp.name)
-        delegate_of = cp.frontmatter.get("DELEGATE_OF")
-        delegate_abs: Optional[Path] = None
-        if isinstance(delegate_of, str):
-            try:
-                delegate_abs = ctx.expand(delegate_of)
-            except PathResolutionError:
-                delegate_abs = None
-
-        if delegate_path and cp.path == delegate_path:
-            rel["ancestry"].append(enrich(cp))
-        elif delegate_abs and delegate_abs == target.path:
-            rel["children"].append(enrich(cp))
-        elif (
-            target_delegate
-            and delegate_of == target_delegate
-            and cp.path != target.path
-        ):
-            rel["peers"].append(enrich(cp))
-
-        if parts_target and parts:
-            if (
-                parts["branch"] == parts_target["branch"]
-                and parts["version"] == parts_target["version"]
-            ):
-                if parts["step"] < parts_target["step"]:
-                    rel["ancestry"].append(enrich(cp))
-                elif parts["step"] > parts_target["step"]:
-                    rel["children"].append(enrich(cp))
-            elif (
-                parts["branch"] == parts_target["branch"]
-                and parts["version"] < parts_target["version"]
-            ):
-                rel["ancestry"].append(enrich(cp))
-            elif (
-                parts["branch"] == parts_target["branch"]
-                and parts["version"] > parts_target["version"]
-            ):
-                rel["children"].append(enrich(cp))
+        for kind in (delegate_kind.get(position), lineage_kind.get(position)):
+            if kind is None:
+                continue
+            rel[kind].append(enrich(cp))
+            if kind == "children":
+                child_positions.append(position)
 
     if depth > 1:
         expanded_children: List[Dict[str, Any]] = list(rel["children"])
-        queue = [(child, child["distance"]) for child in rel["children"]]
+        queue = [
+            (entry, entry["distance"], position)
+            for entry, position in zip(rel["children"], child_positions)
+        ]
         visited = {target.path}
         while queue:
-            child_entry, dist = queue.pop()
-            child_path = ctx.expand(child_entry["checkpoint"])
+            child_entry, dist, child_position = queue.pop()
+            child_path = nodes[child_position].path
             visited.add(child_path)
             if dist >= depth:
                 expanded_children.append(child_entry)
                 continue
-            for cp in checkpoints:
+            candidates = set(graph.delegates_of(child_path))
+            parts_child = graph.parts[child_position]
+            if parts_child:
+                candidates.update(graph.successors(parts_child))
+            for position in sorted(candidates):
+                cp = nodes[position]
                 if cp.path == child_path or cp.path in visited:
                     continue
-                child_delegate = cp.frontmatter.get("DELEGATE_OF")
-                try:
-                    delegate_abs = (
-                        ctx.expand(child_delegate)
-                        if isinstance(child_delegate, str)
-                        else None
-                    )
-                except PathResolutionError:
-                    delegate_abs = None
-                parts = checkpoint_name_parts(cp.name)
-                parts_child = checkpoint_name_parts(Path(child_path).name)
-                if delegate_abs and delegate_abs == child_path:
-                    entry = enrich(cp, distance=dist + 1)
-                    expanded_children.append(entry)
-                    queue.append((entry, dist + 1))
-                elif parts and parts_child and parts["branch"] == parts_child["branch"]:
-                    if parts["version"] > parts_child["version"]:
-                        entry = enrich(cp, distance=dist + 1)
-                        expanded_children.append(entry)
-                        queue.append((entry, dist + 1))
-                    elif (
-                        parts["version"] == parts_child["version"]
-                        and parts["step"] > parts_child["step"]
-                    ):
-                        entry = enrich(cp, distance=dist + 1)
-                        expanded_children.append(entry)
-                        queue.append((entry, dist + 1))
+                entry = enrich(cp, distance=dist + 1)
+                expanded_children.append(entry)
+                queue.append((entry, dist + 1, position))
         rel["children"] = expanded_children
 
     for key in rel:
@@ -1,12 +1,42 @@
 from __future__ import annotations
 
 import argparse
+import codecs
+import hashlib
+import json
+import os
+import re
+import shutil
 import subprocess
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, List, Optional, TextIO, Tuple
 
-from _lib import AcftContext, AcftError, EventEmitter, read_manifest_commands
+from _eventlog import EventEmitter
+from _lib import (
+    AcftContext,
+    AcftError,
+    Checkpoint,
+    atomic_write_text,
+    harness_commands,
+)
+
+# A trailing `# acft-group: NAME` comment puts a command into an explicit
+# parallel group; otherwise commands are grouped by their MANIFEST sub-heading.
+GROUP_ANNOTATION_RE = re.compile(r"#\s*acft-group:\s*([\w.-]+)\s*(?=#|$)")
+# `# acft-inputs: PATH[,PATH...]` declares extra files or directories whose
+# contents feed the verification cache key alongside `::THIS/ARTIFACTS`.
+INPUTS_ANNOTATION_RE = re.compile(r"#\s*acft-inputs:\s*([^#]+?)\s*(?=#|$)")
+# Session bookkeeping that differs between shells without affecting commands.
+CACHE_IGNORED_ENV = frozenset({"_", "PWD", "OLDPWD", "SHLVL", "ACFT_ACTOR"})
+# Command output is streamed in chunks of this size; only the last
+# OUTPUT_TAIL_BYTES are kept in memory for the HARNESS_EXECUTED payload.
+OUTPUT_CHUNK_BYTES = 64 * 1024
+OUTPUT_TAIL_BYTES = 2048
 
 
 def register(subparsers: argparse._SubParsersAction) -> None:
@@ -25,29 +55,101 @@ def register(subparsers: argparse._SubParsersAction) -> None:
         action="store_true",
         help="Emit HARNESS_EXECUTED event and fail if emission cannot append.",
     )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        metavar="N",
+        help=(
+            "Run up to N independent command groups at once. Groups are MANIFEST "
+            "sub-headings or '# acft-group: NAME' annotations; each group runs in order."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Run every command even if an identical passing run is cached.",
+    )
+    parser.add_argument(
+        "--tee",
+        action="store_true",
+        help="Also stream command output to the terminal while it is logged.",
+    )
     parser.set_defaults(handler=run)
 
 
+@dataclass
+class HarnessCommand:
+    index: int
+    section: str
+    command: str
+    group: str
+    inputs: List[str]
+
+
+@dataclass
+class CommandResult:
+    command: HarnessCommand
+    exit_code: int
+    duration: float
+    log_path: Optional[Path] = None
+    cached: bool = False
+    # For a cached result, the wall time of the run it replays; `duration` is the replay's.
+    original_duration: Optional[float] = None
+    output_bytes: int = 0
+    output_tail: str = ""
+
+    def payload(self, ctx: AcftContext) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {
+            "command": self.command.command,
+            "exit_code": self.exit_code,
+            "duration_s": round(self.duration, 3),
+            "cached": self.cached,
+            "output_bytes": self.output_bytes,
+            "output_tail": self.output_tail,
+        }
+        if self.original_duration is not None:
+            entry["original_duration_s"] = round(self.original_duration, 3)
+        if self.log_path is not None:
+            entry["group"] = self.command.group
+            entry["log_path"] = ctx.to_rooted(self.log_path)
+        return entry
+
+
 def run(args: argparse.Namespace, ctx: AcftContext) -> int:
     checkpoint = ctx.checkpoint_from_arg(args.path)
-    harness_commands = read_manifest_commands(
-        checkpoint.sections.get("MANIFEST", ""),
+    manifest_commands = harness_commands(
+        checkpoint.section_tokens("MANIFEST"),
         section_filter=args.section,
     )
-    harness_commands = [
+    manifest_commands = [
         (section, cmd)
-        for section, cmd in harness_commands
+        for section, cmd in manifest_commands
         if args.section is None
         or args.section.lower() in section.lower()
         or section == args.section.upper()
     ]
-    commands = [cmd for _, cmd in harness_commands]
+    commands = [
+        HarnessCommand(
+            index=index,
+            section=section,
+            command=cmd,
+            group=command_group(section, cmd),
+            inputs=command_inputs(cmd),
+        )
+        for index, (section, cmd) in enumerate(manifest_commands, start=1)
+    ]
     if not commands:
         raise AcftError("No harness commands found in MANIFEST.")
+    parallel = args.parallel or 1
+    if parallel < 1:
+        raise AcftError("--parallel must be at least 1.")
 
     print(f"Running harness for {ctx.to_rooted(checkpoint.path)}:")
-    for cmd in commands:
-        print(f"  $ {cmd}")
+    for item in commands:
+        if parallel > 1:
+            print(f"  [{item.group}] $ {item.command}")
+        else:
+            print(f"  $ {item.command}")
     if args.dry_run:
         return 0
 
@@ -57,31 +159,14 @@ def run(args: argparse.Namespace, ctx: AcftContext) -> int:
     logs_dir.mkdir(parents=True, exist_ok=True)
     timestamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
     log_path = logs_dir / f"harness_{timestamp}.log"
+    cache = None if args.no_cache else HarnessCache.open(ctx, checkpoint)
+    tee = sys.stdout if args.tee else None
 
-    execution_log: List[Dict[str, Any]] = []
-    overall_success = True
-    with log_path.open("w", encoding="utf-8") as log_file:
-        for command in commands:
-            log_file.write(f"$ {command}\n")
-            process = subprocess.run(
-                command,
-                shell=True,
-                text=True,
-                capture_output=True,
-            )
-            log_file.write(process.stdout or "")
-            if process.stderr:
-                log_file.write(process.stderr)
-            log_file.write(f"[exit {process.returncode}]\n\n")
-            execution_log.append(
-                {
-                    "command": command,
-                    "exit_code": process.returncode,
-                }
-            )
-            if process.returncode != 0:
-                overall_success = False
-                break
+    if parallel > 1:
+        results = run_parallel(commands, log_path, parallel, cache, tee)
+    else:
+        results = run_sequential(commands, log_path, cache, tee)
+    overall_success = all(result.exit_code == 0 for result in results)
 
     status = "pass" if overall_success else "fail"
     print(f"Harness {'passed' if overall_success else 'failed'} (log: {log_path})")
@@ -90,9 +175,301 @@ def run(args: argparse.Namespace, ctx: AcftContext) -> int:
         emitter = EventEmitter(ctx)
         payload = {
             "STATUS": status,
-            "COMMANDS": execution_log,
+            "COMMANDS": [result.payload(ctx) for result in results],
             "LOG_PATH": ctx.to_rooted(log_path),
         }
         emitter.emit("HARNESS_EXECUTED", checkpoint, payload)
 
     return 0 if overall_success else 1
+
+
+def command_group(section: str, command: str) -> str:
+    match = GROUP_ANNOTATION_RE.search(command)
+    return match.group(1) if match else section
+
+
+def command_inputs(command: str) -> List[str]:
+    match = INPUTS_ANNOTATION_RE.search(command)
+    if not match:
+        return []
+    return [token.strip() for token in match.group(1).split(",") if token.strip()]
+
+
+class HarnessCache:
+    """
+    Passing command runs stored under `::WORK/.acft/verify_cache/`.
+
+    Each entry is a `<key>.json` metadata file plus a `<key>.out` blob with
+    the raw output, which is spooled while the command runs and streamed
+    back on replay, so neither side holds the output in memory.
+
+    An entry is keyed by the command text, a content hash of
+    `::THIS/ARTIFACTS` plus any `acft-inputs` paths, the working directory,
+    and the environment. Inputs are hashed after a passing run, so a command
+    that writes into ARTIFACTS deterministically still hits next time.
+    """
+
+    DIRNAME = "verify_cache"
+    VERSION = 2
+
+    def __init__(self, ctx: AcftContext, checkpoint: Checkpoint, root: Path):
+        self.ctx = ctx
+        self.checkpoint = checkpoint
+        self.root = root
+        self._environment = _environment_digest()
+        self._digests: Dict[Tuple[str, ...], str] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, ctx: AcftContext, checkpoint: Checkpoint) -> Optional["HarnessCache"]:
+        if ctx.cache_dir is None:
+            return None
+        return cls(ctx, checkpoint, ctx.cache_dir / cls.DIRNAME)
+
+    def key(self, item: HarnessCommand) -> Optional[str]:
+        try:
+            inputs = self._inputs_digest(tuple(item.inputs))
+        except (AcftError, OSError):
+            return None  # An unresolvable input can never be trusted.
+        material = json.dumps(
+            [self.VERSION, item.command, inputs, os.getcwd(), self._environment]
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        if key is None:
+            return None
+        try:
+            entry = json.loads((self.root / f"{key}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or not (self.root / f"{key}.out").is_file():
+            return None
+        entry["blob"] = self.root / f"{key}.out"
+        return entry
+
+    def spool(self, item: HarnessCommand) -> Optional[IO[bytes]]:
+        """Open a temporary blob that receives the command's output as it streams."""
+        path = self.root / f".spool.{os.getpid()}.{threading.get_ident()}.{item.index}"
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            return path.open("wb")
+        except OSError:
+            return None
+
+    def store(self, item: HarnessCommand, spool: IO[bytes], result: "CommandResult") -> None:
+        key = self.key(item)
+        if key is None:
+            return
+        entry = {
+            "command": item.command,
+            "duration_s": round(result.duration, 3),
+            "output_bytes": result.output_bytes,
+            "output_tail": result.output_tail,
+        }
+        try:
+            os.replace(spool.name, self.root / f"{key}.out")
+            atomic_write_text(self.root / f"{key}.json", json.dumps(entry))
+        except OSError:
+            pass  # The cache is an optimisation; the next run simply re-executes.
+
+    def invalidate(self) -> None:
+        """Forget memoised input hashes after a command actually ran."""
+        with self._lock:
+            self._digests.clear()
+
+    def _inputs_digest(self, inputs: Tuple[str, ...]) -> str:
+        with self._lock:
+            cached = self._digests.get(inputs)
+        if cached is not None:
+            return cached
+        paths = [self.checkpoint.path / "ARTIFACTS"] + [self._resolve(raw) for raw in inputs]
+        digest = hashlib.sha256()
+        for path in paths:
+            digest.update(self.ctx.to_rooted(path).encode("utf-8") + b"\0")
+            _hash_tree(path, digest)
+        value = digest.hexdigest()
+        with self._lock:
+            self._digests[inputs] = value
+        return value
+
+    def _resolve(self, raw: str) -> Path:
+        # `::THIS` means the verified checkpoint, not the caller's cwd.
+        if raw.startswith("::THIS"):
+            return self.checkpoint.path / raw[len("::THIS") :].lstrip("/")
+        return self.ctx.expand(raw)
+
+
+def _hash_tree(path: Path, digest: Any) -> None:
+    if path.is_file():
+        digest.update(b"F" + _file_digest(path))
+        return
+    if not path.is_dir():
+        digest.update(b"-")
+        return
+    for child in sorted(path.rglob("*")):
+        if child.is_file():
+            digest.update(b"\0" + child.relative_to(path).as_posix().encode("utf-8") + b"\0")
+            digest.update(_file_digest(child))
+
+
+def _file_digest(path: Path) -> bytes:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(OUTPUT_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _environment_digest() -> str:
+    items = sorted((k, v) for k, v in os.environ.items() if k not in CACHE_IGNORED_ENV)
+    return hashlib.sha256(json.dumps(items).encode("utf-8")).hexdigest()
+
+
+def run_sequential(
+    commands: List[HarnessCommand],
+    log_path: Path,
+    cache: Optional[HarnessCache] = None,
+    tee: Optional[TextIO] = None,
+) -> List[CommandResult]:
+    """Run commands in order into one log, stopping at the first failure."""
+    results: List[CommandResult] = []
+    with log_path.open("w", encoding="utf-8") as log_file:
+        for item in commands:
+            result = execute(item, log_file, cache, tee)
+            results.append(result)
+            if result.exit_code != 0:
+                break
+    return results
+
+
+def run_parallel(
+    commands: List[HarnessCommand],
+    log_path: Path,
+    workers: int,
+    cache: Optional[HarnessCache] = None,
+    tee: Optional[TextIO] = None,
+) -> List[CommandResult]:
+    """
+    Run command groups concurrently, each group in order.
+
+    Every command writes to its own log under `harness_<ts>/`; a group stops
+    at its first failure while other groups run to completion. The combined
+    log is then assembled in MANIFEST order, so it does not depend on timing.
+    """
+    command_dir = log_path.with_suffix("")
+    command_dir.mkdir(parents=True, exist_ok=True)
+    groups: Dict[str, List[HarnessCommand]] = {}
+    for item in commands:
+        groups.setdefault(item.group, []).append(item)
+
+    def run_group(members: List[HarnessCommand]) -> List[CommandResult]:
+        group_results: List[CommandResult] = []
+        for item in members:
+            item_log = command_dir / f"{item.index:02d}.log"
+            with item_log.open("w", encoding="utf-8") as log_file:
+                result = execute(item, log_file, cache, tee)
+            result.log_path = item_log
+            group_results.append(result)
+            if result.exit_code != 0:
+                break
+        return group_results
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        batches = list(pool.map(run_group, groups.values()))
+    results = sorted(
+        (result for batch in batches for result in batch),
+        key=lambda result: result.command.index,
+    )
+    with log_path.open("w", encoding="utf-8") as log_file:
+        for result in results:
+            assert result.log_path is not None
+            with result.log_path.open(encoding="utf-8") as part:
+                shutil.copyfileobj(part, log_file, OUTPUT_CHUNK_BYTES)
+    return results
+
+
+def execute(
+    item: HarnessCommand,
+    log_file: TextIO,
+    cache: Optional[HarnessCache] = None,
+    tee: Optional[TextIO] = None,
+) -> CommandResult:
+    """
+    Run one command, streaming its combined stdout/stderr into `log_file`.
+
+    Output is read in `OUTPUT_CHUNK_BYTES` chunks and never accumulated;
+    the result carries the total byte count and the last
+    `OUTPUT_TAIL_BYTES` for the event payload.
+    """
+    log_file.write(f"$ {item.command}\n")
+    started = time.monotonic()
+    entry = cache.lookup(cache.key(item)) if cache else None
+    if entry is not None:
+        with entry["blob"].open("rb") as blob:
+            _pump(blob, [log_file, tee])
+        original = float(entry.get("duration_s", 0.0))
+        duration = time.monotonic() - started
+        log_file.write(f"[exit 0] (cached) replayed in {duration:.3f}s; original run took {original:.3f}s\n\n")
+        return CommandResult(
+            command=item,
+            exit_code=0,
+            duration=duration,
+            cached=True,
+            original_duration=original,
+            output_bytes=int(entry.get("output_bytes", 0)),
+            output_tail=str(entry.get("output_tail", "")),
+        )
+
+    spool = cache.spool(item) if cache else None
+    process = subprocess.Popen(
+        item.command,
+        shell=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    assert process.stdout is not None
+    with process.stdout:
+        output_bytes, tail = _pump(process.stdout, [log_file, tee], spool)
+    returncode = process.wait()
+    duration = time.monotonic() - started
+    log_file.write(f"[exit {returncode}]\n\n")
+    result = CommandResult(
+        command=item,
+        exit_code=returncode,
+        duration=duration,
+        output_bytes=output_bytes,
+        output_tail=tail.decode("utf-8", errors="replace"),
+    )
+    if cache is not None:
+        cache.invalidate()
+        if spool is not None:
+            spool.close()
+            if returncode == 0:
+                cache.store(item, spool, result)
+            Path(spool.name).unlink(missing_ok=True)
+    return result
+
+
+def _pump(
+    source: IO[bytes], sinks: List[Optional[TextIO]], spool: Optional[IO[bytes]] = None
+) -> Tuple[int, bytes]:
+    """Copy `source` to text `sinks` chunk by chunk; return (byte count, tail)."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    total = 0
+    tail = b""
+    for chunk in iter(lambda: source.read1(OUTPUT_CHUNK_BYTES), b""):  # type: ignore[attr-defined]
+        total += len(chunk)
+        tail = (tail + chunk)[-OUTPUT_TAIL_BYTES:]
+        if spool is not None:
+            spool.write(chunk)
+        text = decoder.decode(chunk)
+        for sink in sinks:
+            if sink is not None:
+                sink.write(text)
+                sink.flush()
+    text = decoder.decode(b"", final=True)
+    for sink in sinks:
+        if sink is not None:
+            sink.write(text)
+    return total, tail
@@ -0,0 +1,624 @@
+"""Event log storage, indexing and emission for acft."""
+
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import json
+import os
+import select
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from _lib import (
+    AcftContext,
+    AcftError,
+    Checkpoint,
+    atomic_write_text,
+    parse_iso_timestamp,
+    relative_duration_to_seconds,
+    utcnow_iso,
+)
+
+EVENT_LOG_FILENAME = "checkpoints_events.log"
+# Sealed event log segments live in this ::WORK subdirectory.
+EVENT_SEGMENT_DIRNAME = "checkpoints_events"
+DEFAULT_EVENT_SEGMENT_BYTES = 64 * 1024 * 1024
+SEGMENT_SUFFIXES = {"": ".log", "none": ".log", "gzip": ".log.gz", "zstd": ".log.zst"}
+# Event TYPEs that record a checkpoint's state; compaction keeps the latest per checkpoint.
+STATE_EVENT_TYPES = frozenset({"CHECKPOINT_CREATED", "CHECKPOINT_VERIFIED", "CHECKPOINT_CLOSED"})
+# Event timestamps come from each actor's clock; `--since` lookups start this
+# many seconds early so a slightly skewed writer cannot hide an event.
+EVENT_CLOCK_SKEW_S = 300.0
+
+
+def event_rotation_from_env() -> Tuple[int, Optional[int], str]:
+    """Return `(max_bytes, max_age_s, codec)` for event log segments."""
+    raw_bytes = os.environ.get("ACFT_EVENTS_SEGMENT_BYTES")
+    max_bytes = DEFAULT_EVENT_SEGMENT_BYTES
+    if raw_bytes:
+        try:
+            max_bytes = int(raw_bytes)
+        except ValueError as exc:
+            raise AcftError(f"ACFT_EVENTS_SEGMENT_BYTES must be an integer, got {raw_bytes!r}") from exc
+    raw_age = os.environ.get("ACFT_EVENTS_SEGMENT_AGE")
+    max_age: Optional[int] = None
+    if raw_age:
+        try:
+            max_age = relative_duration_to_seconds("-" + raw_age.lstrip("-"))
+        except ValueError as exc:
+            raise AcftError(f"Invalid ACFT_EVENTS_SEGMENT_AGE: {exc}") from exc
+    codec = os.environ.get("ACFT_EVENTS_COMPRESS", "").strip().lower()
+    if codec not in SEGMENT_SUFFIXES:
+        raise AcftError(f"ACFT_EVENTS_COMPRESS must be one of gzip, zstd (got {codec!r})")
+    return max_bytes, max_age, codec
+
+
+def _open_segment(path: Path, mode: str) -> Any:
+    if path.name.endswith(".gz"):
+        import gzip
+
+        return gzip.open(path, mode)
+    if path.name.endswith(".zst"):
+        try:
+            from compression import zstd  # type: ignore  # Python 3.14+
+        except ImportError as exc:
+            raise AcftError(f"Cannot read {path}: this Python has no zstd support") from exc
+        return zstd.open(path, mode)
+    return path.open(mode)
+
+
+class EventLog:
+    """Segmented event storage: the active log plus sealed segments under `::WORK`."""
+
+    MANIFEST = "segments.json"
+
+    def __init__(self, work_root: Path, cache_dir: Optional[Path] = None):
+        self.active_path = work_root / EVENT_LOG_FILENAME
+        self.segment_dir = work_root / EVENT_SEGMENT_DIRNAME
+        self.index_path = cache_dir / EventIndex.FILENAME if cache_dir else None
+
+    @classmethod
+    def for_context(cls, context: "AcftContext") -> "EventLog":
+        if not context.work_root:
+            raise AcftError("Cannot access event log: no checkpoints_work.toml found in ancestor directories")
+        return cls(context.work_root, context.cache_dir)
+
+    def segments(self) -> List[Dict[str, Any]]:
+        """Sealed segments in order; files missing from the manifest are described on the fly."""
+        if not self.segment_dir.is_dir():
+            return []
+        try:
+            manifest = json.loads((self.segment_dir / self.MANIFEST).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            manifest = []
+        known = {entry["name"]: entry for entry in manifest if isinstance(entry, dict) and "name" in entry}
+        entries = []
+        for path in sorted(self.segment_dir.glob("[0-9]*.log*")):
+            entries.append(known.get(path.name) or self._describe(path))
+        return entries
+
+    def maybe_rotate(self) -> None:
+        max_bytes, max_age, _ = event_rotation_from_env()
+        if self._due(max_bytes, max_age):
+            with self._locked():
+                if self._due(max_bytes, max_age):
+                    self._seal()
+
+    def seal(self) -> Optional[Dict[str, Any]]:
+        """Seal the active segment now, regardless of thresholds."""
+        with self._locked():
+            return self._seal()
+
+    def iter_sealed_lines(
+        self, since_ts: Optional[float] = None, types: Optional[set[str]] = None
+    ) -> Iterator[bytes]:
+        """Yield raw lines of sealed segments that may hold matching events."""
+        for entry in self.segments():
+            last_ts = entry.get("last_ts")
+            if since_ts is not None and last_ts is not None and last_ts < since_ts - EVENT_CLOCK_SKEW_S:
+                continue
+            if types and "types" in entry and not types.intersection(entry["types"]):
+                continue
+            with _open_segment(self.segment_dir / entry["name"], "rb") as stream:
+                yield from stream
+
+    def compact(self) -> Tuple[int, int]:
+        """Rewrite sealed segments keeping the latest state event per checkpoint."""
+        with self._locked():
+            segments = self.segments()
+            if not segments:
+                return 0, 0
+            latest: Dict[Tuple[str, str], int] = {}
+            ordinal = 0
+            for _, key in self._keyed_lines(segments, include_active=True):
+                if key is not None:
+                    latest[key] = ordinal
+                ordinal += 1
+
+            _, _, codec = event_rotation_from_env()
+            last_seq = int(segments[-1]["name"].split(".", 1)[0])
+            target = self.segment_dir / f"{last_seq:06d}{SEGMENT_SUFFIXES[codec]}"
+            tmp_path = self.segment_dir / f".compact.{os.getpid()}{SEGMENT_SUFFIXES[codec]}"
+            kept = total = 0
+            with _open_segment(tmp_path, "wb") as out:
+                for line, key in self._keyed_lines(segments, include_active=False):
+                    if key is None or latest.get(key) == total:
+                        out.write(line)
+                        kept += 1
+                    total += 1
+            os.replace(tmp_path, target)
+            for entry in segments:
+                if entry["name"] != target.name:
+                    (self.segment_dir / entry["name"]).unlink(missing_ok=True)
+            self._write_manifest([self._describe(target)])
+            return kept, total
+
+    def _keyed_lines(
+        self, segments: List[Dict[str, Any]], include_active: bool
+    ) -> Iterator[Tuple[bytes, Optional[Tuple[str, str]]]]:
+        paths = [self.segment_dir / entry["name"] for entry in segments]
+        if include_active and self.active_path.exists():
+            paths.append(self.active_path)
+        for path in paths:
+            with _open_segment(path, "rb") as stream:
+                for line in stream:
+                    if not line.strip():
+                        continue
+                    try:
+                        event = json.loads(line)
+                        key = None
+                        if "CHECKPOINT_PATH" in event:
+                            kind = "STATE" if event["TYPE"] in STATE_EVENT_TYPES else event["TYPE"]
+                            key = (event["CHECKPOINT_PATH"], kind)
+                    except (ValueError, KeyError, TypeError):
+                        key = None
+                    yield line, key
+
+    def _due(self, max_bytes: int, max_age: Optional[int]) -> bool:
+        try:
+            size = self.active_path.stat().st_size
+        except OSError:
+            return False
+        if size == 0:
+            return False
+        if max_bytes and size >= max_bytes:
+            return True
+        if max_age is not None:
+            with self.active_path.open("rb") as stream:
+                first = _event_timestamp(stream.readline())
+            return first is not None and time.time() - first >= max_age
+        return False
+
+    def _seal(self) -> Optional[Dict[str, Any]]:
+        if not self.active_path.exists() or self.active_path.stat().st_size == 0:
+            return None
+        _, _, codec = event_rotation_from_env()
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        segments = self.segments()
+        seq = int(segments[-1]["name"].split(".", 1)[0]) + 1 if segments else 1
+        target = self.segment_dir / f"{seq:06d}{SEGMENT_SUFFIXES[codec]}"
+        # Hold the writers' lock so no append is split across the rename.
+        with locked_append(self.active_path):
+            sealing = target if target.suffix == ".log" else self.segment_dir / f".sealing.{os.getpid()}.log"
+            os.replace(self.active_path, sealing)
+        if sealing != target:
+            tmp_path = self.segment_dir / f".sealing.{os.getpid()}{SEGMENT_SUFFIXES[codec]}"
+            with sealing.open("rb") as src, _open_segment(tmp_path, "wb") as dst:
+                for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                    dst.write(chunk)
+            os.replace(tmp_path, target)
+            sealing.unlink()
+        if self.index_path is not None:
+            self.index_path.unlink(missing_ok=True)  # Offsets referred to the sealed file.
+        entry = self._describe(target)
+        self._write_manifest(segments + [entry])
+        return entry
+
+    def _describe(self, path: Path) -> Dict[str, Any]:
+        first_ts: Optional[float] = None
+        last_ts: Optional[float] = None
+        types: set[str] = set()
+        events = 0
+        with _open_segment(path, "rb") as stream:
+            for line in stream:
+                try:
+                    event = json.loads(line)
+                    timestamp = parse_iso_timestamp(event["TIMESTAMP"]).timestamp()
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    continue
+                events += 1
+                types.add(str(event.get("TYPE", "")))
+                first_ts = timestamp if first_ts is None else min(first_ts, timestamp)
+                last_ts = timestamp if last_ts is None else max(last_ts, timestamp)
+        return {
+            "name": path.name,
+            "events": events,
+            "first_ts": first_ts,
+            "last_ts": last_ts,
+            "types": sorted(types),
+        }
+
+    def _write_manifest(self, entries: List[Dict[str, Any]]) -> None:
+        atomic_write_text(self.segment_dir / self.MANIFEST, json.dumps(entries, indent=2) + "\n")
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        with (self.segment_dir / ".lock").open("a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _event_timestamp(line: bytes) -> Optional[float]:
+    try:
+        return parse_iso_timestamp(json.loads(line)["TIMESTAMP"]).timestamp()
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+class EventIndex:
+    """Seekable sidecar index for the event log (`::WORK/.acft/events.idx`)."""
+
+    FILENAME = "events.idx"
+    RECORD = struct.Struct("<QdI")
+    MAGIC = b"ACFTEVI1"
+
+    def __init__(self, log_path: Path, index_path: Path):
+        self.log_path = log_path
+        self.index_path = index_path
+
+    @classmethod
+    def open(cls, context: "AcftContext") -> Optional["EventIndex"]:
+        if os.environ.get("ACFT_NO_INDEX") or context.cache_dir is None or context.work_root is None:
+            return None
+        return cls(context.work_root / EVENT_LOG_FILENAME, context.cache_dir / cls.FILENAME)
+
+    @staticmethod
+    def type_hash(event_type: str) -> int:
+        return zlib.crc32(event_type.encode("utf-8"))
+
+    def sync(self) -> int:
+        """Index unindexed log lines; return the log offset the index covers."""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.index_path.open("a+b") as index, self.log_path.open("rb") as log:
+            fcntl.flock(index, fcntl.LOCK_EX)
+            try:
+                position = self._indexed_end(index, log)
+                if position is None:
+                    index.truncate(0)
+                    index.write(self.MAGIC)
+                    position = 0
+                log.seek(position)
+                records = bytearray()
+                for line in iter(log.readline, b""):
+                    if not line.endswith(b"\n"):
+                        break  # A writer is mid-append; index it next time.
+                    record = self._record_for(position, line)
+                    if record is not None:
+                        records += record
+                    position += len(line)
+                if records:
+                    index.seek(0, os.SEEK_END)
+                    index.write(records)
+                return position
+            finally:
+                fcntl.flock(index, fcntl.LOCK_UN)
+
+    def scan(self, since_ts: Optional[float], type_hashes: Optional[set[int]]) -> Iterator[int]:
+        """Yield offsets of lines that may match; callers still filter exactly."""
+        size = self.RECORD.size
+        with self.index_path.open("rb") as index:
+            count = (index.seek(0, os.SEEK_END) - len(self.MAGIC)) // size
+            start = self._first_since(index, count, since_ts)
+            index.seek(len(self.MAGIC) + start * size)
+            remaining = count - start
+            while remaining > 0:
+                batch = min(remaining, 4096)
+                chunk = index.read(batch * size)
+                for offset, _, type_hash in self.RECORD.iter_unpack(chunk):
+                    if type_hashes is None or type_hash in type_hashes:
+                        yield offset
+                remaining -= batch
+
+    def start_offset(self, since_ts: float, end: int) -> int:
+        """Log offset of the first line at or after `since_ts`, or `end` if none is."""
+        size = self.RECORD.size
+        with self.index_path.open("rb") as index:
+            count = (index.seek(0, os.SEEK_END) - len(self.MAGIC)) // size
+            start = self._first_since(index, count, since_ts)
+            if start == count:
+                return end
+            index.seek(len(self.MAGIC) + start * size)
+            return self.RECORD.unpack(index.read(size))[0]
+
+    def _first_since(self, index: Any, count: int, since_ts: Optional[float]) -> int:
+        if since_ts is None:
+            return 0
+        size = self.RECORD.size
+        threshold = since_ts - EVENT_CLOCK_SKEW_S
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            index.seek(len(self.MAGIC) + middle * size)
+            if self.RECORD.unpack(index.read(size))[1] < threshold:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _indexed_end(self, index: Any, log: Any) -> Optional[int]:
+        """End offset of the last indexed line, or None if the index is unusable."""
+        index.seek(0)
+        if index.read(len(self.MAGIC)) != self.MAGIC:
+            return None
+        size = self.RECORD.size
+        end = index.seek(0, os.SEEK_END)
+        usable = end - (end - len(self.MAGIC)) % size
+        if usable != end:
+            index.truncate(usable)  # Drop a torn trailing record.
+        if usable == len(self.MAGIC):
+            return 0
+        index.seek(usable - size)
+        offset = self.RECORD.unpack(index.read(size))[0]
+        log.seek(offset)
+        line = log.readline()
+        if not line.endswith(b"\n") or not line.startswith(b"{"):
+            return None
+        return offset + len(line)
+
+    def _record_for(self, offset: int, line: bytes) -> Optional[bytes]:
+        try:
+            event = json.loads(line)
+            timestamp = parse_iso_timestamp(event["TIMESTAMP"]).timestamp()
+            event_type = str(event.get("TYPE", ""))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+        return self.RECORD.pack(offset, timestamp, self.type_hash(event_type))
+
+
+class Inotify:
+    """Minimal ctypes binding for Linux inotify; `create()` returns None if unavailable."""
+
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    IN_ISDIR = 0x40000000
+    CHANGES = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    _IN_NONBLOCK_CLOEXEC = 0o4000 | 0o2000000
+    _HEADER = struct.Struct("iIII")
+
+    def __init__(self, libc: Any, fd: int):
+        self._libc = libc
+        self.fd = fd
+
+    @classmethod
+    def create(cls) -> Optional["Inotify"]:
+        try:
+            import ctypes
+            import ctypes.util
+
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(cls._IN_NONBLOCK_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        return cls(libc, fd)
+
+    def add_watch(self, directory: Path, mask: int = CHANGES) -> bool:
+        return self._libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), mask) >= 0
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        return bool(ready)
+
+    def read(self) -> List[Tuple[int, int, bytes]]:
+        """Return queued `(wd, mask, name)` events without blocking."""
+        events: List[Tuple[int, int, bytes]] = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset + self._HEADER.size <= len(data):
+                wd, mask, _, length = self._HEADER.unpack_from(data, offset)
+                start = offset + self._HEADER.size
+                events.append((wd, mask, data[start : start + length].rstrip(b"\0")))
+                offset = start + length
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class LogWatcher:
+    """Block until `path` may have changed, via inotify or polling."""
+
+    def __init__(self, path: Path, poll_interval: float = 0.5):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._inotify: Optional[Inotify] = None
+        if not os.environ.get("ACFT_FOLLOW_POLL"):
+            self._inotify = Inotify.create()
+            if self._inotify is not None and not self._inotify.add_watch(path.parent):
+                self._inotify.close()
+                self._inotify = None
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._inotify is not None
+
+    def wait(self, timeout: float = 1.0) -> None:
+        """Return once the file may have changed, or after `timeout` seconds."""
+        if self._inotify is None:
+            time.sleep(self.poll_interval)
+            return
+        target = os.fsencode(self.path.name)
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._inotify.wait(remaining):
+                return
+            if any(name == target for _, _, name in self._inotify.read()):
+                return
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def __enter__(self) -> "LogWatcher":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+def event_fsync_from_env() -> bool:
+    """`ACFT_EVENTS_FSYNC`: `batch` fsyncs every appended batch, `none` (default) leaves it to the OS."""
+    raw = (os.environ.get("ACFT_EVENTS_FSYNC") or "none").strip().lower()
+    if raw not in ("none", "batch"):
+        raise AcftError(f"ACFT_EVENTS_FSYNC must be 'none' or 'batch', got {raw!r}")
+    return raw == "batch"
+
+
+EVENT_BUS_SOCKET = "events.sock"
+
+
+def publish_to_bus(socket_path: Path, records: List[bytes], timeout: float = 2.0) -> bool:
+    """Hand `records` to a running `acft events serve` daemon; False if none answers."""
+    import socket
+
+    message = json.dumps({"op": "publish", "records": [r.decode("utf-8") for r in records]})
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(str(socket_path))
+            conn.sendall(message.encode("utf-8") + b"\n")
+            with conn.makefile("rb") as reply:
+                response = json.loads(reply.readline() or b"{}")
+    except (OSError, ValueError):
+        return False
+    return bool(response.get("ok"))
+
+
+class EventEmitter:
+    """Append events to the active event log segment, or publish them to the bus."""
+
+    local_bus: Optional[Any] = None  # Callable[[List[bytes]], None]
+
+    def __init__(self, context: AcftContext):
+        self.context = context
+        if os.environ.get("ACFT_ACTOR"):
+            self.actor = os.environ["ACFT_ACTOR"]
+        else:
+            import getpass
+
+            self.actor = getpass.getuser()
+        if not self.context.work_root:
+            raise AcftError("Cannot initialize event emitter: no checkpoints_work.toml found in ancestor directories")
+        self.log_path = (self.context.work_root / EVENT_LOG_FILENAME).resolve()
+        self.events = EventLog.for_context(context)
+        self.fsync = event_fsync_from_env()
+        self.bus_path: Optional[Path] = None
+        if context.cache_dir is not None and not os.environ.get("ACFT_NO_EVENT_BUS"):
+            self.bus_path = context.cache_dir / EVENT_BUS_SOCKET
+        self._pending: Optional[List[bytes]] = None
+
+    def emit(self, event_type: str, checkpoint: Optional[Checkpoint], payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        payload = payload or {}
+        event: Dict[str, Any] = {
+            "TYPE": event_type,
+            "ACTOR": self.actor,
+            "TIMESTAMP": utcnow_iso(),
+            "PAYLOAD": payload,
+        }
+        if checkpoint is not None:
+            event["CHECKPOINT_PATH"] = self.context.to_rooted(checkpoint.path)
+        line = json.dumps(event, sort_keys=True)
+        print(line)
+        record = (line + "\n").encode("utf-8")
+        if self._pending is not None:
+            self._pending.append(record)
+        else:
+            self._append([record])
+        return event
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator["EventEmitter"]:
+        """Buffer events emitted in the block and append them in one locked write."""
+        if self._pending is not None:
+            yield self  # Nested batches join the outer one.
+            return
+        self._pending = []
+        try:
+            yield self
+            records = self._pending
+        finally:
+            self._pending = None
+        if records:
+            self._append(records)
+
+    def _append(self, records: List[bytes]) -> None:
+        if EventEmitter.local_bus is not None:
+            EventEmitter.local_bus(records)
+            return
+        if self.bus_path is not None and self.bus_path.exists() and publish_to_bus(self.bus_path, records):
+            return
+        self.write_records(records)
+
+    def write_records(self, records: List[bytes]) -> None:
+        """Append `records` to the event log file directly."""
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self.events.maybe_rotate()
+        except OSError:
+            pass  # Rotation is housekeeping; keep appending to the active segment.
+        data = b"".join(records)
+        try:
+            with locked_append(self.log_path) as fd:
+                view = memoryview(data)
+                while view:
+                    written = os.write(fd, view)
+                    view = view[written:]
+                if self.fsync:
+                    os.fsync(fd)
+        except OSError as exc:
+            raise AcftError(f"Failed to append event log at {self.log_path}: {exc}") from exc
+
+
+@contextlib.contextmanager
+def locked_append(path: Path, create: bool = True) -> Iterator[int]:
+    """Yield an `O_APPEND` descriptor for `path` holding an exclusive flock."""
+    flags = os.O_WRONLY | os.O_APPEND | (os.O_CREAT if create else 0)
+    while True:
+        fd = os.open(path, flags, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                current = os.stat(path).st_ino
+            except FileNotFoundError:
+                current = None
+            if current == os.fstat(fd).st_ino:
+                break
+        except BaseException:
+            os.close(fd)
+            raise
+        os.close(fd)
+    try:
+        yield fd
+    finally:
+        os.close(fd)  # Closing releases the flock.
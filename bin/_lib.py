@@ -10,17 +10,23 @@ automation shares the same primitives as humans.
 
 from __future__ import annotations
 
-import argparse
+import contextlib
 import datetime as _dt
-import getpass
 import json
 import os
 import re
-import subprocess
-import textwrap
-from dataclasses import dataclass, field
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+# Every command imports this module, so modules only some commands need
+# (hashlib, sqlite3, subprocess, `_eventlog`, ...) are imported where
+# they are used, and `dataclasses` (which pulls in `inspect`) is avoided;
+# see `python -X importtime bin/acft expand ::WORK`.
+if TYPE_CHECKING:
+    import subprocess
 
 
 ISO_TIMESTAMP_RE = re.compile(
@@ -31,6 +37,17 @@ ISO_TIMESTAMP_RE = re.compile(
 
 CHECKPOINT_NAME_RE = re.compile(r"^(?P<branch>[a-z0-9_]+)_v(?P<version>\d+)_(?P<step>\d{2})$")
 
+# Derived, rebuildable state (indexes, caches) lives in this ::WORK subdirectory.
+CACHE_DIRNAME = ".acft"
+
+# Subtrees that never contain nested checkpoints; discovery does not descend
+# into them (hidden directories are skipped as well).
+SCAN_PRUNED_DIRS = frozenset({"ARTIFACTS", "STAGE", "logs", "_archive", "node_modules", "__pycache__"})
+DEFAULT_SCAN_DEPTH = 6
+
+# Stat-keyed caches distrust files modified more recently than this.
+RACY_WINDOW_NS = 2_000_000_000
+
 
 class AcftError(Exception):
     """Base exception for ACFT-related failures."""
@@ -44,6 +61,10 @@ class CheckpointFormatError(AcftError):
     """Raised when `CHECKPOINT.md` cannot be parsed as expected."""
 
 
+class CheckpointConflictError(AcftError):
+    """Raised when `CHECKPOINT.md` changed underneath an update in a way that cannot be merged."""
+
+
 def utcnow_iso() -> str:
     """Return a UTC ISO-8601 timestamp compatible with event schema."""
     return (
@@ -74,42 +95,351 @@ def _strip_bom(text: str) -> str:
     return text.lstrip("\ufeff")
 
 
-def _detect_sections(body: str) -> Tuple[Dict[str, str], List[str]]:
-    """Parse Markdown sections (# HEADER) into a dict preserving order."""
-    sections: Dict[str, str] = {}
+SectionBounds = Dict[str, Tuple[int, int, int]]
+# (project_root, work_root, checkpoint_root) as found by `AcftContext.discover`.
+DiscoveredRoots = Tuple[Optional[Path], Optional[Path], Optional[Path]]
+
+
+# Token kinds produced by `iter_markdown_tokens`.
+TOKEN_HEADING = "heading"
+TOKEN_FENCE_OPEN = "fence_open"
+TOKEN_FENCE_CLOSE = "fence_close"
+TOKEN_CODE = "code"
+TOKEN_BULLET = "bullet"
+TOKEN_LEDGER_ROW = "ledger_row"
+TOKEN_LOG_ROW = "log_row"
+TOKEN_TEXT = "text"
+
+_HEADING_RE = re.compile(r"(#+)\s+(.*)")
+_LOG_ROW_RE = re.compile(r"- ([^ ]+) - (.*)")
+
+
+class MarkdownToken(NamedTuple):
+    """One token from `iter_markdown_tokens`; `fields` is set for ledger and log rows."""
+
+    kind: str
+    start: int
+    end: int
+    section: Optional[str]
+    text: str
+    level: int = 0
+    fields: Tuple[str, ...] = ()
+
+
+def iter_markdown_tokens(text: str, section: Optional[str] = None) -> Iterator[MarkdownToken]:
+    """Lex `CHECKPOINT.md` body text into line tokens in one pass."""
+    token = tuple.__new__  # Skips NamedTuple's Python-level __new__; this loop is hot.
+    in_fence = False
+    in_ledger = False
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        start = offset
+        offset += len(line)
+        stripped = line.strip()
+        if not stripped:
+            if in_fence:
+                yield token(MarkdownToken, (TOKEN_CODE, start, offset, section, "", 0, ()))
+            continue
+        first = stripped[0]
+        if first == "`" and stripped.startswith("```"):
+            if in_fence:
+                yield token(MarkdownToken, (TOKEN_FENCE_CLOSE, start, offset, section, "", 0, ()))
+            else:
+                language = stripped.lstrip("`")
+                yield token(MarkdownToken, (TOKEN_FENCE_OPEN, start, offset, section, language, 0, ()))
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            yield token(MarkdownToken, (TOKEN_CODE, start, offset, section, stripped, 0, ()))
+            continue
+        if first == "#":
+            if line.lstrip().startswith("# "):
+                section = stripped[2:].strip()
+                in_ledger = False
+                yield token(MarkdownToken, (TOKEN_HEADING, start, offset, section, section, 1, ()))
+                continue
+            heading = _HEADING_RE.match(stripped)
+            # Level 1 is only "# ", as for `_iter_level1_headings`; "#\tX" is text.
+            if heading and len(heading.group(1)) > 1:
+                level = len(heading.group(1))
+                if level == 2:
+                    in_ledger = section == "MANIFEST" and stripped.upper().startswith("## MANIFEST LEDGER")
+                title = heading.group(2).strip()
+                yield token(MarkdownToken, (TOKEN_HEADING, start, offset, section, title, level, ()))
+                continue
+        if first == "-" and stripped.startswith("- "):
+            item: Optional[str] = stripped[2:]
+            yield token(MarkdownToken, (TOKEN_BULLET, start, offset, section, item, 0, ()))
+        else:
+            item = None
+            yield token(MarkdownToken, (TOKEN_TEXT, start, offset, section, stripped, 0, ()))
+        if in_ledger:
+            if first == ">":
+                continue
+            row = (item if item is not None else stripped).strip()
+            parts = [part.strip() for part in row.split("->")]
+            # Example format: Deliverable -> ::THIS/ARTIFACTS/foo -> Intent
+            if len(parts) >= 2:
+                fields = (parts[0], parts[1], " -> ".join(parts[2:]))
+                yield token(MarkdownToken, (TOKEN_LEDGER_ROW, start, offset, section, row, 0, fields))
+        elif section == "LOG" and item is not None:
+            log_row = _LOG_ROW_RE.fullmatch(stripped)
+            if log_row:
+                fields = (log_row.group(1), log_row.group(2).strip())
+                yield token(MarkdownToken, (TOKEN_LOG_ROW, start, offset, section, stripped, 0, fields))
+
+
+def _index_sections(
+    body: str, tokens: Optional[Iterable[MarkdownToken]] = None
+) -> Tuple[List[str], SectionBounds]:
+    """Return section order and `(start, end, prefix_end)` offsets into `body`."""
     order: List[str] = []
+    bounds: SectionBounds = {}
     current_name: Optional[str] = None
-    current_lines: List[str] = []
-    fence_active = False
+    current_start = 0
+    prefix_end = 0
+
+    if tokens is None:
+        headings = _iter_level1_headings(body)
+    else:
+        headings = (
+            (token.start, token.end, token.text)
+            for token in tokens
+            if token.kind == TOKEN_HEADING and token.level == 1
+        )
+    for line_start, line_end, name in headings:
+        if current_name is not None:
+            bounds[current_name] = (current_start, line_start, prefix_end)
+            prefix_end = 0
+        else:
+            prefix_end = line_start
+        current_name = name
+        current_start = line_end
+        order.append(current_name)
+
+    if current_name is not None:
+        bounds[current_name] = (current_start, len(body), prefix_end)
 
-    for line in body.splitlines():
+    return order, bounds
+
+
+# Line boundaries `str.splitlines` honours besides "\n" and "\r".
+_RARE_LINE_BREAKS = "\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+_HEADING_OR_FENCE_RE = re.compile(r"[^\S\n]*(?:```|# )")
+# Anchoring on the newline lets the regex engine skip ahead between lines.
+_NEXT_HEADING_OR_FENCE_RE = re.compile(r"\n[^\S\n]*(?:```|# )")
+
+
+def _iter_level1_headings(body: str) -> Iterator[Tuple[int, int, str]]:
+    """Yield `(start, end, name)` for the `# ` headings `iter_markdown_tokens` would emit."""
+    fence_active = False
+    plain_lines = not any(separator in body for separator in _RARE_LINE_BREAKS) and (
+        "\r" not in body or body.count("\r") == body.count("\r\n")
+    )
+    if plain_lines:
+        # Only lines starting a heading or fence matter; let the regex skip the rest.
+        starts = [0] if _HEADING_OR_FENCE_RE.match(body) else []
+        starts.extend(match.start() + 1 for match in _NEXT_HEADING_OR_FENCE_RE.finditer(body))
+        for line_start in starts:
+            line_end = body.find("\n", line_start) + 1 or len(body)
+            stripped = body[line_start:line_end].lstrip()
+            if stripped.startswith("```"):
+                fence_active = not fence_active
+            elif not fence_active:
+                yield line_start, line_end, stripped[2:].strip()
+        return
+    offset = 0
+    for line in body.splitlines(keepends=True):
+        line_start = offset
+        offset += len(line)
         stripped = line.lstrip()
         if stripped.startswith("```"):
             fence_active = not fence_active
-            current_lines.append(line)
-            continue
-        if not fence_active and stripped.startswith("# "):
-            if current_name is not None:
-                sections[current_name] = "\n".join(current_lines).strip()
-                current_lines = []
-            current_name = stripped[2:].strip()
-            order.append(current_name)
-        else:
-            current_lines.append(line)
+        elif not fence_active and stripped.startswith("# "):
+            yield line_start, offset, stripped[2:].strip()
 
-    if current_name is not None:
-        sections[current_name] = "\n".join(current_lines).strip()
 
+def _section_text(body: str, bounds: Tuple[int, int, int]) -> str:
+    start, end, prefix_end = bounds
+    if prefix_end:
+        return (body[:prefix_end] + body[start:end]).strip()
+    return body[start:end].strip()
+
+
+def _detect_sections(body: str) -> Tuple[Dict[str, str], List[str]]:
+    """Parse Markdown sections (# HEADER) into a dict preserving order."""
+    order, bounds = _index_sections(body)
+    sections = {name: _section_text(body, span) for name, span in bounds.items()}
     return sections, order
 
 
+def _split_frontmatter(content: str, source: Path) -> Tuple[str, str]:
+    """Split `CHECKPOINT.md` text into its frontmatter block and body."""
+    content = _strip_bom(content)
+    if not content.startswith("---"):
+        raise CheckpointFormatError(f"{source} missing YAML frontmatter delimiter")
+    frontmatter_end = content.find("\n---", 3)
+    if frontmatter_end == -1:
+        raise CheckpointFormatError(f"{source} missing closing YAML delimiter")
+    return content[3:frontmatter_end], content[frontmatter_end + 4 :].lstrip("\n")
+
+
+def _read_frontmatter_block(source: Path) -> str:
+    """Read just enough of `source` to return its frontmatter block."""
+    with source.open("r", encoding="utf-8") as fh:
+        buffer = _strip_bom(fh.read(4096))
+        if not buffer.startswith("---"):
+            raise CheckpointFormatError(f"{source} missing YAML frontmatter delimiter")
+        search_from = 3
+        while True:
+            frontmatter_end = buffer.find("\n---", search_from)
+            if frontmatter_end != -1:
+                return buffer[3:frontmatter_end]
+            chunk = fh.read(65536)
+            if not chunk:
+                raise CheckpointFormatError(f"{source} missing closing YAML delimiter")
+            search_from = max(3, len(buffer) - 3)
+            buffer += chunk
+
+
+_YAML_UNSET: Any = object()
+_yaml_load: Any = _YAML_UNSET
+
+
+def _yaml_safe_load() -> Optional[Callable[[str], Any]]:
+    """Return PyYAML's safe loader (libyaml-backed when available), or None."""
+    global _yaml_load
+    if _yaml_load is _YAML_UNSET:
+        try:
+            import yaml  # type: ignore
+        except ImportError:
+            _yaml_load = None
+        else:
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            _yaml_load = lambda block: yaml.load(block, Loader=loader)  # noqa: E731
+    return _yaml_load
+
+
+# Flat frontmatter the fast scanner accepts. Everything here reads the same
+# under PyYAML and the fallback line parser; anything else is left to them.
+_FM_PLAIN_RE = re.compile(r"(?:::)?[A-Za-z_/][\w./+@-]*(?: [\w./+@-]+)*")
+_FM_INT_RE = re.compile(r"-?(?:0|[1-9][0-9]*)")
+_FM_FLOAT_RE = re.compile(r"-?(?:0|[1-9][0-9]*)\.[0-9]+")
+_FM_QUOTED_RE = re.compile(r"""("[^"\\]*"|'[^']*')""")
+# Plain words YAML 1.1 or the fallback parser treat as booleans or null;
+# only the spellings both agree on are decoded here.
+_FM_KEYWORDS: Dict[str, Any] = {
+    "true": True,
+    "True": True,
+    "TRUE": True,
+    "false": False,
+    "False": False,
+    "FALSE": False,
+    "null": None,
+    "Null": None,
+    "NULL": None,
+}
+_FM_AMBIGUOUS = {"true", "false", "null", "none", "yes", "no", "on", "off", "y", "n"}
+_FM_UNSUPPORTED: Any = object()
+# Decoded scalars by source text; frontmatter values repeat across checkpoints.
+_FM_SCALAR_CACHE: Dict[str, Any] = {}
+_FM_SCALAR_CACHE_SIZE = 4096
+
+
+def _scan_frontmatter_scalar(token: str, in_flow: bool = False) -> Any:
+    """Decode one scalar of the flat subset, or return `_FM_UNSUPPORTED`."""
+    first = token[:1]
+    if first.isalpha() or first in "_/:":
+        if not _FM_PLAIN_RE.fullmatch(token):
+            return _FM_UNSUPPORTED
+        if token.lower() in _FM_AMBIGUOUS:
+            return _FM_KEYWORDS.get(token, _FM_UNSUPPORTED)
+        return token
+    if first == "-" or first.isdigit():
+        if _FM_INT_RE.fullmatch(token):
+            return int(token)
+        if _FM_FLOAT_RE.fullmatch(token):
+            return float(token)
+        return _FM_UNSUPPORTED
+    if first in "\"'":
+        quoted = _FM_QUOTED_RE.fullmatch(token)
+        if quoted is None or (in_flow and "," in token):
+            return _FM_UNSUPPORTED
+        return token[1:-1]
+    if first == "[" and token.endswith("]") and not in_flow:
+        inner = token[1:-1].strip()
+        items: List[Any] = []
+        if inner:
+            for part in inner.split(","):
+                item = _scan_frontmatter_scalar(part.strip(), in_flow=True)
+                if item is _FM_UNSUPPORTED or isinstance(item, list):
+                    return _FM_UNSUPPORTED
+                items.append(item)
+        return items
+    return _FM_UNSUPPORTED
+
+
+def _scan_frontmatter(block: str) -> Optional[Tuple[Dict[str, Any], List[str]]]:
+    """Parse the flat frontmatter subset without PyYAML; None if it does not fit."""
+    fm: Dict[str, Any] = {}
+    cache = _FM_SCALAR_CACHE
+    current_list: Optional[List[Any]] = None
+    for raw_line in block.splitlines():
+        line = raw_line.rstrip()
+        if not line:
+            continue
+        first = line[0]
+        if first == " ":
+            if line.startswith("  - ") and current_list is not None:
+                token = line[4:]
+            elif line.lstrip().startswith("#"):
+                continue
+            else:
+                return None
+        else:
+            if first == "#":
+                continue
+            if current_list is not None and not current_list:
+                return None  # `KEY:` with no items: YAML null, fallback [].
+            key, colon, token = line.partition(":")
+            if not colon or key in fm or not (key.isidentifier() and key.isascii()):
+                return None
+            if key.lower() in _FM_AMBIGUOUS:
+                return None
+            if not token:
+                current_list = fm[key] = []
+                continue
+            if token[0] != " ":
+                return None
+            token = token.lstrip(" ")
+            current_list = None
+        value = cache.get(token, _FM_UNSUPPORTED)
+        if value is _FM_UNSUPPORTED:
+            value = _scan_frontmatter_scalar(token)
+            if value is _FM_UNSUPPORTED:
+                return None
+            if not isinstance(value, list):
+                if len(cache) >= _FM_SCALAR_CACHE_SIZE:
+                    cache.clear()
+                cache[token] = value
+        if current_list is None:
+            fm[key] = value
+        elif isinstance(value, list):
+            return None
+        else:
+            current_list.append(value)
+    if current_list is not None and not current_list:
+        return None
+    return fm, list(fm)
+
+
 def _parse_yaml_frontmatter(text: str) -> Tuple[Dict[str, Any], List[str]]:
     """
     Parse a simple YAML frontmatter block into a dictionary.
 
-    This lightweight parser intentionally covers the narrow subset of YAML we
-    use in checkpoints (scalars and flat lists). When PyYAML is available the
-    implementation falls back to it for extra resilience.
+    The flat subset checkpoints use (scalars and flat lists) is read by
+    `_scan_frontmatter`. Other blocks go to PyYAML when it is installed, and
+    otherwise to the line parser below.
     """
 
     fm: Dict[str, Any] = {}
@@ -118,17 +448,20 @@ def _parse_yaml_frontmatter(text: str) -> Tuple[Dict[str, Any], List[str]]:
     if not block:
         return fm, order
 
-    try:  # Prefer PyYAML when installed.
-        import yaml  # type: ignore
+    scanned = _scan_frontmatter(block)
+    if scanned is not None:
+        return scanned
 
-        data = yaml.safe_load(block) or {}
-        if isinstance(data, dict):
-            fm = dict(data)
-            order = list(fm.keys())
-            return fm, order
-
-    except Exception:  # pragma: no cover - fallback for portability
-        pass
+    load = _yaml_safe_load()
+    if load is not None:
+        try:
+            data = load(block) or {}
+            if isinstance(data, dict):
+                fm = dict(data)
+                order = list(fm.keys())
+                return fm, order
+        except Exception:  # pragma: no cover - fallback for portability
+            pass
 
     current_key: Optional[str] = None
     current_list: Optional[List[Any]] = None
@@ -163,18 +496,22 @@ def _parse_yaml_frontmatter(text: str) -> Tuple[Dict[str, Any], List[str]]:
     return fm, order
 
 
+_SCALAR_INT_RE = re.compile(r"-?\d+")
+_SCALAR_FLOAT_RE = re.compile(r"-?\d+\.\d+")
+
+
 def _parse_scalar(token: str) -> Any:
     lowered = token.lower()
     if lowered in {"true", "false"}:
         return lowered == "true"
     if lowered in {"null", "none"}:
         return None
-    if re.fullmatch(r"-?\d+", token):
+    if _SCALAR_INT_RE.fullmatch(token):
         try:
             return int(token)
         except ValueError:
             pass
-    if re.fullmatch(r"-?\d+\.\d+", token):
+    if _SCALAR_FLOAT_RE.fullmatch(token):
         try:
             return float(token)
         except ValueError:
@@ -194,6 +531,11 @@ def _parse_scalar(token: str) -> Any:
     return token
 
 
+def _copy_frontmatter(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy frontmatter deep enough that editing list values leaves the copy alone."""
+    return {key: list(value) if isinstance(value, list) else value for key, value in data.items()}
+
+
 def _dump_simple_yaml(data: Dict[str, Any], order: List[str]) -> str:
     """Serialise a dict back into YAML respecting the original key order."""
     lines: List[str] = []
@@ -236,28 +578,147 @@ def _format_yaml_scalar(value: Any) -> str:
     return text
 
 
-@dataclass
-class LogEntry:
+def parse_checkpoint_text(content: str, source: Path) -> Dict[str, Any]:
+    """Parse `CHECKPOINT.md` text into a record of frontmatter and section offsets."""
+    frontmatter_block, body = _split_frontmatter(content, source)
+    fm, order = _parse_yaml_frontmatter(frontmatter_block)
+    section_order, bounds = _index_sections(body)
+    return {
+        "frontmatter": fm,
+        "frontmatter_order": order,
+        "section_order": section_order,
+        "section_bounds": bounds,
+        "body_length": len(body),
+    }
+
+
+def stat_fingerprint(stat: os.stat_result) -> Optional[Tuple[int, int]]:
+    """Return `(mtime_ns, size)` for stat-keyed caches, or `None` when racy."""
+    if time.time_ns() - stat.st_mtime_ns < RACY_WINDOW_NS:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Replace `path` with `text` via a temporary sibling and `os.replace`."""
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Replace `path` with `data` via a temporary sibling, keeping its mode."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        with contextlib.suppress(FileNotFoundError):
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _decode_text(raw: bytes, source: Path) -> str:
+    """Decode bytes the way `Path.read_text` does (UTF-8, universal newlines)."""
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        raise CheckpointFormatError(f"{source} is not valid UTF-8: {exc}") from exc
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+class CheckpointVersion(NamedTuple):
+    """What a `CHECKPOINT.md` looked like when read: stat data plus content hash."""
+
+    mtime_ns: int
+    size: int
+    sha256: str
+
+    @classmethod
+    def of(cls, raw: bytes, stat: os.stat_result) -> "CheckpointVersion":
+        import hashlib
+
+        return cls(stat.st_mtime_ns, stat.st_size, hashlib.sha256(raw).hexdigest())
+
+
+class LogEntry(NamedTuple):
     timestamp: Optional[_dt.datetime]
     raw_timestamp: Optional[str]
     message: str
 
 
-@dataclass
-class ManifestLedgerEntry:
+class ManifestLedgerEntry(NamedTuple):
     name: str
     path: str
     purpose: str
 
 
-@dataclass
+class _LazySections(MutableMapping):
+    """Section mapping that materialises each section's text on first access."""
+
+    def __init__(self, checkpoint: "Checkpoint"):
+        self._checkpoint = checkpoint
+        self._texts: Dict[str, str] = {}
+        # Sections assigned by callers; their text no longer matches the file.
+        self.edited: set[str] = set()
+
+    def __getitem__(self, name: str) -> str:
+        text = self._texts.get(name)
+        if text is None:
+            text = self._checkpoint._section_text(name)
+            self._texts[name] = text
+        return text
+
+    def __setitem__(self, name: str, value: str) -> None:
+        self._texts[name] = value
+        self.edited.add(name)
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        self._checkpoint._section_bounds().pop(name, None)
+        self._texts.pop(name, None)
+        self.edited.add(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._texts or name in self._checkpoint._section_bounds()
+
+    def __iter__(self) -> Iterator[str]:
+        bounds = self._checkpoint._section_bounds()
+        yield from bounds
+        yield from (name for name in self._texts if name not in bounds)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
 class Checkpoint:
-    path: Path
-    context: "AcftContext"
-    frontmatter: Dict[str, Any] = field(default_factory=dict)
-    frontmatter_order: List[str] = field(default_factory=list)
-    sections: Dict[str, str] = field(default_factory=dict)
-    section_order: List[str] = field(default_factory=list)
+    """A checkpoint directory and its parsed `CHECKPOINT.md`, optionally loaded lazily."""
+
+    def __init__(
+        self,
+        path: Path,
+        context: "AcftContext",
+        frontmatter: Optional[Dict[str, Any]] = None,
+        frontmatter_order: Optional[List[str]] = None,
+    ):
+        self.path = path
+        self.context = context
+        self.frontmatter: Dict[str, Any] = frontmatter if frontmatter is not None else {}
+        self.frontmatter_order: List[str] = frontmatter_order if frontmatter_order is not None else []
+        self._sections: Optional[MutableMapping[str, str]] = None
+        self._section_order: Optional[List[str]] = None
+        self._bounds: Optional[SectionBounds] = None
+        self._content: Optional[str] = None
+        self._version: Optional[CheckpointVersion] = None
+        # Frontmatter as last read from or written to disk, for conflict checks.
+        self._base_frontmatter: Optional[Dict[str, Any]] = None
+        self._body: Optional[str] = None
+        self._body_length: Optional[int] = None
+        self._tokens: Optional[List[MarkdownToken]] = None
+        self._section_tokens: Dict[str, Tuple[Optional[str], List[MarkdownToken]]] = {}
+
+    def __repr__(self) -> str:
+        return f"Checkpoint(path={self.path!r}, frontmatter={self.frontmatter!r})"
 
     @property
     def name(self) -> str:
@@ -267,127 +728,170 @@ class Checkpoint:
     def checkpoint_md(self) -> Path:
         return self.path / "CHECKPOINT.md"
 
-    def load(self) -> None:
+    @property
+    def sections(self) -> MutableMapping[str, str]:
+        if self._sections is None:
+            self._sections = _LazySections(self)
+        return self._sections
+
+    @sections.setter
+    def sections(self, value: MutableMapping[str, str]) -> None:
+        self._sections = value
+
+    @property
+    def section_order(self) -> List[str]:
+        if self._section_order is None:
+            self._section_bounds()
+        return self._section_order  # type: ignore[return-value]
+
+    @section_order.setter
+    def section_order(self, value: List[str]) -> None:
+        self._section_order = value
+
+    def load(self, lazy: bool = False) -> None:
         if not self.checkpoint_md.exists():
             raise CheckpointFormatError(
                 f"{self.checkpoint_md} does not exist for checkpoint {self.path}"
             )
-        content = _strip_bom(self.checkpoint_md.read_text(encoding="utf-8"))
-        if not content.startswith("---"):
-            raise CheckpointFormatError(
-                f"{self.checkpoint_md} missing YAML frontmatter delimiter"
-            )
-        parts = content.split("\n", 2)
-        frontmatter_end = content.find("\n---", 3)
-        if frontmatter_end == -1:
-            raise CheckpointFormatError(
-                f"{self.checkpoint_md} missing closing YAML delimiter"
-            )
-        frontmatter_block = content[3:frontmatter_end]
-        remaining = content[frontmatter_end + 4 :].lstrip("\n")
-
-        fm, order = _parse_yaml_frontmatter(frontmatter_block)
-        self.frontmatter = fm
-        self.frontmatter_order = order
+        self._reset_body()
+        if lazy:
+            block = _read_frontmatter_block(self.checkpoint_md)
+            self.frontmatter, self.frontmatter_order = _parse_yaml_frontmatter(block)
+            self._version = None
+            self._base_frontmatter = _copy_frontmatter(self.frontmatter)
+            return
+        content = self.read_text()
+        self.apply_record(parse_checkpoint_text(content, self.checkpoint_md), content=content)
+        for name in self.section_order:
+            self.sections.get(name)  # Materialise every section now.
+
+    def apply_record(self, record: Dict[str, Any], content: Optional[str] = None) -> None:
+        """Populate parsed state from a record built by `parse_checkpoint_text`."""
+        self._reset_body()
+        if content is None:
+            self._version = None
+        self.frontmatter = dict(record["frontmatter"])
+        self.frontmatter_order = list(record["frontmatter_order"])
+        self._base_frontmatter = _copy_frontmatter(self.frontmatter)
+        self._section_order = list(record["section_order"])
+        self._bounds = {name: tuple(span) for name, span in record["section_bounds"].items()}
+        self._body_length = record["body_length"]
+        self._content = content
+
+    def read_text(self) -> str:
+        """Return the raw `CHECKPOINT.md` text, reading the file at most once."""
+        if self._content is None:
+            with self.checkpoint_md.open("rb") as fh:
+                raw = fh.read()
+                self._version = CheckpointVersion.of(raw, os.fstat(fh.fileno()))
+            self._content = _decode_text(raw, self.checkpoint_md)
+        return self._content
 
-        sections, section_order = _detect_sections(remaining)
-        self.sections = sections
-        self.section_order = section_order
+    @property
+    def version(self) -> Optional[CheckpointVersion]:
+        """Version of the file `read_text` returned, if this object read it."""
+        return self._version
+
+    def _reset_body(self) -> None:
+        self._sections = None
+        self._section_order = None
+        self._bounds = None
+        self._content = None
+        self._body = None
+        self._body_length = None
+        self._tokens = None
+        self._section_tokens = {}
+
+    def _load_body(self) -> str:
+        if self._body is None:
+            body = _split_frontmatter(self.read_text(), self.checkpoint_md)[1]
+            if self._body_length is not None and len(body) != self._body_length:
+                # The file changed since the offsets were recorded.
+                self._bounds = None
+                self._section_order = None
+            self._body = body
+        return self._body
+
+    def _section_bounds(self) -> SectionBounds:
+        if self._bounds is None:
+            order, bounds = _index_sections(self._load_body(), self.tokens())
+            self._bounds = bounds
+            if self._section_order is None:
+                self._section_order = order
+        return self._bounds
+
+    def tokens(self) -> List[MarkdownToken]:
+        """The body's `iter_markdown_tokens` stream, lexed once per load."""
+        if self._tokens is None:
+            self._tokens = list(iter_markdown_tokens(self._load_body()))
+        return self._tokens
+
+    def section_tokens(self, name: str) -> List[MarkdownToken]:
+        """Tokens of section `name`, matching what lexing `sections[name]` gives."""
+        sections = self.sections
+        if isinstance(sections, _LazySections) and name not in sections.edited:
+            cached = self._section_tokens.get(name)
+            if cached is None:
+                span = self._section_bounds().get(name, (0, 0, 0))
+                # Lines before the first heading were lexed before its name
+                # was known, so a section absorbing them is lexed on its own.
+                if not span[2]:
+                    start, end = span[0], span[1]
+                    selected = [token for token in self.tokens() if start <= token.start < end]
+                    cached = self._section_tokens[name] = (None, selected)
+            if cached is not None:
+                return cached[1]
+        text = sections.get(name, "")
+        cached = self._section_tokens.get(name)
+        if cached is None or cached[0] != text:
+            cached = self._section_tokens[name] = (text, list(iter_markdown_tokens(text, section=name)))
+        return cached[1]
+
+    def _section_text(self, name: str) -> str:
+        body = self._load_body()
+        bounds = self._section_bounds()
+        if name not in bounds:
+            raise KeyError(name)
+        return _section_text(body, bounds[name])
 
     def write_frontmatter(self) -> None:
-        if not self.checkpoint_md.exists():
-            raise CheckpointFormatError("Cannot write frontmatter: CHECKPOINT.md missing")
-        original = self.checkpoint_md.read_text(encoding="utf-8")
-        if not original.startswith("---"):
-            raise CheckpointFormatError(
-                "Cannot write frontmatter: missing YAML delimiter"
-            )
-        closing = original.find("\n---", 3)
-        if closing == -1:
-            raise CheckpointFormatError(
-                "Cannot write frontmatter: missing closing YAML delimiter"
-            )
-        payload = original[closing + 4 :]
-        rendered = _dump_simple_yaml(self.frontmatter, self.frontmatter_order)
-        new_content = f"---\n{rendered}\n---\n{payload.lstrip()}"
-        self.checkpoint_md.write_text(new_content, encoding="utf-8")
+        CheckpointPatch(self, frontmatter=True).apply()
 
     def append_log_entry(self, message: str, timestamp: Optional[str] = None) -> None:
-        ts = timestamp or utcnow_iso()
-        section = self.sections.get("LOG", "")
-        entry = f"- {ts} - {message}".rstrip()
-        if section:
-            section = section.rstrip() + "\n" + entry + "\n"
-        else:
-            section = entry + "\n"
-        self.sections["LOG"] = section.strip() + "\n"
-        self._rewrite_section("LOG")
-
-    def _rewrite_section(self, name: str) -> None:
-        if name not in self.section_order:
-            self.section_order.append(name)
-        # Reconstruct the markdown file from sections, preserving order.
-        parts = ["---", _dump_simple_yaml(self.frontmatter, self.frontmatter_order), "---", ""]
-        for section_name in self.section_order:
-            body = self.sections.get(section_name, "").rstrip()
-            parts.append(f"# {section_name}")
-            if body:
-                parts.append(body)
-            parts.append("")  # Blank line between sections.
-        payload = "\n".join(parts).rstrip() + "\n"
-        self.checkpoint_md.write_text(payload, encoding="utf-8")
+        patch = CheckpointPatch(self)
+        patch.append_log(message, timestamp)
+        patch.apply()
 
     def manifest_ledger(self) -> List[ManifestLedgerEntry]:
-        manifest = self.sections.get("MANIFEST", "")
-        if not manifest:
-            return []
         entries: List[ManifestLedgerEntry] = []
-        lines = manifest.splitlines()
         inside = False
-        for line in lines:
-            if line.strip().upper().startswith("## MANIFEST LEDGER"):
-                inside = True
-                continue
-            if inside and line.startswith("## "):
-                break
-            if inside:
-                line_stripped = line.strip()
-                if not line_stripped or line_stripped.startswith(">"):
-                    continue
-                if line_stripped.startswith("- "):
-                    line_stripped = line_stripped[2:].strip()
-                parts = [part.strip() for part in line_stripped.split("->")]
-                # Example format: Deliverable -> ::THIS/ARTIFACTS/foo -> Intent
-                if len(parts) >= 2:
-                    name = parts[0]
-                    path_part = parts[1]
-                    purpose = " -> ".join(parts[2:]) if len(parts) > 2 else ""
-                    entries.append(ManifestLedgerEntry(name=name, path=path_part, purpose=purpose))
+        for token in self.section_tokens("MANIFEST"):
+            if token.kind == TOKEN_LEDGER_ROW:
+                entries.append(ManifestLedgerEntry(*token.fields))
+            elif token.kind == TOKEN_HEADING and token.level == 2:
+                if token.text.upper().startswith("MANIFEST LEDGER"):
+                    inside = True
+                elif inside:
+                    break  # Only the first ledger counts.
         return entries
 
     def log_entries(self) -> List[LogEntry]:
-        section = self.sections.get("LOG", "")
-        if not section.strip():
-            return []
+        """LOG entries in `CHECKPOINT.md`, then any still pending in its `LogSidecar`."""
         entries: List[LogEntry] = []
-        for line in section.splitlines():
-            line = line.strip()
-            if not line or not line.startswith("-"):
-                continue
-            match = re.match(r"^- ([^ ]+) - (.*)$", line)
-            if not match:
+        for token in self.section_tokens("LOG"):
+            if token.kind != TOKEN_LOG_ROW:
                 continue
-            raw_timestamp = match.group(1)
-            message = match.group(2).strip()
+            raw_timestamp, message = token.fields
             ts: Optional[_dt.datetime] = None
             if ISO_TIMESTAMP_RE.match(raw_timestamp):
                 try:
-                    ts = _dt.datetime.fromisoformat(
-                        raw_timestamp.replace("Z", "+00:00")
-                    )
+                    ts = parse_iso_timestamp(raw_timestamp)
                 except ValueError:
                     ts = None
             entries.append(LogEntry(timestamp=ts, raw_timestamp=raw_timestamp, message=message))
+        sidecar = LogSidecar(self.path)
+        if sidecar.path.exists():
+            entries.extend(sidecar.entries())
         return entries
 
     def first_status_sentence(self) -> str:
@@ -398,30 +902,578 @@ class Checkpoint:
         return sentence
 
 
+def _log_line(timestamp: str, message: str) -> str:
+    return f"- {timestamp} - {message}".rstrip()
+
+
+class CheckpointPatch:
+    """Minimal frontmatter and LOG edits to a checkpoint's `CHECKPOINT.md`."""
+
+    MAX_ATTEMPTS = 20
+
+    def __init__(self, checkpoint: Checkpoint, frontmatter: bool = False):
+        self.checkpoint = checkpoint
+        self.frontmatter = frontmatter
+        # `(raw_timestamp, message)` pairs, oldest first.
+        self.log_items: List[Tuple[str, str]] = []
+        # Entries moved in from the sidecar by the last `apply`.
+        self.flushed: List[Tuple[str, str]] = []
+
+    def append_log(self, message: str, timestamp: Optional[str] = None) -> None:
+        self.log_items.append((timestamp or utcnow_iso(), message))
+
+    def apply(self) -> None:
+        sidecar = LogSidecar(self.checkpoint.path)
+        if self.log_items and not self.frontmatter and log_sidecar_from_env():
+            sidecar.append(self.log_items)
+            return
+        if not sidecar.path.exists():
+            self._apply_file()
+            return
+        with sidecar.drain() as pending:
+            self.flushed = pending
+            self._apply_file()
+
+    def _apply_file(self) -> None:
+        checkpoint_md = self.checkpoint.checkpoint_md
+        for _ in range(self.MAX_ATTEMPTS):
+            try:
+                with checkpoint_md.open("rb") as fh:
+                    raw = fh.read()
+                    version = CheckpointVersion.of(raw, os.fstat(fh.fileno()))
+            except FileNotFoundError:
+                raise CheckpointFormatError(f"Cannot update {checkpoint_md}: file missing") from None
+            text = raw.decode("utf-8")
+            edits = self._edits(text, version)
+            if not edits:
+                return
+            try:
+                committed = self._commit(text, edits, version)
+            except FileNotFoundError:
+                raise CheckpointConflictError(f"Cannot update {checkpoint_md}: it was removed during the update") from None
+            if committed:
+                self.checkpoint._reset_body()  # Sections are re-read from disk on next access.
+                self.checkpoint._version = None
+                self.checkpoint._base_frontmatter = _copy_frontmatter(self.checkpoint.frontmatter)
+                return
+        raise CheckpointConflictError(
+            f"Cannot update {checkpoint_md}: it kept changing during {self.MAX_ATTEMPTS} attempts"
+        )
+
+    def _edits(self, text: str, version: CheckpointVersion) -> List[Tuple[int, int, str]]:
+        """Non-overlapping `(start, end, replacement)` edits against `text`, read at `version`."""
+        start = 1 if text.startswith("\ufeff") else 0
+        if not text.startswith("---", start):
+            raise CheckpointFormatError(f"Cannot update {self.checkpoint.checkpoint_md}: missing YAML delimiter")
+        closing = text.find("\n---", start + 3)
+        if closing == -1:
+            raise CheckpointFormatError(
+                f"Cannot update {self.checkpoint.checkpoint_md}: missing closing YAML delimiter"
+            )
+        body_start = closing + 4
+        newline = "\r\n" if "\r\n" in text else "\n"
+        edits: List[Tuple[int, int, str]] = []
+        if self.frontmatter:
+            current, _ = _parse_yaml_frontmatter(text[start + 3 : closing])
+            base = self.checkpoint._base_frontmatter
+            if (
+                version != self.checkpoint.version
+                and base is not None
+                and current not in (base, self.checkpoint.frontmatter)
+            ):
+                raise CheckpointConflictError(
+                    f"{self.checkpoint.checkpoint_md} frontmatter changed on disk since it was read; "
+                    "re-run the command to apply the update to the new version"
+                )
+            if current != self.checkpoint.frontmatter:
+                rendered = _dump_simple_yaml(self.checkpoint.frontmatter, self.checkpoint.frontmatter_order)
+                block = newline.join(["---", *rendered.split("\n"), "---"])
+                edits.append((start, body_start, block))
+        if self.flushed or self.log_items:
+            span = _index_sections(text[body_start:])[1].get("LOG")
+            flushed = [_log_line(*item) for item in self.flushed]
+            if flushed and span is not None:
+                # A drain interrupted after writing CHECKPOINT.md leaves its
+                # entries in the sidecar too; write each one only once.
+                existing = set(text[body_start + span[0] : body_start + span[1]].splitlines())
+                flushed = [line for line in flushed if line not in existing]
+            lines = flushed + [_log_line(*item) for item in self.log_items]
+            if not lines:
+                return edits
+            entries = newline.join(lines)
+            if span is None:
+                trailing = text[len(text.rstrip()) :].count("\n")
+                separator = newline * max(0, 2 - trailing) if text.strip() else ""
+                edits.append((len(text), len(text), f"{separator}# LOG{newline}{entries}{newline}"))
+            else:
+                section_start, section_end = body_start + span[0], body_start + span[1]
+                kept = text[section_start:section_end].rstrip()
+                if kept:
+                    position, insertion = section_start + len(kept), newline + entries
+                elif text[section_start - 1 : section_start] == "\n":
+                    position, insertion = section_start, entries + newline
+                else:  # `# LOG` is the last line and has no newline.
+                    position, insertion = section_start, newline + entries + newline
+                edits.append((position, position, insertion))
+        return edits
+
+    def _commit(self, text: str, edits: List[Tuple[int, int, str]], version: CheckpointVersion) -> bool:
+        """Write `edits` if the file is still at `version`; False if it moved on."""
+        from _eventlog import locked_append
+
+        checkpoint_md = self.checkpoint.checkpoint_md
+        if len(edits) == 1 and edits[0][0] == edits[0][1]:
+            # Inserting before nothing but whitespace the insertion itself
+            # starts with is the same as appending at the end of the file.
+            position, _, insertion = edits[0]
+            tail = text[position:]
+            if insertion.startswith(tail):
+                with locked_append(checkpoint_md, create=False) as fd:
+                    if not self._unchanged(fd, version):
+                        return False
+                    os.write(fd, (insertion[len(tail) :] + tail).encode("utf-8"))
+                    os.fsync(fd)
+                return True
+
+        for start, end, replacement in sorted(edits, reverse=True):
+            text = text[:start] + replacement + text[end:]
+        tmp_path = checkpoint_md.with_name(f".{checkpoint_md.name}.{os.getpid()}.tmp")
+        try:
+            with tmp_path.open("wb") as fh:
+                fh.write(text.encode("utf-8"))
+                fh.flush()
+                os.fchmod(fh.fileno(), os.stat(checkpoint_md).st_mode & 0o7777)
+                os.fsync(fh.fileno())
+            with locked_append(checkpoint_md, create=False) as fd:
+                if not self._unchanged(fd, version):
+                    return False
+                os.replace(tmp_path, checkpoint_md)
+            _fsync_directory(checkpoint_md.parent)
+            return True
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def _unchanged(self, fd: int, version: CheckpointVersion) -> bool:
+        """Whether the locked file behind `fd` still has `version`."""
+        stat = os.fstat(fd)
+        if (stat.st_mtime_ns, stat.st_size) != (version.mtime_ns, version.size):
+            return False
+        if stat_fingerprint(stat) is not None:
+            return True
+        # Written within the racy window: the same mtime and size may hide
+        # an edit, so compare the content.
+        return CheckpointVersion.of(self.checkpoint.checkpoint_md.read_bytes(), stat) == version
+
+
+def _fsync_directory(path: Path) -> None:
+    """Persist a rename inside `path`; not every platform or filesystem allows it."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+LOG_SIDECAR_FILENAME = ".CHECKPOINT.log.jsonl"
+
+
+def log_sidecar_from_env() -> bool:
+    """`ACFT_LOG_SIDECAR=1` sends LOG-only updates to the checkpoint's JSONL sidecar."""
+    return os.environ.get("ACFT_LOG_SIDECAR", "").strip().lower() in ("1", "true", "yes")
+
+
+class LogSidecar:
+    """Append-only JSONL of LOG entries not yet written into `CHECKPOINT.md`."""
+
+    def __init__(self, checkpoint_dir: Path):
+        self.path = checkpoint_dir / LOG_SIDECAR_FILENAME
+
+    def append(self, items: Sequence[Tuple[str, str]]) -> None:
+        records = []
+        for raw_timestamp, message in items:
+            epoch_us: Optional[int] = None
+            if ISO_TIMESTAMP_RE.match(raw_timestamp):
+                try:
+                    moment = parse_iso_timestamp(raw_timestamp)
+                except ValueError:
+                    pass
+                else:
+                    if moment.tzinfo is not None:
+                        epoch_us = round(moment.timestamp() * 1_000_000)
+            record = {"TIMESTAMP": raw_timestamp, "EPOCH_US": epoch_us, "MESSAGE": message}
+            records.append(json.dumps(record, ensure_ascii=False) + "\n")
+        from _eventlog import locked_append
+
+        with locked_append(self.path) as fd:
+            os.write(fd, "".join(records).encode("utf-8"))
+
+    def entries(self) -> List[LogEntry]:
+        """Pending entries, oldest first; a torn or corrupt line is skipped."""
+        try:
+            raw = self.path.read_bytes()
+        except FileNotFoundError:
+            return []
+        epoch = _dt.datetime(1970, 1, 1, tzinfo=_dt.timezone.utc)
+        entries: List[LogEntry] = []
+        for record in self._records(raw):
+            raw_timestamp = record["TIMESTAMP"]
+            epoch_us = record.get("EPOCH_US")
+            timestamp: Optional[_dt.datetime] = None
+            if isinstance(epoch_us, int):
+                timestamp = epoch + _dt.timedelta(microseconds=epoch_us)
+            elif ISO_TIMESTAMP_RE.match(raw_timestamp):
+                try:  # Naive timestamps are not stored pre-parsed.
+                    timestamp = parse_iso_timestamp(raw_timestamp)
+                except ValueError:
+                    pass
+            entries.append(LogEntry(timestamp, raw_timestamp, record["MESSAGE"].strip()))
+        return entries
+
+    @contextlib.contextmanager
+    def drain(self) -> Iterator[List[Tuple[str, str]]]:
+        """
+        Yield pending `(raw_timestamp, message)` pairs and remove the sidecar
+        if the block completes. Appends wait until then.
+        """
+        from _eventlog import locked_append
+
+        with contextlib.ExitStack() as stack:
+            try:
+                stack.enter_context(locked_append(self.path, create=False))
+            except FileNotFoundError:
+                yield []
+                return
+            with open(self.path, "rb") as fh:
+                raw = fh.read()
+            yield [(record["TIMESTAMP"], record["MESSAGE"]) for record in self._records(raw)]
+            # Appenders blocked on our lock notice the unlink and recreate it.
+            os.unlink(self.path)
+
+    @staticmethod
+    def _records(raw: bytes) -> Iterator[Dict[str, Any]]:
+        for line in raw.split(b"\n")[:-1]:  # A last line without "\n" is still being written.
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and isinstance(record.get("TIMESTAMP"), str) and isinstance(
+                record.get("MESSAGE"), str
+            ):
+                yield record
+
+
+class CheckpointIndex:
+    """SQLite parse cache under `::WORK/.acft/`, keyed by checkpoint path and stat."""
+
+    FILENAME = "checkpoints_index.sqlite"
+    SCHEMA_VERSION = 2
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._conn: Optional[Any] = None
+        self._rows: Dict[str, Tuple[int, int, str, str]] = {}
+        self._pending: Dict[str, Tuple[int, int, str, str]] = {}
+        self._seen: set[str] = set()
+
+    @classmethod
+    def open(cls, context: "AcftContext") -> Optional["CheckpointIndex"]:
+        if os.environ.get("ACFT_NO_INDEX") or context.cache_dir is None:
+            return None
+        import sqlite3
+
+        index = cls(context.cache_dir / cls.FILENAME)
+        try:
+            index._connect()
+        except (OSError, sqlite3.Error):
+            index.close()
+            return None
+        return index
+
+    def _connect(self) -> None:
+        import sqlite3
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # `acft daemon` keeps the index open and uses it from a thread per
+        # command; commands are serialised, so sharing the connection is safe.
+        conn = sqlite3.connect(str(self.db_path), timeout=5.0, check_same_thread=False)
+        self._conn = conn
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS checkpoints")
+            conn.execute(
+                "CREATE TABLE checkpoints ("
+                "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, "
+                "sha256 TEXT, record TEXT)"
+            )
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            conn.commit()
+        for path, mtime_ns, size, digest, record in conn.execute(
+            "SELECT path, mtime_ns, size, sha256, record FROM checkpoints"
+        ):
+            self._rows[path] = (mtime_ns, size, digest, record)
+
+    def lookup(self, key: str, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+        """Return the stored record when `stat` still matches, otherwise `None`."""
+        self._seen.add(key)
+        row = self._rows.get(key)
+        if row is not None and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+            return json.loads(row[3])
+        return None
+
+    def store(self, key: str, stat: os.stat_result, digest: str, record: Dict[str, Any]) -> None:
+        self._seen.add(key)
+        try:
+            encoded = json.dumps(record)
+        except (TypeError, ValueError):
+            # Exotic YAML values (dates, ...) are simply not cached.
+            return
+        fingerprint = stat_fingerprint(stat)
+        mtime_ns = fingerprint[0] if fingerprint else -1
+        self._pending[key] = (mtime_ns, stat.st_size, digest, encoded)
+
+    def load(self, key: str, checkpoint_md: Path) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Return the parsed record (and text, if read) for `checkpoint_md`."""
+        stat = checkpoint_md.stat()
+        record = self.lookup(key, stat)
+        if record is not None:
+            return record, None
+
+        import hashlib
+
+        raw = checkpoint_md.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        content = _decode_text(raw, checkpoint_md)
+        row = self._rows.get(key)
+        if row is not None and row[2] == digest:
+            record = json.loads(row[3])
+        else:
+            record = parse_checkpoint_text(content, checkpoint_md)
+        self.store(key, stat, digest, record)
+        return record, content
+
+    def flush(self) -> None:
+        """Persist changed rows and drop rows for checkpoints that disappeared."""
+        if self._conn is None:
+            return
+        import sqlite3
+
+        stale = [key for key in self._rows if key not in self._seen]
+        self._seen.clear()  # Long-lived indexes (acft daemon) start each scan afresh.
+        if not self._pending and not stale:
+            return
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?)",
+                    [(key, *row) for key, row in self._pending.items()],
+                )
+                self._conn.executemany(
+                    "DELETE FROM checkpoints WHERE path = ?", [(key,) for key in stale]
+                )
+        except sqlite3.Error:
+            pass
+        self._rows.update(self._pending)
+        for key in stale:
+            self._rows.pop(key, None)
+        self._pending.clear()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class Expansion(NamedTuple):
+    """One result of `AcftContext.expand_many`."""
+
+    raw: str
+    path: Optional[Path]
+    exists: Optional[bool]  # None unless existence was checked
+    error: Optional[PathResolutionError]
+
+
+class PathProbe:
+    """Answer `exists()`/`realpath()` for many paths with few syscalls."""
+
+    LISTING_THRESHOLD = 8
+
+    def __init__(self) -> None:
+        self._lookups: Dict[str, int] = {}
+        self._listings: Dict[str, frozenset[str]] = {}
+        self._real_dirs: Dict[str, str] = {}
+
+    def exists(self, path: str) -> bool:
+        parent, name = os.path.split(path)
+        names = self._listings.get(parent)
+        if names is None:
+            count = self._lookups.get(parent, 0) + 1
+            self._lookups[parent] = count
+            if count >= self.LISTING_THRESHOLD:
+                names = self._listings[parent] = self._list(parent)
+        if names is not None and name in names:
+            return True
+        return os.path.exists(path)
+
+    @staticmethod
+    def _list(directory: str) -> frozenset[str]:
+        """Names of entries in `directory` that are not symlinks."""
+        try:
+            with os.scandir(directory) as entries:
+                return frozenset(entry.name for entry in entries if not entry.is_symlink())
+        except OSError:
+            return frozenset()
+
+    def realpath(self, path: str) -> str:
+        """`os.path.realpath(path)`, reusing resolved parent directories."""
+        parent, name = os.path.split(path)
+        if name in ("", ".", ".."):
+            return os.path.realpath(path)
+        real_parent = self._real_dirs.get(parent)
+        if real_parent is None:
+            real_parent = self._real_dirs[parent] = os.path.realpath(parent)
+        joined = os.path.join(real_parent, name)
+        return os.path.realpath(joined) if os.path.islink(joined) else joined
+
+
+class RootCache:
+    """Per-user cache of `AcftContext.discover` results keyed by start directory."""
+
+    VERSION = 1
+    MAX_ENTRIES = 256
+    # Marker of each stored root, in `DiscoveredRoots` order.
+    MARKERS = ("checkpoints_project.toml", "checkpoints_work.toml", "CHECKPOINT.md")
+    # Kept per process so `acft daemon` reads the file once.
+    _instance: Optional["RootCache"] = None
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._entries: Optional[Dict[str, Any]] = None
+
+    @staticmethod
+    def path_from_env() -> Optional[Path]:
+        if os.environ.get("ACFT_NO_ROOTS_CACHE"):
+            return None
+        override = os.environ.get("ACFT_ROOTS_CACHE")
+        if override:
+            return Path(override).expanduser()
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return Path(base) / "acft" / "roots.json"
+
+    @classmethod
+    def open(cls) -> Optional["RootCache"]:
+        path = cls.path_from_env()
+        if path is None:
+            return None
+        if cls._instance is None or cls._instance.path != path:
+            cls._instance = cls(path)
+        return cls._instance
+
+    def _read(self, prune: bool = False) -> Dict[str, Any]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return {}
+        entries = data.get("entries")
+        if not isinstance(entries, dict):
+            return {}
+        if prune:
+            entries = {start: entry for start, entry in entries.items() if self._live(start, entry)}
+        return entries
+
+    @classmethod
+    def _live(cls, start: str, entry: Any) -> bool:
+        try:
+            roots = entry["roots"]
+            return os.path.isdir(start) and all(
+                root is None or os.path.exists(os.path.join(root, marker))
+                for root, marker in zip(roots, cls.MARKERS)
+            )
+        except (KeyError, TypeError, ValueError):
+            return False
+
+    def lookup(self, start: Path) -> Optional[DiscoveredRoots]:
+        """Return the cached roots for `start` while no visited directory changed."""
+        if self._entries is None:
+            self._entries = self._read()
+        entry = self._entries.get(str(start))
+        if entry is None:
+            return None
+        try:
+            current = start
+            for mtime_ns in entry["mtimes"]:
+                if os.stat(current).st_mtime_ns != mtime_ns:
+                    return None
+                current = current.parent
+            project_root, work_root, checkpoint_root = (
+                Path(root) if root is not None else None for root in entry["roots"]
+            )
+        except (OSError, KeyError, TypeError, ValueError):
+            return None
+        return project_root, work_root, checkpoint_root
+
+    def store(self, start: Path, roots: DiscoveredRoots, walked: List[Path]) -> None:
+        mtimes: List[int] = []
+        for directory in walked:
+            try:
+                fingerprint = stat_fingerprint(os.stat(directory))
+            except OSError:
+                return
+            if fingerprint is None:
+                return
+            mtimes.append(fingerprint[0])
+        entries = self._read(prune=True)  # Merge with entries other processes added.
+        entries.pop(str(start), None)
+        entries[str(start)] = {
+            "roots": [str(root) if root is not None else None for root in roots],
+            "mtimes": mtimes,
+        }
+        while len(entries) > self.MAX_ENTRIES:
+            entries.pop(next(iter(entries)))
+        self._entries = entries
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self.path, json.dumps({"version": self.VERSION, "entries": entries}))
+        except OSError:
+            pass
+
+
 class AcftContext:
     """Resolve project/work roots and rooted path helpers."""
 
+    # Set by long-running processes so scans reuse state across commands.
+    warm: Optional["WarmState"] = None
+    # Paths remembered by `to_rooted`, per context.
+    ROOTED_CACHE_SIZE = 4096
+
     def __init__(self, project_root: Optional[Path], work_root: Optional[Path], checkpoint_root: Optional[Path], acft_root: Path):
         self.project_root = project_root
         self.work_root = work_root
         self.checkpoint_root = checkpoint_root
         self.acft_root = acft_root
+        self._rooted_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._rooted_anchors: Optional[List[Tuple[str, str]]] = None
+        self._probe = PathProbe()
 
     @classmethod
     def discover(cls, start: Optional[Path] = None) -> "AcftContext":
         start = start or cls._symlink_aware_cwd()
         script_dir = Path(__file__).resolve().parent
         acft_root = script_dir.parent
-        project_root = cls._search_upwards(
-            start,
-            markers=["checkpoints_project.toml"],
-        )
-        work_root = cls._search_upwards(
-            start,
-            markers=["checkpoints_work.toml"],
-            stop=project_root,
-        )
-        checkpoint_root = cls._find_checkpoint_root(start, stop_at=work_root)
+        cache = RootCache.open()
+        roots = cache.lookup(start) if cache is not None else None
+        if roots is None:
+            roots, walked = cls._search_roots(start)
+            if cache is not None:
+                cache.store(start, roots, walked)
+        project_root, work_root, checkpoint_root = roots
         return cls(project_root=project_root, work_root=work_root, checkpoint_root=checkpoint_root, acft_root=acft_root)
 
     @staticmethod
@@ -431,91 +1483,116 @@ class AcftContext:
         env_pwd = os.environ.get("PWD")
         if env_pwd:
             try:
-                pwd_path = Path(env_pwd)
-                if pwd_path.exists() and pwd_path.resolve() == cwd:
-                    return pwd_path
-            except (OSError, RuntimeError):
+                # Comparing stat results avoids resolving every component.
+                if os.path.samestat(os.stat(env_pwd), os.stat(cwd)):
+                    return Path(env_pwd)
+            except (OSError, ValueError):
                 pass
         return cwd
 
     @staticmethod
-    def _search_upwards(
-        start: Path, markers: Iterable[str], fallback: Optional[Path] = None, stop: Optional[Path] = None
-    ) -> Optional[Path]:
-        current = start
-        stop_resolved = stop.resolve() if stop else None
-        markers = list(markers)
-        while True:
-            for marker in markers:
-                if (current / marker).exists():
-                    return current
-            if stop_resolved and current.resolve() == stop_resolved:
-                break
-            if current == current.parent:
-                break
-            current = current.parent
-        return fallback
-
-    @staticmethod
-    def _find_checkpoint_root(start: Path, stop_at: Optional[Path] = None) -> Optional[Path]:
+    def _search_roots(start: Path) -> Tuple[DiscoveredRoots, List[Path]]:
+        """Find the project, work and checkpoint roots in one upward pass."""
+        project_root: Optional[Path] = None
+        work_root: Optional[Path] = None
+        checkpoint_root: Optional[Path] = None
+        want_project = want_work = want_checkpoint = True
+        walked: List[Path] = []
         current = start
-        stop_real = stop_at.resolve() if stop_at else None
         while True:
-            if (current / "CHECKPOINT.md").exists():
-                return current
-            try:
-                current_real = current.resolve()
-            except FileNotFoundError:
-                current_real = None
-            if stop_real and current_real == stop_real:
-                break
-            if current == current.parent:
+            walked.append(current)
+            if want_checkpoint and (current / "CHECKPOINT.md").exists():
+                checkpoint_root, want_checkpoint = current, False
+            if want_work and (current / "checkpoints_work.toml").exists():
+                work_root, want_work, want_checkpoint = current, False, False
+            if want_project and (current / "checkpoints_project.toml").exists():
+                project_root, want_project, want_work = current, False, False
+            if not (want_project or want_work or want_checkpoint) or current == current.parent:
                 break
             current = current.parent
-        return None
+        return (project_root, work_root, checkpoint_root), walked
 
     # ------------------------------------------------------------------ Path utils
-    def expand(self, raw: str, *, resolve_symlinks: bool = False) -> Path:
-        def _normalized(path: Path) -> Path:
-            # `normpath` collapses "." and ".." without following symlinks.
-            return Path(os.path.normpath(str(path)))
-
-        if raw.startswith("::PROJECT"):
-            if not self.project_root:
-                raise PathResolutionError("Cannot expand ::PROJECT: no checkpoints_project.toml found in ancestor directories")
-            tail = raw[len("::PROJECT") :].lstrip("/")
-            candidate = self.project_root / tail
-            return candidate.resolve() if resolve_symlinks else _normalized(candidate)
-        if raw.startswith("::WORK"):
-            if not self.work_root:
-                raise PathResolutionError("Cannot expand ::WORK: no checkpoints_work.toml found in ancestor directories")
-            tail = raw[len("::WORK") :].lstrip("/")
-            candidate = self.work_root / tail
-            return candidate.resolve() if resolve_symlinks else _normalized(candidate)
-        if raw.startswith("::THIS"):
-            if not self.checkpoint_root:
-                raise PathResolutionError("Cannot expand ::THIS: no CHECKPOINT.md found in current or ancestor directories")
-            tail = raw[len("::THIS") :].lstrip("/")
-            candidate = self.checkpoint_root / tail
-            return candidate.resolve() if resolve_symlinks else _normalized(candidate)
+    # Rooted prefix -> (root attribute, error raised when that root is unknown).
+    ROOTED_PREFIXES = (
+        ("::PROJECT", "project_root", "Cannot expand ::PROJECT: no checkpoints_project.toml found in ancestor directories"),
+        ("::WORK", "work_root", "Cannot expand ::WORK: no checkpoints_work.toml found in ancestor directories"),
+        ("::THIS", "checkpoint_root", "Cannot expand ::THIS: no CHECKPOINT.md found in current or ancestor directories"),
+    )
+
+    def _join_rooted(self, raw: str, cwd: Optional[Path] = None) -> Path:
+        """Join `raw` onto its root (or the cwd) without normalising it."""
         if raw.startswith("::"):
+            for prefix, attribute, missing in self.ROOTED_PREFIXES:
+                if raw.startswith(prefix):
+                    root = getattr(self, attribute)
+                    if not root:
+                        raise PathResolutionError(missing)
+                    return root / raw[len(prefix) :].lstrip("/")
             raise PathResolutionError(f"Unknown rooted prefix in path: {raw}")
         candidate = Path(raw).expanduser()
         if not candidate.is_absolute():
-            candidate = Path.cwd() / candidate
-        return candidate.resolve() if resolve_symlinks else _normalized(candidate)
+            candidate = (cwd or Path.cwd()) / candidate
+        return candidate
+
+    def expand(self, raw: str, *, resolve_symlinks: bool = False) -> Path:
+        candidate = self._join_rooted(raw)
+        # `normpath` collapses "." and ".." without following symlinks.
+        return candidate.resolve() if resolve_symlinks else Path(os.path.normpath(str(candidate)))
+
+    def expand_many(
+        self, raws: Iterable[str], *, resolve_symlinks: bool = False, check_exists: bool = False
+    ) -> Iterator[Expansion]:
+        """Expand `raws` lazily, yielding one `Expansion` per input in order."""
+        cwd = Path.cwd()
+        probe = PathProbe()
+        for raw in raws:
+            try:
+                candidate = str(self._join_rooted(raw, cwd))
+            except PathResolutionError as exc:
+                yield Expansion(raw, None, None, exc)
+                continue
+            path = probe.realpath(candidate) if resolve_symlinks else os.path.normpath(candidate)
+            exists = probe.exists(path) if check_exists else None
+            yield Expansion(raw, Path(path), exists, None)
 
     def to_rooted(self, target: Path) -> str:
-        target = target.resolve()
-        rel_work = ensure_relative(target, self.work_root)
-        if rel_work is not None:
-            return f"::WORK/{rel_work.as_posix()}"
-        rel_project = ensure_relative(target, self.project_root)
-        if rel_project is not None:
-            return f"::PROJECT/{rel_project.as_posix()}"
-        return str(target)
-
-    def checkpoint_from_arg(self, value: Optional[str]) -> Checkpoint:
+        """Render `target` as `::WORK/...` or `::PROJECT/...` when it lies below them."""
+        key = str(target)
+        rooted = self._rooted_cache.get(key)
+        if rooted is not None:
+            self._rooted_cache.move_to_end(key)
+            return rooted
+        if not os.path.isabs(key):
+            key_path = os.path.join(os.getcwd(), key)
+        else:
+            key_path = key
+        resolved = self._probe.realpath(key_path)
+        rooted = resolved
+        for anchor, label in self._anchors():
+            if resolved == anchor:
+                rooted = f"{label}/."
+                break
+            prefix = anchor if anchor.endswith("/") else anchor + "/"
+            if resolved.startswith(prefix):
+                rooted = f"{label}/{resolved[len(prefix):]}"
+                break
+        self._rooted_cache[key] = rooted
+        if len(self._rooted_cache) > self.ROOTED_CACHE_SIZE:
+            self._rooted_cache.popitem(last=False)
+        return rooted
+
+    def _anchors(self) -> List[Tuple[str, str]]:
+        """Resolved `(root, label)` pairs for `to_rooted`, work root first."""
+        if self._rooted_anchors is None:
+            self._rooted_anchors = [
+                (os.path.realpath(root), label)
+                for root, label in ((self.work_root, "::WORK"), (self.project_root, "::PROJECT"))
+                if root is not None
+            ]
+        return self._rooted_anchors
+
+    def checkpoint_from_arg(self, value: Optional[str], lazy: bool = False) -> Checkpoint:
         raw = value or "::THIS"
         path = self.expand(raw)
         if path.is_file():
@@ -526,88 +1603,346 @@ class AcftContext:
         if not (path / "CHECKPOINT.md").exists():
             raise PathResolutionError(f"No CHECKPOINT.md found at {path}")
         checkpoint = Checkpoint(path=path, context=self)
-        checkpoint.load()
+        checkpoint.load(lazy=lazy)
         return checkpoint
 
-    def scan_checkpoints(self) -> List[Checkpoint]:
+    @property
+    def cache_dir(self) -> Optional[Path]:
+        """Directory for derived, rebuildable state (`::WORK/.acft`)."""
+        if not self.work_root:
+            return None
+        return self.work_root / CACHE_DIRNAME
+
+    def scan_checkpoints(
+        self, max_depth: Optional[int] = None, jobs: Optional[int] = None
+    ) -> List[Checkpoint]:
+        """Load every parseable checkpoint below `::WORK`, sorted by path."""
         if not self.work_root:
             raise AcftError("Cannot scan checkpoints: no checkpoints_work.toml found in ancestor directories")
+        if max_depth is None:
+            max_depth = scan_depth_from_env()
+        if jobs is None:
+            jobs = jobs_from_env()
+        warm = AcftContext.warm
+        if warm is not None:
+            candidates = warm.candidates(self.work_root, max_depth)
+            index = warm.index(self)
+        else:
+            candidates = discover_checkpoint_dirs(self.work_root, max_depth=max_depth)
+            index = CheckpointIndex.open(self)
+        try:
+            if jobs > 1:
+                checkpoints = self._scan_parallel(candidates, index, jobs)
+            else:
+                checkpoints = self._scan_serial(candidates, index)
+            if index is not None:
+                index.flush()
+        finally:
+            if index is not None and warm is None:
+                index.close()
+        return checkpoints
+
+    def _scan_serial(
+        self, candidates: List[Path], index: Optional[CheckpointIndex]
+    ) -> List[Checkpoint]:
         checkpoints: List[Checkpoint] = []
-        for candidate in sorted(self.work_root.glob("*")):
-            if candidate.is_dir() and (candidate / "CHECKPOINT.md").exists():
-                cp = Checkpoint(path=candidate, context=self)
+        for candidate in candidates:
+            cp = Checkpoint(path=candidate, context=self)
+            try:
+                if index is None:
+                    cp.load(lazy=True)
+                else:
+                    key = candidate.relative_to(self.work_root).as_posix()
+                    record, content = index.load(key, cp.checkpoint_md)
+                    cp.apply_record(record, content=content)
+            except (CheckpointFormatError, FileNotFoundError):
+                continue
+            checkpoints.append(cp)
+        return checkpoints
+
+    def _scan_parallel(
+        self, candidates: List[Path], index: Optional[CheckpointIndex], jobs: int
+    ) -> List[Checkpoint]:
+        from concurrent.futures import ProcessPoolExecutor
+
+        records: List[Optional[Dict[str, Any]]] = [None] * len(candidates)
+        misses: List[int] = []
+        for position, candidate in enumerate(candidates):
+            if index is not None:
+                key = candidate.relative_to(self.work_root).as_posix()
                 try:
-                    cp.load()
-                except CheckpointFormatError:
+                    records[position] = index.lookup(key, (candidate / "CHECKPOINT.md").stat())
+                except FileNotFoundError:
                     continue
-                checkpoints.append(cp)
+            if records[position] is None:
+                misses.append(position)
+
+        paths = [str(candidates[position] / "CHECKPOINT.md") for position in misses]
+        if len(paths) >= jobs:
+            chunksize = max(1, len(paths) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                parsed = list(pool.map(parse_checkpoint_file, paths, chunksize=chunksize))
+        else:
+            parsed = [parse_checkpoint_file(path) for path in paths]
+
+        for position, result in zip(misses, parsed):
+            if result is None:
+                continue
+            record, digest, stat = result
+            records[position] = record
+            if index is not None:
+                key = candidates[position].relative_to(self.work_root).as_posix()
+                index.store(key, stat, digest, record)
+
+        checkpoints: List[Checkpoint] = []
+        for candidate, record in zip(candidates, records):
+            if record is None:
+                continue
+            cp = Checkpoint(path=candidate, context=self)
+            cp.apply_record(record)
+            checkpoints.append(cp)
         return checkpoints
 
 
+def parse_checkpoint_file(
+    path: str,
+) -> Optional[Tuple[Dict[str, Any], str, os.stat_result]]:
+    """Parse one `CHECKPOINT.md` into `(record, sha256, stat)`, or `None`."""
+    import hashlib
+
+    checkpoint_md = Path(path)
+    try:
+        stat = checkpoint_md.stat()
+        raw = checkpoint_md.read_bytes()
+        record = parse_checkpoint_text(_decode_text(raw, checkpoint_md), checkpoint_md)
+    except (CheckpointFormatError, FileNotFoundError):
+        return None
+    return record, hashlib.sha256(raw).hexdigest(), stat
+
+
+def jobs_from_env() -> int:
+    raw = os.environ.get("ACFT_JOBS")
+    if not raw:
+        return 1
+    try:
+        jobs = int(raw)
+    except ValueError as exc:
+        raise AcftError(f"ACFT_JOBS must be an integer, got {raw!r}") from exc
+    if jobs < 1:
+        raise AcftError("ACFT_JOBS must be at least 1")
+    return jobs
+
+
+def scan_depth_from_env() -> int:
+    raw = os.environ.get("ACFT_SCAN_DEPTH")
+    if not raw:
+        return DEFAULT_SCAN_DEPTH
+    try:
+        depth = int(raw)
+    except ValueError as exc:
+        raise AcftError(f"ACFT_SCAN_DEPTH must be an integer, got {raw!r}") from exc
+    if depth < 1:
+        raise AcftError("ACFT_SCAN_DEPTH must be at least 1")
+    return depth
+
+
+def discover_checkpoint_dirs(
+    root: Path, max_depth: int = DEFAULT_SCAN_DEPTH, visit: Optional[Any] = None
+) -> List[Path]:
+    """Return every directory below `root` that holds a `CHECKPOINT.md`, sorted."""
+    found: List[str] = []
+    stack: List[Tuple[str, int]] = [(str(root), 0)]
+    while stack:
+        directory, depth = stack.pop()
+        if visit is not None:
+            visit(directory)
+        try:
+            with os.scandir(directory) as entries:
+                subdirs: List[str] = []
+                is_checkpoint = False
+                for entry in entries:
+                    name = entry.name
+                    try:
+                        if name == "CHECKPOINT.md":
+                            is_checkpoint = entry.is_file()
+                        elif (
+                            depth < max_depth
+                            and name[0] != "."
+                            and name not in SCAN_PRUNED_DIRS
+                            and entry.is_dir()
+                        ):
+                            subdirs.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+        if is_checkpoint and depth > 0:
+            found.append(directory)
+        stack.extend((path, depth + 1) for path in subdirs)
+    return sorted(Path(path) for path in found)
+
+
+class WarmState:
+    """Scan state kept across commands by a long-running process (`acft daemon`)."""
+
+    def __init__(self, on_visit: Optional[Any] = None, cache_listing: bool = True):
+        self.on_visit = on_visit
+        self.cache_listing = cache_listing
+        self._candidates: Dict[Tuple[Path, int], List[Path]] = {}
+        self._indexes: Dict[Path, Optional[CheckpointIndex]] = {}
+
+    def candidates(self, work_root: Path, max_depth: int) -> List[Path]:
+        key = (work_root, max_depth)
+        cached = self._candidates.get(key)
+        if cached is None:
+            cached = discover_checkpoint_dirs(work_root, max_depth=max_depth, visit=self.on_visit)
+            if self.cache_listing:
+                self._candidates[key] = cached
+        return list(cached)
+
+    def index(self, context: "AcftContext") -> Optional[CheckpointIndex]:
+        assert context.work_root is not None
+        if context.work_root not in self._indexes:
+            self._indexes[context.work_root] = CheckpointIndex.open(context)
+        return self._indexes[context.work_root]
+
+    def invalidate(self) -> None:
+        self._candidates.clear()
+
+    def close(self) -> None:
+        for index in self._indexes.values():
+            if index is not None:
+                index.close()
+        self._indexes.clear()
+
+
+class CheckpointGraph:
+    """Adjacency indexes over a checkpoint scan for relationship queries."""
+
+    def __init__(self, checkpoints: Sequence[Checkpoint], ctx: AcftContext):
+        self.checkpoints = list(checkpoints)
+        self.parts: List[Optional[Dict[str, Any]]] = []
+        self.delegate_paths: List[Optional[Path]] = []
+        self.by_path: Dict[Path, int] = {}
+        self.delegates: Dict[Path, List[int]] = {}
+        self.by_raw_delegate: Dict[Any, List[int]] = {}
+        self.lineage: Dict[str, Dict[int, List[Tuple[int, int]]]] = {}
+
+        for position, cp in enumerate(self.checkpoints):
+            self.by_path.setdefault(cp.path, position)
+            parts = checkpoint_name_parts(cp.name)
+            self.parts.append(parts)
+            if parts:
+                versions = self.lineage.setdefault(parts["branch"], {})
+                versions.setdefault(parts["version"], []).append((parts["step"], position))
+
+            raw_delegate = cp.frontmatter.get("DELEGATE_OF")
+            delegate_path: Optional[Path] = None
+            if isinstance(raw_delegate, str):
+                try:
+                    delegate_path = ctx.expand(raw_delegate)
+                except PathResolutionError:
+                    delegate_path = None
+            self.delegate_paths.append(delegate_path)
+            if delegate_path is not None:
+                self.delegates.setdefault(delegate_path, []).append(position)
+            if raw_delegate is not None:
+                try:
+                    self.by_raw_delegate.setdefault(raw_delegate, []).append(position)
+                except TypeError:  # unhashable YAML value; cannot match by key
+                    pass
+
+        for versions in self.lineage.values():
+            for steps in versions.values():
+                steps.sort()
+
+    def delegates_of(self, path: Path) -> List[int]:
+        """Nodes whose DELEGATE_OF resolves to `path`."""
+        return self.delegates.get(path, [])
+
+    def sharing_delegate(self, raw_delegate: Any) -> List[int]:
+        """Nodes whose raw DELEGATE_OF value equals `raw_delegate`."""
+        try:
+            return self.by_raw_delegate.get(raw_delegate, [])
+        except TypeError:
+            return []
+
+    def group(self, branch: str, version: int) -> List[int]:
+        """Nodes named `{branch}_v{version}_*`, in scan order."""
+        steps = self.lineage.get(branch, {}).get(version, [])
+        return sorted(position for _, position in steps)
+
+    def predecessors(self, parts: Dict[str, Any]) -> List[int]:
+        """Earlier steps of the same version plus every step of earlier versions."""
+        found: List[int] = []
+        for version, steps in self.lineage.get(parts["branch"], {}).items():
+            if version < parts["version"]:
+                found.extend(position for _, position in steps)
+            elif version == parts["version"]:
+                found.extend(position for step, position in steps if step < parts["step"])
+        return found
+
+    def successors(self, parts: Dict[str, Any]) -> List[int]:
+        """Later steps of the same version plus every step of later versions."""
+        found: List[int] = []
+        for version, steps in self.lineage.get(parts["branch"], {}).items():
+            if version > parts["version"]:
+                found.extend(position for _, position in steps)
+            elif version == parts["version"]:
+                found.extend(position for step, position in steps if step > parts["step"])
+        return found
+
+
+# Fenced code blocks in these languages hold harness commands.
+HARNESS_FENCE_LANGUAGES = frozenset({"sh", "shell", "bash"})
+
+
 def read_manifest_commands(manifest_text: str, section_filter: Optional[str] = None) -> List[Tuple[str, str]]:
+    """Extract harness commands from MANIFEST section text; see `harness_commands`."""
+    return harness_commands(iter_markdown_tokens(manifest_text, section="MANIFEST"), section_filter)
+
+
+def harness_commands(
+    tokens: Iterable[MarkdownToken], section_filter: Optional[str] = None
+) -> List[Tuple[str, str]]:
     """
-    Extract harness commands from the MANIFEST section.
+    Extract harness commands from MANIFEST tokens.
 
     Returns a list of (section_name, command) tuples. Harness commands are
     sourced from fenced code blocks (```sh / ```bash) or bullet lists
     beginning with backticks. The parser prefers subheadings that include
-    the word "Harness".
+    the word "Harness". Comment lines inside fences are not commands.
     """
     commands: List[Tuple[str, str]] = []
     current_heading = "MANIFEST"
     include_block = section_filter is None
-    lines = manifest_text.splitlines()
-    fence_active = False
     fence_lang = ""
     buffer: List[str] = []
 
-    def flush_buffer():
-        nonlocal buffer, current_heading
-        if not buffer:
-            return
-        text = "\n".join(buffer).strip()
-        for line in text.splitlines():
-            command = line.strip()
-            if not command:
-                continue
-            commands.append((current_heading, command))
-        buffer = []
-
-    for line in lines:
-        heading_match = re.match(r"^(#+)\s+(.*)", line.strip())
-        if heading_match:
-            flush_buffer()
-            level = heading_match.group(1)
-            title = heading_match.group(2).strip()
-            current_heading = title.upper()
+    for token in tokens:
+        kind = token.kind
+        if kind == TOKEN_HEADING:
+            current_heading = token.text.upper()
             include_block = (
                 section_filter is None
                 or current_heading == section_filter.upper()
                 or section_filter.lower() in current_heading.lower()
             )
-            fence_active = False
+        elif kind == TOKEN_FENCE_OPEN:
+            fence_lang = token.text.lower()
+            buffer = []
+        elif kind == TOKEN_CODE:
+            if include_block and token.text and not token.text.startswith("#"):
+                buffer.append(token.text)
+        elif kind == TOKEN_FENCE_CLOSE:
+            if include_block and fence_lang in HARNESS_FENCE_LANGUAGES:
+                commands.extend((current_heading, command) for command in buffer)
+            buffer = []
             fence_lang = ""
-            continue
-        if line.strip().startswith("```"):
-            if not fence_active:
-                fence_active = True
-                fence_lang = line.strip().lstrip("`")
-                buffer = []
-            else:
-                fence_active = False
-                if include_block and fence_lang.lower() in {"sh", "shell", "bash"}:
-                    flush_buffer()
-                buffer = []
-                fence_lang = ""
-            continue
-        if fence_active:
-            if include_block:
-                buffer.append(line)
-            continue
-        if include_block and line.strip().startswith("- "):
-            token = line.strip()[2:].strip()
-            if token.startswith("`") and token.endswith("`"):
-                commands.append((current_heading, token[1:-1]))
+        elif kind == TOKEN_BULLET and include_block:
+            item = token.text.strip()
+            if item.startswith("`") and item.endswith("`"):
+                commands.append((current_heading, item[1:-1]))
     return commands
 
 
@@ -633,12 +1968,40 @@ def slugify_section(value: str) -> str:
 
 
 def run_subprocess(command: List[str], **kwargs: Any) -> subprocess.CompletedProcess:
+    import subprocess
+
     try:
         return subprocess.run(command, check=True, text=True, capture_output=True, **kwargs)
     except subprocess.CalledProcessError as exc:  # pragma: no cover - pass-through
         raise AcftError(f"Command {' '.join(command)} failed: {exc.stderr or exc.stdout}") from exc
 
 
+class OwnerOnlyServerMixin:
+    """`socketserver` mixin: bind the Unix socket 0600 and refuse other users' connections."""
+
+    def server_bind(self) -> None:
+        previous = os.umask(0o177)  # Create the socket 0600 rather than chmod it afterwards.
+        try:
+            super().server_bind()  # type: ignore[misc]
+        finally:
+            os.umask(previous)
+
+    def verify_request(self, request: Any, client_address: Any) -> bool:
+        uid = peer_uid(request)
+        return uid is None or uid == os.getuid()
+
+
+def peer_uid(connection: Any) -> Optional[int]:
+    """The connecting process's uid, where the platform reports it (Linux)."""
+    import socket
+    import struct
+
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    ucred = struct.Struct("3i")  # pid, uid, gid
+    return ucred.unpack(connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, ucred.size))[1]
+
+
 def build_checkpoint_template(
     name: str,
     delegate_of: Optional[str] = None,
@@ -655,6 +2018,8 @@ def build_checkpoint_template(
     if tags:
         metadata["TAGS"] = tags
 
+    import textwrap
+
     frontmatter = _dump_simple_yaml(metadata, ["VALID", "LIFECYCLE", "SIGNAL", "DELEGATE_OF", "TAGS"])
     body = textwrap.dedent(
         f"""
@@ -691,35 +2056,6 @@ def build_checkpoint_template(
     return f"---\n{frontmatter}\n---\n{body}\n"
 
 
-class EventEmitter:
-    def __init__(self, context: AcftContext):
-        self.context = context
-        self.actor = os.environ.get("ACFT_ACTOR") or getpass.getuser()
-        if not self.context.work_root:
-            raise AcftError("Cannot initialize event emitter: no checkpoints_work.toml found in ancestor directories")
-        self.log_path = (self.context.work_root / "checkpoints_events.log").resolve()
-
-    def emit(self, event_type: str, checkpoint: Optional[Checkpoint], payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        payload = payload or {}
-        event: Dict[str, Any] = {
-            "TYPE": event_type,
-            "ACTOR": self.actor,
-            "TIMESTAMP": utcnow_iso(),
-            "PAYLOAD": payload,
-        }
-        if checkpoint is not None:
-            event["CHECKPOINT_PATH"] = self.context.to_rooted(checkpoint.path)
-        line = json.dumps(event, sort_keys=True)
-        print(line)
-        self.log_path.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            with self.log_path.open("a", encoding="utf-8") as fh:
-                fh.write(line + "\n")
-        except OSError as exc:
-            raise AcftError(f"Failed to append event log at {self.log_path}: {exc}") from exc
-        return event
-
-
 def checkpoint_name_parts(name: str) -> Optional[Dict[str, str]]:
     match = CHECKPOINT_NAME_RE.match(name)
     if not match:
@@ -767,16 +2103,13 @@ def validate_section_order(section_order: List[str]) -> Tuple[List[str], List[st
     return errors, warnings
 
 
+# One scan for all unrooted-path patterns; the lookahead lets matches
+# overlap (e.g. "../ARTIFACTS" yields both "../" and "./ARTIFACTS").
+_UNROOTED_PATH_RE = re.compile(r"(?=(\.\./|\./ARTIFACTS|\sARTIFACTS/))")
+
+
 def detect_unrooted_paths(text: str) -> List[str]:
-    patterns = [
-        r"\.\./",
-        r"\./ARTIFACTS",
-        r"\sARTIFACTS/",
-    ]
-    matches: List[str] = []
-    for pattern in patterns:
-        matches.extend(re.findall(pattern, text))
-    return matches
+    return _UNROOTED_PATH_RE.findall(text)
 
 
 def find_latest_checkpoint(checkpoints: List[Checkpoint], branch: str, version: int) -> Optional[Checkpoint]:
@@ -1,3 +1,9 @@
+import os
+import subprocess
+
+from tests.util import ACFT_BIN
+
+
 def test_close_sets_valid_true_and_emits_events(project_builder):
     project_builder.run_acft(["new", "close_v1_01"])
     checkpoint_dir = project_builder.checkpoint_path("close_v1_01")
@@ -41,3 +47,73 @@ def test_close_requires_manifest_entries(project_builder):
     )
     assert result.returncode != 0
     assert "MANIFEST LEDGER" in (result.stderr or result.stdout)
+
+
+def test_close_patches_checkpoint_in_place(project_builder):
+    project_builder.run_acft(["new", "close_v1_03"])
+    checkpoint_dir = project_builder.checkpoint_path("close_v1_03")
+    checkpoint_md = checkpoint_dir / "CHECKPOINT.md"
+    project_builder.replace_in_checkpoint("close_v1_03", "# HARNESS\n", "# HARNESS\n\n\n  hand   formatted  \n")
+    before = checkpoint_md.read_text(encoding="utf-8")
+
+    project_builder.run_acft(["close", "--status", "false", "--signal", "fail", "--message", "first"], cwd=checkpoint_dir)
+    after = checkpoint_md.read_text(encoding="utf-8")
+    frontmatter, body = after.split("\n---\n", 1)
+    assert "SIGNAL: fail" in frontmatter
+    # The body keeps its bytes; only the LOG entry is added at the end.
+    assert body.startswith(before.split("\n---\n", 1)[1])
+    assert body.endswith(" - first\n")
+
+    # Only the LOG changes now, so the entry is appended to the same file.
+    inode = checkpoint_md.stat().st_ino
+    project_builder.run_acft(["close", "--status", "false", "--signal", "fail", "--message", "second"], cwd=checkpoint_dir)
+    final = checkpoint_md.read_text(encoding="utf-8")
+    assert checkpoint_md.stat().st_ino == inode
+    assert final.startswith(after) and final.endswith(" - second\n")
+
+
+def test_concurrent_closes_keep_every_log_entry(project_builder):
+    project_builder.run_acft(["new", "close_v1_04"])
+    checkpoint_dir = project_builder.checkpoint_path("close_v1_04")
+    env = {**os.environ, "ACFT_ACTOR": "acft-test"}
+    messages = [f"parallel close {step}" for step in range(8)]
+    processes = [
+        subprocess.Popen(
+            [str(ACFT_BIN), "close", "--status", "false", "--signal", "fail", "--message", message],
+            cwd=str(checkpoint_dir),
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        for message in messages
+    ]
+    for process in processes:
+        assert process.wait() == 0, process.stderr.read()
+
+    contents = (checkpoint_dir / "CHECKPOINT.md").read_text(encoding="utf-8")
+    assert "SIGNAL: fail" in contents
+    for message in messages:
+        assert contents.count(f" - {message}\n") == 1
+    assert not [path.name for path in checkpoint_dir.iterdir() if path.name.endswith(".tmp")]
+
+
+def test_patch_reports_a_checkpoint_removed_mid_update(project_builder, monkeypatch):
+    import pytest
+    from _lib import Checkpoint, CheckpointConflictError, CheckpointPatch
+
+    project_builder.run_acft(["new", "close_v1_07"])
+    checkpoint = Checkpoint(project_builder.checkpoint_path("close_v1_07"), None)
+    checkpoint.load()
+    prepare = CheckpointPatch._edits
+
+    def prepare_then_remove(self, text, version):
+        edits = prepare(self, text, version)
+        self.checkpoint.checkpoint_md.unlink()
+        return edits
+
+    monkeypatch.setattr(CheckpointPatch, "_edits", prepare_then_remove)
+    checkpoint.frontmatter["SIGNAL"] = "pass"
+    patch = CheckpointPatch(checkpoint, frontmatter=True)
+    patch.append_log("Removed underneath us")
+    with pytest.raises(CheckpointConflictError, match="removed"):
+        patch.apply()
@@ -3,6 +3,12 @@ import pytest
 from tests.util import ProjectBuilder
 
 
+@pytest.fixture(autouse=True)
+def isolated_roots_cache(tmp_path, monkeypatch):
+    # Commands run without `run_acft` must not touch the user's roots cache either.
+    monkeypatch.setenv("ACFT_ROOTS_CACHE", str(tmp_path / "acft_roots.json"))
+
+
 @pytest.fixture()
 def project_builder():
     builder = ProjectBuilder()
@@ -0,0 +1,101 @@
+import json
+import os
+import socket
+import subprocess
+import threading
+
+from tests.util import ACFT_BIN
+
+
+def test_daemon_serves_commands_and_sees_tree_changes(project_builder, monkeypatch):
+    project_builder.run_acft(["new", "daemon_v1_01"])
+    env = {**os.environ, "ACFT_ACTOR": "acft-test"}
+    daemon = subprocess.Popen(
+        [str(ACFT_BIN), "daemon"],
+        cwd=str(project_builder.work_root),
+        env=env,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert "listening" in daemon.stdout.readline()
+        socket_mode = (project_builder.work_root / ".acft" / "acftd.sock").stat().st_mode
+        assert socket_mode & 0o777 == 0o600
+
+        def orient(extra_env=None):
+            result = project_builder.run_acft(["orient", "::WORK/daemon_v1_01", "--json"], env=extra_env)
+            return json.loads(result.stdout)
+
+        assert orient() == orient({"ACFT_NO_DAEMON": "1"})
+
+        # A checkpoint created behind the daemon's back must show up at once.
+        project_builder.run_acft(["new", "daemon_v1_02"], env={"ACFT_NO_DAEMON": "1"})
+        warm = orient()
+        assert [item["checkpoint"] for item in warm["relationships"]["children"]] == ["::WORK/daemon_v1_02"]
+        assert warm == orient({"ACFT_NO_DAEMON": "1"})
+
+        # Harness runs stay in the caller's process.
+        from _acft_client import client_main
+
+        monkeypatch.chdir(project_builder.work_root)
+        assert client_main(["verify", "::WORK/daemon_v1_01"]) is None
+
+        # stderr and exit codes come back from the daemon unchanged.
+        missing = project_builder.run_acft(["validate", "::WORK/missing_v1_01"], check=False)
+        assert missing.returncode == 2 and "No CHECKPOINT.md" in missing.stderr
+
+        project_builder.run_acft(["daemon", "--stop"])
+        assert daemon.wait(timeout=10) == 0
+    finally:
+        if daemon.poll() is None:
+            daemon.kill()
+            daemon.wait()
+    assert not (project_builder.work_root / ".acft" / "acftd.sock").exists()
+
+
+def test_client_does_not_rerun_a_command_the_daemon_dropped(project_builder):
+    # A daemon that dies mid-command may already have written files, so the
+    # client must report the failure instead of running the command again.
+    socket_path = project_builder.work_root / ".acft" / "acftd.sock"
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    server.listen(1)
+    server.settimeout(10)
+
+    def crash_mid_command():
+        conn, _ = server.accept()
+        with conn, conn.makefile("rb") as stream:
+            stream.readline()
+            conn.sendall(json.dumps({"stream": "stdout", "data": "partial\n"}).encode("utf-8") + b"\n")
+
+    thread = threading.Thread(target=crash_mid_command, daemon=True)
+    thread.start()
+    try:
+        result = project_builder.run_acft(["new", "dropped_v1_01"], check=False)
+    finally:
+        thread.join(timeout=10)
+        server.close()
+    assert result.returncode == 1
+    assert result.stdout == "partial\n"
+    assert "lost the connection to the acft daemon" in result.stderr
+    assert not (project_builder.work_root / "dropped_v1_01").exists()
+
+
+def test_daemon_stops_caching_listings_when_a_watch_fails(project_builder):
+    from _acft_daemon import TreeWatcher
+    from _lib import WarmState
+
+    class ExhaustedInotify:
+        def add_watch(self, directory):
+            return False  # As when max_user_watches is used up.
+
+    project_builder.run_acft(["new", "watch_v1_01"])
+    warm = WarmState()
+    warm.on_visit = TreeWatcher(warm, ExhaustedInotify()).watch
+    work_root = project_builder.work_root
+    assert warm.candidates(work_root, 6) == [work_root / "watch_v1_01"]
+    assert not warm.cache_listing
+
+    project_builder.run_acft(["new", "watch_v1_02"])
+    assert warm.candidates(work_root, 6) == [work_root / "watch_v1_01", work_root / "watch_v1_02"]
@@ -1,4 +1,12 @@
 import json
+import os
+import queue
+import select
+import subprocess
+import threading
+import time
+
+from tests.util import ACFT_BIN
 
 
 def test_events_tail_filters_by_type(project_builder):
@@ -36,3 +44,180 @@ def test_events_tail_with_iso_timestamp(project_builder):
     )
     lines = [line for line in result.stdout.splitlines() if line.strip()]
     assert lines, "Expected events when using ISO timestamp"
+
+
+def test_events_tail_index_matches_sequential_scan(project_builder):
+    for step in ("01", "02", "03"):
+        project_builder.run_acft(["new", f"events_v2_{step}"])
+    log_path = project_builder.work_root / "checkpoints_events.log"
+    old_event = {
+        "ACTOR": "acft-test",
+        "PAYLOAD": {},
+        "TIMESTAMP": "2000-01-01T00:00:00Z",
+        "TYPE": "CHECKPOINT_CREATED",
+    }
+    # Lines appended behind the emitter's back are indexed on the next read.
+    with log_path.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps(old_event) + "\n")
+    # Emitters leave the index alone; the first filtered read builds it.
+    index_path = project_builder.work_root / ".acft" / "events.idx"
+    assert not index_path.exists()
+
+    def tail(*extra, env=None):
+        result = project_builder.run_acft(["events", "tail", *extra], env=env)
+        return [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
+
+    for query in ([], ["--since=-1d"], ["--types", "CHECKPOINT_CREATED"], ["--since", "2000-01-01T00:00:00Z"]):
+        assert tail(*query) == tail(*query, env={"ACFT_NO_INDEX": "1"})
+    assert old_event not in tail("--since=-1d")
+    assert len(tail("--types", "CHECKPOINT_CREATED")) == 4
+    assert index_path.exists()
+
+    # A replaced log invalidates the index instead of serving stale offsets.
+    log_path.write_text(json.dumps(old_event) + "\n", encoding="utf-8")
+    assert tail("--since", "2000-01-01T00:00:00Z") == [old_event]
+
+
+def test_events_segments_roll_over_and_compact(project_builder):
+    env = {"ACFT_EVENTS_SEGMENT_BYTES": "1", "ACFT_EVENTS_COMPRESS": "gzip"}
+    project_builder.run_acft(["new", "events_v3_01"], env=env)
+    checkpoint_dir = project_builder.checkpoint_path("events_v3_01")
+    for _ in range(3):
+        project_builder.run_acft(
+            ["close", "--status", "false", "--signal", "pending", "--message", "wip"],
+            cwd=checkpoint_dir,
+            env=env,
+        )
+
+    segment_dir = project_builder.work_root / "checkpoints_events"
+    assert sorted(path.name for path in segment_dir.glob("*.log.gz"))
+
+    def tail(*extra):
+        result = project_builder.run_acft(["events", "tail", *extra])
+        return [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
+
+    before = tail()
+    types = [event["TYPE"] for event in before]
+    assert types == ["CHECKPOINT_CREATED"] + ["CHECKPOINT_VERIFIED"] * 3
+    assert [event["TYPE"] for event in tail("--types", "CHECKPOINT_CREATED")] == ["CHECKPOINT_CREATED"]
+
+    for _ in range(2):
+        project_builder.run_acft(["manifest", "::THIS", "--emit"], cwd=checkpoint_dir, env=env, check=False)
+    manifest_events = tail("--types", "MANIFEST_UPDATED")
+    assert len(manifest_events) == 2
+
+    # The last close supersedes the creation and earlier closes; other TYPEs keep their latest.
+    result = project_builder.run_acft(["events", "compact", "--seal"])
+    assert "kept 2 of 6" in result.stdout
+    assert tail() == [before[-1], manifest_events[-1]]
+
+
+def test_events_tail_follow_survives_truncation_and_rotation(project_builder):
+    log_path = project_builder.work_root / "checkpoints_events.log"
+    log_path.write_text("", encoding="utf-8")
+    process = subprocess.Popen(
+        [str(ACFT_BIN), "events", "tail", "--follow"],
+        cwd=str(project_builder.work_root),
+        env={**os.environ, "ACFT_ACTOR": "acft-test"},
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+
+    def event(marker):
+        return {"ACTOR": "acft-test", "PAYLOAD": {"N": marker}, "TIMESTAMP": "2030-01-01T00:00:00Z", "TYPE": "X"}
+
+    def next_marker():
+        ready, _, _ = select.select([process.stdout], [], [], 5)
+        assert ready, "follow did not deliver the event"
+        return json.loads(process.stdout.readline())["PAYLOAD"]["N"]
+
+    try:
+        time.sleep(0.5)
+        with log_path.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps(event(100)) + "\n")
+        assert next_marker() == 100
+
+        log_path.write_text(json.dumps(event(2)) + "\n", encoding="utf-8")
+        assert next_marker() == 2
+
+        log_path.rename(log_path.with_name("rotated.log"))
+        log_path.write_text(json.dumps(event(3)) + "\n", encoding="utf-8")
+        assert next_marker() == 3
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_concurrent_emitters_never_interleave_records(project_builder):
+    names = [f"events_v4_{step:02d}" for step in range(1, 7)]
+    for name in names:
+        project_builder.run_acft(["new", name])
+    message = "x" * 100_000  # Far beyond PIPE_BUF, so unlocked appends could tear.
+    env = {**os.environ, "ACFT_ACTOR": "acft-test", "ACFT_EVENTS_FSYNC": "batch"}
+    processes = [
+        subprocess.Popen(
+            [str(ACFT_BIN), "close", "--status", "true", "--signal", "pass", "--message", message],
+            cwd=str(project_builder.checkpoint_path(name)),
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        for name in names
+    ]
+    for process in processes:
+        assert process.wait() == 0, process.stderr.read()
+
+    events = project_builder.read_events()  # Raises if any line was torn.
+    closing = [event for event in events if event["TYPE"] in ("CHECKPOINT_VERIFIED", "CHECKPOINT_CLOSED")]
+    assert len(closing) == 2 * len(names)
+    # Each close appends its VERIFIED/CLOSED pair as one batch.
+    for first, second in zip(closing[::2], closing[1::2]):
+        assert first["CHECKPOINT_PATH"] == second["CHECKPOINT_PATH"]
+        assert (first["TYPE"], second["TYPE"]) == ("CHECKPOINT_VERIFIED", "CHECKPOINT_CLOSED")
+
+
+def test_event_bus_fans_out_and_runs_handlers_in_process(project_builder):
+    env = {**os.environ, "ACFT_ACTOR": "acft-test"}
+    cwd = str(project_builder.work_root)
+    socket_path = project_builder.work_root / ".acft" / "events.sock"
+    daemon = subprocess.Popen([str(ACFT_BIN), "events", "serve"], cwd=cwd, env=env, stdout=subprocess.PIPE, text=True)
+    subscriber = None
+    try:
+        assert "listening" in daemon.stdout.readline()
+        assert socket_path.stat().st_mode & 0o777 == 0o600
+        for bad_handler, error in (("", "empty handler command"), ("validate '", "malformed handler")):
+            refused = project_builder.run_acft(["events", "subscribe", "--run", bad_handler], check=False)
+            assert refused.returncode != 0 and error in refused.stderr, refused.stderr
+        subscriber = subprocess.Popen(
+            [str(ACFT_BIN), "events", "subscribe", "--types", "CHECKPOINT_CREATED", "--paths", "::WORK/bus_*",
+             "--run", "validate --json"],
+            cwd=cwd,
+            env=env,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        time.sleep(0.5)
+        project_builder.run_acft(["new", "other_v1_01"])
+        project_builder.run_acft(["new", "bus_v1_01"])
+
+        lines = queue.Queue()
+        threading.Thread(target=lambda: [lines.put(line) for line in subscriber.stdout], daemon=True).start()
+
+        def next_message():
+            return json.loads(lines.get(timeout=10))
+
+        event = next_message()
+        assert (event["TYPE"], event["CHECKPOINT_PATH"]) == ("CHECKPOINT_CREATED", "::WORK/bus_v1_01")
+        result = next_message()
+        assert result["HANDLER"] == "validate --json" and result["CHECKPOINT_PATH"] == "::WORK/bus_v1_01"
+        assert result["EXIT_CODE"] == 0, result["OUTPUT"]
+    finally:
+        for process in (subscriber, daemon):
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=10)
+
+    # The daemon appended each published event exactly once.
+    created = [event for event in project_builder.read_events() if event["TYPE"] == "CHECKPOINT_CREATED"]
+    assert [event["CHECKPOINT_PATH"] for event in created] == ["::WORK/other_v1_01", "::WORK/bus_v1_01"]
+    assert not socket_path.exists()
@@ -1,3 +1,12 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+from tests.util import ACFT_BIN
+
+
 def test_expand_outputs_absolute_paths(project_builder):
     result = project_builder.run_acft(["expand", "::PROJECT", "::WORK"])
     outputs = [line for line in result.stdout.splitlines() if line.strip()]
@@ -74,3 +83,103 @@ def test_expand_project_ignores_git_directory(project_builder, tmp_path):
         assert Path(expanded).resolve() == outer.resolve()
     finally:
         shutil.rmtree(outer, ignore_errors=True)
+
+
+def test_expand_imports_only_its_command_module(project_builder):
+    """The dispatcher imports just the selected command's module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(ACFT_BIN), "expand", "::WORK"],
+        cwd=project_builder.work_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines() if "|" in line}
+    assert "_lib" in imported
+    assert not {name for name in imported if name.startswith("_acft_")} - {"_acft_expand", "_acft_client"}
+    assert not imported & {"sqlite3", "subprocess", "dataclasses", "hashlib", "ctypes"}
+
+    help_text = project_builder.run_acft(["--help"]).stdout
+    assert "Expand rooted prefixes to absolute paths." in help_text
+    assert "Execute harness commands documented in MANIFEST." in help_text
+
+
+def test_expand_reuses_cached_roots_until_tree_changes(project_builder, tmp_path):
+    project_builder.run_acft(["new", "roots_v1_01"])
+    checkpoint_dir = project_builder.checkpoint_path("roots_v1_01")
+    notes = checkpoint_dir / "notes"
+    notes.mkdir()
+    # Results depending on just-modified directories are never cached.
+    past = time.time() - 60
+    for directory in [notes, *notes.parents]:
+        os.utime(directory, (past, past))
+        if directory == project_builder.project_root:
+            break
+    cache_file = tmp_path / "roots.json"
+    env = {"ACFT_ROOTS_CACHE": str(cache_file)}
+
+    result = project_builder.run_acft(["expand", "::THIS"], cwd=notes, env=env)
+    assert result.stdout.strip() == str(checkpoint_dir)
+    entries = json.loads(cache_file.read_text())["entries"]
+    assert entries[str(notes)]["roots"] == [
+        str(project_builder.project_root),
+        str(project_builder.work_root),
+        str(checkpoint_dir),
+    ]
+
+    # A hit is served from the cache without searching again.
+    entries[str(notes)]["roots"][2] = str(project_builder.work_root)
+    cache_file.write_text(json.dumps({"version": 1, "entries": entries}))
+    result = project_builder.run_acft(["expand", "::THIS"], cwd=notes, env=env)
+    assert result.stdout.strip() == str(project_builder.work_root)
+
+    # A new marker changes its directory's mtime and invalidates the entry.
+    (notes / "CHECKPOINT.md").write_text("---\nVALID: false\n---\n")
+    result = project_builder.run_acft(["expand", "::THIS"], cwd=notes, env=env)
+    assert result.stdout.strip() == str(notes)
+
+    # Entries for trees that no longer exist are pruned on the next write.
+    entries = json.loads(cache_file.read_text())["entries"]
+    gone = tmp_path / "gone"
+    entries[str(gone / "work")] = {"roots": [str(gone), str(gone / "work"), None], "mtimes": [0]}
+    cache_file.write_text(json.dumps({"version": 1, "entries": entries}))
+    project_builder.run_acft(["expand", "::THIS"], cwd=checkpoint_dir, env=env)
+    entries = json.loads(cache_file.read_text())["entries"]
+    assert str(gone / "work") not in entries
+    assert str(checkpoint_dir) in entries
+
+
+def test_expand_stdin_streams_aligned_records(project_builder):
+    project_builder.run_acft(["new", "bulk_v1_01"])
+    checkpoint_dir = project_builder.checkpoint_path("bulk_v1_01")
+    paths = ["::WORK/bulk_v1_01", "::WORK/missing", "::BOGUS", "::WORK/bulk_v1_01/CHECKPOINT.md"]
+
+    result = subprocess.run(
+        [str(ACFT_BIN), "expand", "--stdin", "-0"],
+        cwd=project_builder.work_root,
+        input="\0".join(paths).encode(),
+        capture_output=True,
+    )
+    assert result.returncode == 2
+    assert result.stdout.split(b"\0") == [
+        str(checkpoint_dir).encode(),
+        b"",
+        b"",
+        str(checkpoint_dir / "CHECKPOINT.md").encode(),
+        b"",
+    ]
+    assert b"Expanded path does not exist" in result.stderr
+    assert b"Unknown rooted prefix in path: ::BOGUS" in result.stderr
+
+    result = subprocess.run(
+        [str(ACFT_BIN), "expand", "--stdin", "--allow-future"],
+        cwd=project_builder.work_root,
+        input="::WORK/later\n::PROJECT\n",
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.splitlines() == [
+        str(project_builder.work_root / "later"),
+        str(project_builder.project_root),
+    ]
@@ -0,0 +1,46 @@
+import json
+
+SIDECAR_ENV = {"ACFT_LOG_SIDECAR": "1"}
+
+
+def test_log_sidecar_appends_then_flushes_into_checkpoint(project_builder):
+    project_builder.run_acft(["new", "log_v1_01"])
+    checkpoint_dir = project_builder.checkpoint_path("log_v1_01")
+    checkpoint_md = checkpoint_dir / "CHECKPOINT.md"
+    sidecar = checkpoint_dir / ".CHECKPOINT.log.jsonl"
+    before = checkpoint_md.read_bytes()
+
+    for message in ("First pending note", "Second pending note"):
+        result = project_builder.run_acft(
+            ["log", "append", message], cwd=checkpoint_dir, env=SIDECAR_ENV
+        )
+        assert result.returncode == 0, result.stderr
+
+    assert checkpoint_md.read_bytes() == before
+    records = [json.loads(line) for line in sidecar.read_text().splitlines()]
+    assert [record["MESSAGE"] for record in records] == ["First pending note", "Second pending note"]
+
+    payload = json.loads(project_builder.run_acft(["orient", "::THIS", "--json"], cwd=checkpoint_dir).stdout)
+    assert payload["latest_log"] == records[-1]["TIMESTAMP"]
+
+    result = project_builder.run_acft(["log", "flush"], cwd=checkpoint_dir)
+    assert result.returncode == 0, result.stderr
+    assert "Flushed 2 LOG entries" in result.stdout
+    assert not sidecar.exists()
+
+    text = checkpoint_md.read_text()
+    assert text.index("First pending note") < text.index("Second pending note")
+    again = project_builder.run_acft(["log", "flush"], cwd=checkpoint_dir)
+    assert "Flushed 0 LOG entries" in again.stdout
+    assert checkpoint_md.read_text() == text
+
+
+def test_log_append_without_sidecar_writes_checkpoint(project_builder):
+    project_builder.run_acft(["new", "log_v1_02"])
+    checkpoint_dir = project_builder.checkpoint_path("log_v1_02")
+
+    result = project_builder.run_acft(["log", "append", "Direct note"], cwd=checkpoint_dir)
+    assert result.returncode == 0, result.stderr
+
+    assert "Direct note" in (checkpoint_dir / "CHECKPOINT.md").read_text()
+    assert not (checkpoint_dir / ".CHECKPOINT.log.jsonl").exists()
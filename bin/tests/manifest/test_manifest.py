@@ -0,0 +1,102 @@
+import json
+import os
+import time
+
+
+def _age_checkpoints(project_builder, seconds):
+    stamp = time.time() - seconds
+    for checkpoint_md in project_builder.work_root.glob("*/CHECKPOINT.md"):
+        os.utime(checkpoint_md, (stamp, stamp))
+
+
+def test_manifest_full_parallel_matches_serial(project_builder):
+    for name in ["par_v1_01", "par_v1_02", "par_v2_01", "other_v1_01"]:
+        project_builder.run_acft(["new", name])
+    project_builder.replace_in_checkpoint("par_v1_02", "---\nVALID", "--\nVALID")
+    checkpoint_dir = project_builder.checkpoint_path("par_v1_01")
+    env = {"ACFT_NO_INDEX": "1"}
+
+    serial = project_builder.run_acft(
+        ["manifest", "::THIS", "--mode", "full", "--json"], cwd=checkpoint_dir, env=env, check=False
+    )
+    parallel = project_builder.run_acft(
+        ["manifest", "::THIS", "--mode", "full", "--json", "--jobs", "3"],
+        cwd=checkpoint_dir,
+        env=env,
+        check=False,
+    )
+
+    assert parallel.returncode == serial.returncode
+    assert json.loads(parallel.stdout) == json.loads(serial.stdout)
+    flagged = {item["checkpoint"] for item in json.loads(serial.stdout)["issues"]}
+    assert "::WORK/par_v1_02" not in flagged
+    assert "::WORK/par_v2_01" in flagged
+
+
+def test_manifest_full_groups_version_drift(project_builder):
+    for name in ["drift_v1_01", "drift_v1_02", "drift_v2_01"]:
+        project_builder.run_acft(["new", name])
+    project_builder.replace_in_checkpoint("drift_v1_02", "LIFECYCLE: active", "LIFECYCLE: superseded")
+    project_builder.run_acft(["new", "drift_v1_03"])
+    checkpoint_dir = project_builder.checkpoint_path("drift_v1_01")
+
+    result = project_builder.run_acft(
+        ["manifest", "::THIS", "--mode", "full", "--json"], cwd=checkpoint_dir, check=False
+    )
+    drift = {
+        item["checkpoint"]: item["detail"]
+        for item in json.loads(result.stdout)["issues"]
+        if item["failure"] == "version_drift"
+    }
+
+    assert set(drift) == {"::WORK/drift_v1_01", "::WORK/drift_v1_02", "::WORK/drift_v1_03"}
+    assert drift["::WORK/drift_v1_01"].endswith(": drift_v1_03")
+    assert drift["::WORK/drift_v1_02"].endswith(": drift_v1_01, drift_v1_03")
+
+
+def test_manifest_incremental_matches_full_sweep(project_builder):
+    for name in ["inc_v1_01", "inc_v1_02", "solo_v1_01"]:
+        project_builder.run_acft(["new", name])
+    checkpoint_dir = project_builder.checkpoint_path("inc_v1_01")
+    full = ["manifest", "::THIS", "--mode", "full", "--json"]
+
+    def sweep(*extra):
+        result = project_builder.run_acft(full + list(extra), cwd=checkpoint_dir, check=False)
+        return json.loads(result.stdout)
+
+    _age_checkpoints(project_builder, 3600)
+    assert sweep("--incremental") == sweep()
+    state_path = project_builder.work_root / ".acft" / "manifest_state.json"
+    state = json.loads(state_path.read_text(encoding="utf-8"))
+    assert all(entry["fingerprint"] for entry in state["checkpoints"].values())
+    assert sweep("--incremental") == sweep()
+
+    project_builder.replace_in_checkpoint("inc_v1_01", "LIFECYCLE: active", "LIFECYCLE: superseded")
+    project_builder.replace_in_checkpoint("solo_v1_01", "- Context recap: TODO\n", "")
+    _age_checkpoints(project_builder, 1800)
+    incremental = sweep("--incremental")
+    assert incremental == sweep()
+    failures = {(item["checkpoint"], item["failure"]) for item in incremental["issues"]}
+    assert ("::WORK/inc_v1_02", "version_drift") not in failures
+    assert ("::WORK/solo_v1_01", "history_drift") in failures
+
+
+def test_manifest_incremental_sees_log_sidecar_entries(project_builder):
+    project_builder.run_acft(["new", "side_v1_01"])
+    checkpoint_dir = project_builder.checkpoint_path("side_v1_01")
+    command = ["manifest", "::THIS", "--mode", "full", "--json", "--incremental"]
+
+    def failures():
+        result = project_builder.run_acft(command, cwd=checkpoint_dir, check=False)
+        return {item["failure"] for item in json.loads(result.stdout)["issues"]}
+
+    _age_checkpoints(project_builder, 3600)
+    assert "missing_harness" in failures()
+
+    project_builder.run_acft(
+        ["log", "append", "Ran the harness by hand"], cwd=checkpoint_dir, env={"ACFT_LOG_SIDECAR": "1"}
+    )
+    sidecar = checkpoint_dir / ".CHECKPOINT.log.jsonl"
+    stamp = time.time() - 1800
+    os.utime(sidecar, (stamp, stamp))
+    assert "missing_harness" not in failures()
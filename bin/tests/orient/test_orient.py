@@ -1,5 +1,7 @@
 import json
 
+import pytest
+
 
 def test_orient_reports_basic_metadata(project_builder):
     project_builder.run_acft(["new", "orient_v1_01"])
@@ -32,3 +34,256 @@ def test_orient_sections_and_depth(project_builder):
     assert any(name.endswith("delegate_v1_01") for name in children)
     sections = payload["sections"]
     assert "STATUS" in sections and "LOG" in sections
+
+
+def test_orient_index_tracks_checkpoint_edits(project_builder):
+    project_builder.run_acft(["new", "index_v1_01"])
+    project_builder.run_acft(["new", "index_v1_02"])
+    target = "::WORK/index_v1_02"
+
+    first = json.loads(project_builder.run_acft(["orient", target, "--json"]).stdout)
+    assert (project_builder.work_root / ".acft" / "checkpoints_index.sqlite").exists()
+    assert first["relationships"]["ancestry"][0]["LIFECYCLE"] == "active"
+
+    project_builder.replace_in_checkpoint("index_v1_01", "LIFECYCLE: active", "LIFECYCLE: archived")
+    second = json.loads(project_builder.run_acft(["orient", target, "--json"]).stdout)
+    assert second["relationships"]["ancestry"][0]["LIFECYCLE"] == "archived"
+
+
+def test_orient_discovers_nested_delegates(project_builder):
+    project_builder.run_acft(["new", "nest_v1_01"])
+    parent_dir = project_builder.checkpoint_path("nest_v1_01")
+    project_builder.run_acft(["new", "sub_v1_01", "--delegate-of", "::THIS"], cwd=parent_dir)
+    project_builder.write_checkpoint_file("nest_v1_01", "ARTIFACTS/copy_v1_01/CHECKPOINT.md", "---\n---\n")
+
+    result = project_builder.run_acft(["orient", "::THIS", "--json"], cwd=parent_dir)
+    payload = json.loads(result.stdout)
+
+    children = [item["checkpoint"] for item in payload["relationships"]["children"]]
+    assert children == ["::WORK/nest_v1_01/sub_v1_01"]
+
+
+def test_orient_roots_paths_reached_through_a_symlink(project_builder, tmp_path):
+    project_builder.run_acft(["new", "linked_v1_01"])
+    link = tmp_path / "project_link"
+    link.symlink_to(project_builder.project_root)
+    linked_checkpoint = link / "work" / "linked_v1_01"
+
+    result = project_builder.run_acft(
+        ["orient", "--json"], cwd=linked_checkpoint, env={"PWD": str(linked_checkpoint)}
+    )
+    payload = json.loads(result.stdout)
+    assert payload["checkpoint"] == "::WORK/linked_v1_01"
+
+
+def test_orient_reads_hand_written_frontmatter(project_builder):
+    project_builder.run_acft(["new", "frontmatter_v1_01"])
+    project_builder.replace_in_checkpoint("frontmatter_v1_01", "VALID: false", "VALID: TRUE")
+    project_builder.replace_in_checkpoint("frontmatter_v1_01", "LIFECYCLE: active", "LIFECYCLE: 'active'")
+    project_builder.replace_in_checkpoint(
+        "frontmatter_v1_01", "SIGNAL: pending", 'SIGNAL: pass\n# reviewed\nTAGS: ["audit", delegate]'
+    )
+
+    result = project_builder.run_acft(["orient", "::WORK/frontmatter_v1_01", "--json"])
+    payload = json.loads(result.stdout)
+
+    assert payload["VALID"] is True
+    assert payload["LIFECYCLE"] == "active"
+    assert payload["SIGNAL"] == "pass"
+
+
+def test_lazy_and_eager_loads_agree_on_sections(project_builder):
+    from _lib import Checkpoint
+
+    project_builder.run_acft(["new", "tabs_v1_01"])
+    project_builder.replace_in_checkpoint("tabs_v1_01", "# LOG", "#\tNOTE not a section\n\n# LOG")
+    checkpoint_dir = project_builder.checkpoint_path("tabs_v1_01")
+
+    eager = Checkpoint(checkpoint_dir, None)
+    eager.load()
+    lazy = Checkpoint(checkpoint_dir, None)
+    lazy.load(lazy=True)
+
+    assert "NOTE not a section" not in eager.section_order
+    assert lazy.section_order == eager.section_order
+    assert lazy.sections == eager.sections
+
+
+def test_lazy_load_parses_sections_on_first_access(project_builder):
+    from _lib import Checkpoint, CheckpointFormatError
+
+    project_builder.run_acft(["new", "lazy_v1_01"])
+    checkpoint_dir = project_builder.checkpoint_path("lazy_v1_01")
+    eager = Checkpoint(checkpoint_dir, None)
+    eager.load()
+
+    lazy = Checkpoint(checkpoint_dir, None)
+    lazy.load(lazy=True)
+    assert lazy.frontmatter == eager.frontmatter
+    assert lazy._content is None  # Only the frontmatter block has been read.
+    assert lazy.sections["STATUS"] == eager.sections["STATUS"]
+    assert list(lazy.sections._texts) == ["STATUS"]
+    assert lazy.section_order == eager.section_order
+    assert dict(lazy.sections) == dict(eager.sections)
+
+    # An undecodable body past the frontmatter only fails once it is needed,
+    # and then as a format error rather than a traceback.
+    checkpoint_md = checkpoint_dir / "CHECKPOINT.md"
+    checkpoint_md.write_bytes(checkpoint_md.read_bytes() + b"- padding\n" * 5000 + b"- \xff\n")
+    broken = Checkpoint(checkpoint_dir, None)
+    broken.load(lazy=True)
+    assert broken.frontmatter == eager.frontmatter
+    with pytest.raises(CheckpointFormatError, match="not valid UTF-8"):
+        broken.sections["STATUS"]
+
+    result = project_builder.run_acft(["orient", "::WORK/lazy_v1_01"], check=False)
+    assert result.returncode == 2 and "not valid UTF-8" in result.stderr, result.stderr
+    # Scans skip it like any other checkpoint that fails to parse.
+    project_builder.run_acft(["new", "lazy_v1_02"])
+    for jobs in ("1", "2"):
+        project_builder.run_acft(["orient", "::WORK/lazy_v1_02", "--json"], env={"ACFT_JOBS": jobs})
+
+
+def test_graph_relationships_match_a_linear_scan(project_builder, monkeypatch):
+    from _acft_orient import gather_relationships
+    from _lib import AcftContext
+
+    for name in ("main_v1_01", "main_v1_02", "main_v1_03", "main_v2_01", "side_v1_02", "other_v1_01"):
+        project_builder.run_acft(["new", name])
+    parent = project_builder.checkpoint_path("main_v1_02")
+    # side_v1_01 delegates to main_v1_02 while its successor does not.
+    for name in ("sub_v1_01", "sub_v1_02", "sub_v2_01", "side_v1_01"):
+        project_builder.run_acft(["new", name, "--delegate-of", "::THIS"], cwd=parent)
+    project_builder.run_acft(["new", "deep_v1_01", "--delegate-of", "::THIS"], cwd=parent / "sub_v1_01")
+
+    monkeypatch.chdir(project_builder.work_root)
+    ctx = AcftContext.discover()
+    checkpoints = ctx.scan_checkpoints()
+    assert len(checkpoints) == 11
+    for target in checkpoints:
+        for depth in (1, 2, 4):
+            expected = _linear_relationships(target, checkpoints, ctx, depth)
+            assert gather_relationships(target, checkpoints, ctx, depth) == expected, (target.name, depth)
+    sub = next(cp for cp in checkpoints if cp.name == "sub_v1_02")
+    relationships = gather_relationships(sub, checkpoints, ctx, 1)
+    assert [item["checkpoint"] for item in relationships["peers"]] == [
+        "::WORK/main_v1_02/side_v1_01",
+        "::WORK/main_v1_02/sub_v1_01",
+        "::WORK/main_v1_02/sub_v2_01",
+    ]
+
+
+def _linear_relationships(target, checkpoints, ctx, depth):
+    """`gather_relationships` as it was before `CheckpointGraph`: a scan per lookup."""
+    from _lib import PathResolutionError, checkpoint_name_parts
+
+    rel = {"ancestry": [], "peers": [], "children": []}
+    parts_target = checkpoint_name_parts(target.name)
+    target_delegate = target.frontmatter.get("DELEGATE_OF")
+    delegate_path = None
+    if isinstance(target_delegate, str):
+        try:
+            delegate_path = ctx.expand(target_delegate)
+        except PathResolutionError:
+            delegate_path = None
+
+    def enrich(cp, distance=1):
+        return {
+            "checkpoint": ctx.to_rooted(cp.path),
+            "VALID": cp.frontmatter.get("VALID"),
+            "LIFECYCLE": cp.frontmatter.get("LIFECYCLE"),
+            "SIGNAL": cp.frontmatter.get("SIGNAL"),
+            "distance": distance,
+        }
+
+    for cp in checkpoints:
+        if cp.path == target.path:
+            continue
+        parts = checkpoint_name_parts(cp.name)
+        delegate_of = cp.frontmatter.get("DELEGATE_OF")
+        delegate_abs = None
+        if isinstance(delegate_of, str):
+            try:
+                delegate_abs = ctx.expand(delegate_of)
+            except PathResolutionError:
+                delegate_abs = None
+
+        if delegate_path and cp.path == delegate_path:
+            rel["ancestry"].append(enrich(cp))
+        elif delegate_abs and delegate_abs == target.path:
+            rel["children"].append(enrich(cp))
+        elif (
+            target_delegate
+            and delegate_of == target_delegate
+            and cp.path != target.path
+        ):
+            rel["peers"].append(enrich(cp))
+
+        if parts_target and parts:
+            if (
+                parts["branch"] == parts_target["branch"]
+                and parts["version"] == parts_target["version"]
+            ):
+                if parts["step"] < parts_target["step"]:
+                    rel["ancestry"].append(enrich(cp))
+                elif parts["step"] > parts_target["step"]:
+                    rel["children"].append(enrich(cp))
+            elif (
+                parts["branch"] == parts_target["branch"]
+                and parts["version"] < parts_target["version"]
+            ):
+                rel["ancestry"].append(enrich(cp))
+            elif (
+                parts["branch"] == parts_target["branch"]
+                and parts["version"] > parts_target["version"]
+            ):
+                rel["children"].append(enrich(cp))
+
+    if depth > 1:
+        expanded_children = list(rel["children"])
+        queue = [(child, child["distance"]) for child in rel["children"]]
+        visited = {target.path}
+        while queue:
+            child_entry, dist = queue.pop()
+            child_path = ctx.expand(child_entry["checkpoint"])
+            visited.add(child_path)
+            if dist >= depth:
+                expanded_children.append(child_entry)
+                continue
+            for cp in checkpoints:
+                if cp.path == child_path or cp.path in visited:
+                    continue
+                child_delegate = cp.frontmatter.get("DELEGATE_OF")
+                try:
+                    delegate_abs = (
+                        ctx.expand(child_delegate)
+                        if isinstance(child_delegate, str)
+                        else None
+                    )
+                except PathResolutionError:
+                    delegate_abs = None
+                parts = checkpoint_name_parts(cp.name)
+                parts_child = checkpoint_name_parts(child_path.name)
+                if delegate_abs and delegate_abs == child_path:
+                    entry = enrich(cp, distance=dist + 1)
+                    expanded_children.append(entry)
+                    queue.append((entry, dist + 1))
+                elif parts and parts_child and parts["branch"] == parts_child["branch"]:
+                    if parts["version"] > parts_child["version"]:
+                        entry = enrich(cp, distance=dist + 1)
+                        expanded_children.append(entry)
+                        queue.append((entry, dist + 1))
+                    elif (
+                        parts["version"] == parts_child["version"]
+                        and parts["step"] > parts_child["step"]
+                    ):
+                        entry = enrich(cp, distance=dist + 1)
+                        expanded_children.append(entry)
+                        queue.append((entry, dist + 1))
+        rel["children"] = expanded_children
+
+    for key in rel:
+        rel[key] = sorted(
+            rel[key], key=lambda item: (item.get("distance", 0), item["checkpoint"])
+        )
+    return rel
@@ -33,6 +33,8 @@ class ProjectBuilder:
         self.project_root = self._tmpdir / "project"
         self.work_root = self.project_root / "work"
         self.spec_root = self.project_root / "spec"
+        # Keeps `acft` from recording these throwaway roots in the user's cache.
+        self.roots_cache = self._tmpdir / "roots.json"
 
         self.project_root.mkdir(parents=True, exist_ok=True)
         self.work_root.mkdir(parents=True, exist_ok=True)
@@ -60,6 +62,7 @@ class ProjectBuilder:
         command = [str(ACFT_BIN)] + args
         run_env = os.environ.copy()
         run_env.setdefault("ACFT_ACTOR", "acft-test")
+        run_env.setdefault("ACFT_ROOTS_CACHE", str(self.roots_cache))
         if env:
             run_env.update(env)
         completed = subprocess.run(
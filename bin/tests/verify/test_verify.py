@@ -86,3 +86,114 @@ def test_verify_section_filters_commands(project_builder):
     assert log_files, "Expected log files for section run"
     log_text = log_files[-1].read_text(encoding="utf-8")
     assert "extra" in log_text and "main" not in log_text
+
+
+def test_verify_parallel_runs_groups_and_records_timings(project_builder):
+    project_builder.run_acft(["new", "verify_v1_05"])
+    checkpoint_dir = project_builder.checkpoint_path("verify_v1_05")
+    project_builder.replace_in_checkpoint(
+        "verify_v1_05",
+        "# add verification commands here",
+        "echo lint  # acft-group: lint\nfalse  # acft-group: tests\necho skipped  # acft-group: tests\necho types",
+    )
+
+    result = project_builder.run_acft(
+        ["verify", "::THIS", "--parallel", "3", "--record"],
+        cwd=checkpoint_dir,
+        check=False,
+    )
+    assert result.returncode == 1
+
+    commands = [event for event in project_builder.read_events() if event["TYPE"] == "HARNESS_EXECUTED"][-1][
+        "PAYLOAD"
+    ]["COMMANDS"]
+    # The failing group stops early; independent groups still run.
+    assert [entry["exit_code"] for entry in commands] == [0, 1, 0]
+    assert [entry["group"] for entry in commands] == ["lint", "tests", commands[2]["group"]]
+    assert all("duration_s" in entry and entry["log_path"].startswith("::WORK/") for entry in commands)
+
+    log_dir = project_builder.work_root / "logs" / "verify_v1_05"
+    combined = next(log_dir.glob("harness_*.log")).read_text(encoding="utf-8")
+    assert combined.index("$ echo lint") < combined.index("$ false") < combined.index("$ echo types")
+    assert "skipped" not in combined
+
+
+def test_verify_replays_cached_pass_until_artifacts_change(project_builder):
+    project_builder.run_acft(["new", "verify_v1_06"])
+    checkpoint_dir = project_builder.checkpoint_path("verify_v1_06")
+    counter = project_builder.work_root / "runs.txt"
+    project_builder.replace_in_checkpoint(
+        "verify_v1_06",
+        "# add verification commands here",
+        f"echo run >> {counter} && sleep 0.5 && echo counted",
+    )
+
+    def verify(*extra):
+        project_builder.run_acft(["verify", "::THIS", "--record", *extra], cwd=checkpoint_dir)
+        events = [event for event in project_builder.read_events() if event["TYPE"] == "HARNESS_EXECUTED"]
+        return events[-1]["PAYLOAD"]["COMMANDS"][0]
+
+    first = verify()
+    assert first["cached"] is False and "original_duration_s" not in first
+    entry = verify()
+    assert entry["cached"] is True and entry["exit_code"] == 0
+    # A replay reports its own time, next to the time of the run it replays.
+    assert entry["original_duration_s"] == first["duration_s"] >= 0.5
+    assert entry["duration_s"] < 0.5
+    assert counter.read_text(encoding="utf-8").count("run") == 1
+    log_dir = project_builder.work_root / "logs" / "verify_v1_06"
+    newest = sorted(log_dir.glob("harness_*.log"))[-1].read_text(encoding="utf-8")
+    assert "counted" in newest and "(cached)" in newest
+
+    assert verify("--no-cache")["cached"] is False
+    (checkpoint_dir / "ARTIFACTS").mkdir(exist_ok=True)
+    (checkpoint_dir / "ARTIFACTS" / "result.txt").write_text("changed\n", encoding="utf-8")
+    assert verify()["cached"] is False
+    assert counter.read_text(encoding="utf-8").count("run") == 3
+
+
+def test_verify_streams_output_and_records_byte_counts(project_builder):
+    project_builder.run_acft(["new", "verify_v1_07"])
+    checkpoint_dir = project_builder.checkpoint_path("verify_v1_07")
+    project_builder.replace_in_checkpoint(
+        "verify_v1_07",
+        "# add verification commands here",
+        "yes line | head -n 50000; echo final-marker >&2",
+    )
+
+    result = project_builder.run_acft(
+        ["verify", "::THIS", "--record", "--tee", "--no-cache"],
+        cwd=checkpoint_dir,
+    )
+    assert "final-marker" in result.stdout
+
+    entry = [event for event in project_builder.read_events() if event["TYPE"] == "HARNESS_EXECUTED"][-1][
+        "PAYLOAD"
+    ]["COMMANDS"][0]
+    assert entry["output_bytes"] == 50000 * len("line\n") + len("final-marker\n")
+    assert entry["output_tail"].endswith("line\nfinal-marker\n")
+    assert len(entry["output_tail"]) <= 2048
+
+    log_dir = project_builder.work_root / "logs" / "verify_v1_07"
+    log_text = next(log_dir.glob("harness_*.log")).read_text(encoding="utf-8")
+    assert log_text.count("line\n") == 50000
+
+
+def test_verify_keeps_commands_after_fence_comments(project_builder):
+    project_builder.run_acft(["new", "verify_v1_08"])
+    checkpoint_dir = project_builder.checkpoint_path("verify_v1_08")
+    project_builder.replace_in_checkpoint(
+        "verify_v1_08",
+        "# add verification commands here",
+        "# build step\necho first\n# check step\necho second",
+    )
+
+    result = project_builder.run_acft(
+        ["verify", "::THIS", "--record"],
+        cwd=checkpoint_dir,
+    )
+    assert result.returncode == 0, result.stderr
+    log_dir = project_builder.work_root / "logs" / "verify_v1_08"
+    log_text = "".join(path.read_text(encoding="utf-8") for path in log_dir.glob("*.log"))
+    assert "first" in log_text and "second" in log_text
+    assert "build step" not in log_text